@@ -0,0 +1,78 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick 오토마톤. 등록된 모든 문자열을 텍스트 한 번 훑기로 찾는다.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.built = False
+
+    def add(self, word, value=None):
+        """
+        찾을 문자열을 추가한다.
+        :param word: 찾을 문자열
+        :param value: 찾았을 때 돌려줄 값, 없으면 문자열
+        :return:
+        """
+        state = 0
+        for c in word:
+            next_state = self.goto[state].get(c)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][c] = next_state
+            state = next_state
+        self.outputs[state].append((len(word), word if value is None else value))
+        self.built = False
+
+    def build(self):
+        """
+        실패 링크를 만든다.
+        :return:
+        """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and c not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.goto[fail].get(c, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+        self.built = True
+
+    def iter(self, text):
+        """
+        텍스트에서 등록된 문자열들을 찾는다.
+        :param text: 텍스트
+        :return: (끝 index, 길이, 값) 들
+        """
+        if not self.built:
+            self.build()
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        # 시작 문자가 하나뿐이면(예: 모든 단어가 공백으로 시작) 초기 상태에서 그 문자까지 건너뛴다.
+        first = next(iter(goto[0])) if len(goto[0]) == 1 else None
+        state, i, text_len = 0, 0, len(text)
+        while i < text_len:
+            if state == 0 and first is not None:
+                i = text.find(first, i)
+                if i == -1:
+                    break
+            c = text[i]
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            for length, value in outputs[state]:
+                yield i, length, value
+            i += 1
+
+    def __len__(self):
+        return len(self.goto)
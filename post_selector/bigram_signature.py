@@ -0,0 +1,95 @@
+import numpy as np
+
+from post_selector.pattern_trie import PatternTrie
+
+
+class BigramSignature:
+    """
+    문자열에 있는 문자 바이그램(이웃한 두 문자)들의 블룸 필터 서명.
+    바이그램마다 "BITS"개의 비트 중 하나를 켠다. 단어에 반드시 있어야 하는 바이그램의 비트가 포스트 서명에 하나라도 없으면
+    단어는 포스트와 일치할 수 없다. (비트가 모두 있어도 일치하지 않을 수 있다.)
+    """
+
+    BITS = 512
+    # 곱셈 해시 상수 (64비트)
+    MULTIPLIER = 0x9E3779B97F4A7C15
+    SHIFT = 64 - 9
+    MASK = (1 << 64) - 1
+
+    __bits = {}
+
+    @staticmethod
+    def bigram_bit(bigram):
+        """
+        바이그램의 비트
+        :param bigram: 두 문자
+        :return: 비트 (1 << 위치)
+        """
+        bit = BigramSignature.__bits.get(bigram)
+        if bit is None:
+            value = ord(bigram[0]) * 1000003 + ord(bigram[1])
+            bit = BigramSignature.__bits[bigram] = \
+                1 << (((value * BigramSignature.MULTIPLIER) & BigramSignature.MASK) >> BigramSignature.SHIFT)
+        return bit
+
+    @staticmethod
+    def text_signature(text):
+        """
+        문자열의 서명
+        :param text: 문자열
+        :return: 서명 (int)
+        """
+        signature = 0
+        bigram_bit = BigramSignature.bigram_bit
+        for bigram in {text[i:i + 2] for i in range(len(text) - 1)}:
+            signature |= bigram_bit(bigram)
+        return signature
+
+    @staticmethod
+    def text_signatures(texts):
+        """
+        문자열들의 서명을 한꺼번에 구한다. ("text_signature"와 결과가 같다.)
+        :param texts: 문자열들
+        :return: 서명들 (list)
+        """
+        if not texts:
+            return []
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        codes = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.uint64)
+        # 포스트 경계를 넘는 바이그램은 뺀다.
+        ends = np.cumsum(lengths)
+        inside = np.ones(max(len(codes) - 1, 0), dtype=bool)
+        inside[ends[:-1][(ends[:-1] > 0) & (ends[:-1] < len(codes))] - 1] = False
+        positions = np.flatnonzero(inside)
+        values = codes[positions] * np.uint64(1000003) + codes[positions + 1]
+        bits = (values * np.uint64(BigramSignature.MULTIPLIER)) >> np.uint64(BigramSignature.SHIFT)
+        rows = np.searchsorted(ends, positions, side="right")
+        matrix = np.zeros((len(texts), BigramSignature.BITS), dtype=bool)
+        matrix[rows, bits.astype(np.int64)] = True
+        packed = np.packbits(matrix, axis=1, bitorder="little")
+        return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+    @staticmethod
+    def term_signature(pattern):
+        """
+        정규 표현식 단어와 일치하는 문자열에 반드시 있어야 하는 바이그램들의 서명.
+        수량자가 붙지 않은 리터럴 문자(원자)가 이어진 조각들의 바이그램만 본다.
+        :param pattern: 정규 표현식 단어
+        :return: 서명 (알 수 없으면 0)
+        """
+        atoms = PatternTrie.tokenize(pattern)
+        if atoms is None:
+            return 0
+        signature = 0
+        previous = None
+        for atom in atoms:
+            if len(atom) == 1 and atom != ".":
+                char = atom
+            elif len(atom) == 3 and atom[0] == "[" and atom[2] == "]":
+                char = atom[1]
+            else:
+                char = None
+            if previous is not None and char is not None:
+                signature |= BigramSignature.bigram_bit(previous + char)
+            previous = char
+        return signature
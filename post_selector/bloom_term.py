@@ -0,0 +1,51 @@
+import re
+
+from post_selector.preprocessed_post import PreprocessedPost
+
+
+class BloomTerm:
+    """
+    반드시 있어야 하는 문자 바이그램들의 서명("BigramSignature")을 가진 단어.
+    포스트 서명("PreprocessedPost.signature")에 단어 서명의 비트가 하나라도 없으면 정규 표현식을 실행하지 않는다.
+    "re.Pattern"처럼 "search", "finditer", "pattern"을 제공한다.
+    """
+
+    def __init__(self, term, signature):
+        """
+        :param term: 단어 (정규 표현식 문자열, 패턴 객체 또는 "ScriptTerm")
+        :param signature: 단어에 반드시 있어야 하는 바이그램들의 서명
+        """
+        if isinstance(term, str):
+            term = re.compile(term)
+        self.term = term
+        self.signature = signature
+        self.pattern = term.pattern
+        # 디버그 로그에 자주 쓰이므로 미리 만들어 둔다.
+        self.__repr = f"BloomTerm({self.pattern!r})"
+
+    def rejects(self, post):
+        """
+        서명만으로 포스트에 단어가 없음을 알 수 있는지 여부
+        :param post: 전처리된 포스트
+        :return: 단어가 없으면 True (False 이면 정규 표현식으로 검사해야 한다.)
+        """
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        return post.signature & self.signature != self.signature
+
+    def search(self, post):
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        if post.signature & self.signature != self.signature:
+            return None
+        return self.term.search(post)
+
+    def finditer(self, post):
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        if post.signature & self.signature != self.signature:
+            return iter(())
+        return self.term.finditer(post)
+
+    def __repr__(self):
+        return self.__repr
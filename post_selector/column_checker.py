@@ -0,0 +1,142 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import logging_config as log
+from post_selector.literal_matcher import LiteralTerm
+from post_selector.post_checker import PostChecker
+from post_selector.shared_node import SharedNode
+
+
+class ColumnChecker:
+    """
+    포스트 컬럼 전체를 단어 단위(term-at-a-time)로 검사한다.
+    단어마다 아직 결론이 나지 않은 포스트들만 검사하여 불리언 배열을 만들고,
+    AND/OR/NOT 조건은 배열 연산으로 합친다. NEAR 조건은 포스트 단위로 검사한다.
+    단어 검사 자체는 벡터화하지 않는다. 정규 표현식 단어는 포스트마다 파이썬에서 "search"를 호출하고(np.fromiter),
+    numpy는 그 결과들을 합치고 결론이 난 포스트들을 다음 단어의 검사에서 빼는 데에만 쓴다.
+    """
+
+    def __init__(self):
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.checker = PostChecker()
+
+    def check_posts(self, posts, compiled_query):
+        """
+        포스트들이 쿼리들의 패턴과 일치하는지 체크한다.
+        :param posts: 포스트들 (Series)
+        :param compiled_query: 컴파일된 쿼리
+        :return: 쿼리(컬럼)별 'Y'/'N' 결과 (DataFrame)
+        """
+        texts = self.checker.preprocess_posts(posts)
+        rows = np.arange(len(texts))
+        memo = {}
+        values = {}
+        for query, column in zip(compiled_query.queries, compiled_query.columns):
+            result = self.examine(query, texts, rows, memo)
+            values[column] = np.where(result, 'Y', 'N')
+        return pd.DataFrame(values, index=posts.index)
+
+    def examine(self, query, texts, rows, memo):
+        """
+        포스트들 중 "rows"에 해당하는 포스트들을 검사한다.
+        :param query: 조건 또는 단어
+        :param texts: 전처리된 포스트들
+        :param rows: 검사할 포스트들의 index 배열
+        :param memo: 공유 노드, 리터럴 단어 검색 결과
+        :return: "rows"에 대한 결과 배열
+        """
+        if len(rows) == 0:
+            return np.zeros(0, dtype=bool)
+        if isinstance(query, SharedNode):
+            return self.examine_shared(query, texts, rows, memo)
+        if isinstance(query, dict):
+            operator = query["operator"]
+            operands = query["operands"]
+            if operator == 'OR':
+                return self.examine_or(operands, texts, rows, memo)
+            elif operator == 'AND':
+                return self.examine_and(operands, texts, rows, memo)
+            elif operator == 'NOT':
+                return self.examine_not(operands, texts, rows, memo)
+            return self.examine_by_post(query, texts, rows)
+        if isinstance(query, LiteralTerm):
+            return self.examine_literal(query, texts, rows, memo)
+        if isinstance(query, list):
+            return np.full(len(rows), len(query) > 0)
+        return self.examine_term(query, texts, rows)
+
+    @staticmethod
+    def examine_term(term, texts, rows):
+        """
+        정규 표현식 단어로 포스트들을 검사한다. (포스트마다 "search"를 호출한다.)
+        """
+        if isinstance(term, str):
+            term = re.compile(term)
+        search = term.search
+        return np.fromiter((search(texts[row]) is not None for row in rows), dtype=bool, count=len(rows))
+
+    def examine_or(self, operands, texts, rows, memo):
+        result = np.zeros(len(rows), dtype=bool)
+        remaining = np.arange(len(rows))
+        for operand in operands:
+            found = self.examine(operand, texts, rows[remaining], memo)
+            result[remaining[found]] = True
+            remaining = remaining[~found]
+            if len(remaining) == 0:
+                break
+        return result
+
+    def examine_and(self, operands, texts, rows, memo):
+        result = np.ones(len(rows), dtype=bool)
+        remaining = np.arange(len(rows))
+        for operand in operands:
+            found = self.examine(operand, texts, rows[remaining], memo)
+            result[remaining[~found]] = False
+            remaining = remaining[found]
+            if len(remaining) == 0:
+                break
+        return result
+
+    def examine_not(self, operands, texts, rows, memo):
+        result = self.examine(operands[0], texts, rows, memo)
+        candidates = np.flatnonzero(result)
+        excluded = self.examine(operands[1], texts, rows[candidates], memo)
+        result[candidates[excluded]] = False
+        return result
+
+    def examine_by_post(self, query, texts, rows):
+        """
+        포스트 단위로 검사한다. (NEAR 조건)
+        """
+        exist = self.checker.exist
+        return np.fromiter((exist(query, texts[row]) for row in rows), dtype=bool, count=len(rows))
+
+    def examine_shared(self, shared, texts, rows, memo):
+        """
+        공유 노드는 포스트마다 한 번만 검사한다.
+        """
+        if shared not in memo:
+            memo[shared] = (np.zeros(len(texts), dtype=bool), np.zeros(len(texts), dtype=bool))
+        values, examined = memo[shared]
+        missing = rows[~examined[rows]]
+        if len(missing) > 0:
+            values[missing] = self.examine(shared.node, texts, missing, memo)
+            examined[missing] = True
+        return values[rows]
+
+    def examine_literal(self, term, texts, rows, memo):
+        """
+        리터럴 단어는 "LiteralMatcher"의 포스트별 검색 결과를 한 번만 구해 재사용한다.
+        """
+        matcher = term.matcher
+        if matcher not in memo:
+            memo[matcher] = [None] * len(texts)
+        matches = memo[matcher]
+        result = np.zeros(len(rows), dtype=bool)
+        for i, row in enumerate(rows):
+            if matches[row] is None:
+                matches[row] = matcher.matches(texts[row])
+            result[i] = not term.literals.isdisjoint(matches[row])
+        return result
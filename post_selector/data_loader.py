@@ -1,3 +1,4 @@
+import json
 import os
 
 import logging_config as log
@@ -25,6 +26,211 @@ class DataLoader:
             query = f.read()
         return query.strip()
 
+    def load_query_bytes(self, file_name="query"):
+        """
+        쿼리 파일의 내용을 그대로 가져온다.
+        :param file_name: 쿼리의 파일 명
+        :return: 파일 내용
+        """
+        return (self.cfg.query_dir / f"{file_name}.txt").read_bytes()
+
+    def load_query_statistics_bytes(self, file_name="query"):
+        """
+        쿼리의 통계 파일 내용을 그대로 가져온다.
+        :param file_name: 쿼리의 파일 명
+        :return: 파일 내용, 없으면 빈 내용
+        """
+        file_path = self.cfg.query_dir / f"{file_name}.stats.json"
+        return file_path.read_bytes() if file_path.exists() else b""
+
+    def load_compiled_query(self, name):
+        """
+        캐시된 컴파일된 쿼리를 가져온다.
+        :param name: 캐시 명
+        :return: {"key": 캐시 키, "compiled_query": 컴파일된 쿼리}, 없거나 읽을 수 없으면 None
+        """
+        file_path = self.cfg.query_cache_dir / f"{name}.pkl"
+        if not file_path.exists():
+            return None
+        try:
+            return DataUtils.read_pickle_plain(file_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to load compiled query cache: {file_path}, {e}")
+            return None
+
+    def save_compiled_query(self, data, name):
+        """
+        컴파일된 쿼리를 캐시에 저장한다.
+        :param data: {"key": 캐시 키, "compiled_query": 컴파일된 쿼리}
+        :param name: 캐시 명
+        :return:
+        """
+        DataUtils.save_pickle_plain(data, self.cfg.query_cache_dir / f"{name}.pkl")
+
+    def load_query_statistics(self, file_name="query"):
+        """
+        쿼리의 통계를 가져온다.
+        :param file_name: 쿼리의 파일 명
+        :return: 통계, 없으면 None
+        """
+        file_path = self.cfg.query_dir / f"{file_name}.stats.json"
+        if not file_path.exists():
+            return None
+        with open(file_path, 'r', encoding="utf8") as f:
+            return json.load(f)
+
+    def save_query_statistics(self, stats, file_name="query"):
+        """
+        쿼리의 통계를 쿼리 파일 옆에 저장한다.
+        :param stats: 통계
+        :param file_name: 쿼리의 파일 명
+        :return:
+        """
+        file_path = self.cfg.query_dir / f"{file_name}.stats.json"
+        with open(file_path, 'w', encoding="utf8") as f:
+            json.dump(stats, f)
+
+    def load_post_index(self, file_name):
+        """
+        포스트 파일의 역색인 데이터를 가져온다.
+        :param file_name: 포스트 파일 명
+        :return: {"key": 포스트 내용의 키, "index": 역색인 데이터}, 없거나 읽을 수 없으면 None
+        """
+        file_path = self.cfg.index_dir / f"{file_name}.index.pkl"
+        if not file_path.exists():
+            return None
+        try:
+            data = DataUtils.read_pickle_plain(file_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to load post index: {file_path}, {e}")
+            return None
+        if not isinstance(data, dict) or "index" not in data:
+            self.logger.warning(f"Unknown post index format: {file_path}")
+            return None
+        return data
+
+    def save_post_index(self, data, file_name):
+        """
+        포스트 파일의 역색인 데이터를 저장한다.
+        :param data: {"key": 포스트 내용의 키, "index": 역색인 데이터}
+        :param file_name: 포스트 파일 명
+        :return:
+        """
+        file_path = self.cfg.index_dir / f"{file_name}.index.pkl"
+        DataUtils.save_pickle_plain(data, file_path)
+
+    def load_term_cache(self, name="term_cache"):
+        """
+        단어별 검사 결과 캐시 데이터를 가져온다.
+        :param name: 캐시 명
+        :return: 캐시 데이터, 없거나 읽을 수 없으면 None
+        """
+        file_path = self.cfg.cache_dir / f"{name}.pkl"
+        if not file_path.exists():
+            return None
+        try:
+            return DataUtils.read_pickle_plain(file_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to load term cache: {file_path}, {e}")
+            return None
+
+    def save_term_cache(self, data, name="term_cache"):
+        """
+        단어별 검사 결과 캐시 데이터를 저장한다.
+        :param data: 캐시 데이터
+        :param name: 캐시 명
+        :return:
+        """
+        DataUtils.save_pickle_plain(data, self.cfg.cache_dir / f"{name}.pkl")
+
+    def load_result_cache(self, name="result_cache"):
+        """
+        포스트 검사 결과 캐시 데이터를 가져온다.
+        :param name: 캐시 명
+        :return: 캐시 데이터, 없거나 읽을 수 없으면 None
+        """
+        file_path = self.cfg.cache_dir / f"{name}.pkl"
+        if not file_path.exists():
+            return None
+        try:
+            return DataUtils.read_pickle_plain(file_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to load result cache: {file_path}, {e}")
+            return None
+
+    def save_result_cache(self, data, name="result_cache"):
+        """
+        포스트 검사 결과 캐시 데이터를 저장한다.
+        :param data: 캐시 데이터
+        :param name: 캐시 명
+        :return:
+        """
+        DataUtils.save_pickle_plain(data, self.cfg.cache_dir / f"{name}.pkl")
+
+    def load_preprocessed_posts(self, file_name):
+        """
+        포스트 파일의 전처리된 메시지 데이터를 가져온다.
+        :param file_name: 포스트 파일 명
+        :return: {"key": 메시지 키, "texts": 전처리된 메시지들}, 없거나 읽을 수 없으면 None
+        """
+        file_path = self.cfg.cache_dir / f"{file_name}.preprocessed.pkl"
+        if not file_path.exists():
+            return None
+        try:
+            return DataUtils.read_pickle_plain(file_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to load preprocessed posts: {file_path}, {e}")
+            return None
+
+    def save_preprocessed_posts(self, data, file_name):
+        """
+        포스트 파일의 전처리된 메시지 데이터를 저장한다.
+        :param data: {"key": 메시지 키, "texts": 전처리된 메시지들}
+        :param file_name: 포스트 파일 명
+        :return:
+        """
+        DataUtils.save_pickle_plain(data, self.cfg.cache_dir / f"{file_name}.preprocessed.pkl")
+
+    def save_quarantined_post(self, record, name="quarantine"):
+        """
+        검사 시간 제한을 넘은 포스트를 격리 파일에 한 줄씩 덧붙인다. (JSON Lines)
+        :param record: {"post", "column", "term", "elapsed"}
+        :param name: 격리 파일 명
+        :return:
+        """
+        self.cfg.quarantine_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.cfg.quarantine_dir / f"{name}.jsonl"
+        with open(file_path, 'a', encoding="utf8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def load_quarantined_posts(self, name="quarantine"):
+        """
+        격리 파일에 기록된 포스트들을 가져온다.
+        :param name: 격리 파일 명
+        :return: 기록들, 없으면 빈 리스트
+        """
+        file_path = self.cfg.quarantine_dir / f"{name}.jsonl"
+        if not file_path.exists():
+            return []
+        with open(file_path, encoding="utf8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def save_profile_report(self, report, file_name):
+        """
+        쿼리 프로파일 보고서를 CSV와 JSON으로 저장한다.
+        :param report: 보고서
+        :param file_name: 포스트 파일 명
+        :return: 저장한 파일 경로들
+        """
+        name, _ = os.path.splitext(file_name)
+        self.cfg.results_dir.mkdir(parents=True, exist_ok=True)
+        csv_path = self.cfg.results_dir / f"{name}_profile.csv"
+        json_path = self.cfg.results_dir / f"{name}_profile.json"
+        report.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        with open(json_path, 'w', encoding="utf8") as f:
+            json.dump(report.to_dict(orient="records"), f, ensure_ascii=False, indent=2)
+        return csv_path, json_path
+
     def load_post(self):
         """
         포스트를 가져온다.
@@ -0,0 +1,92 @@
+import re
+
+from post_selector.aho_corasick import AhoCorasick
+from post_selector.pattern_trie import PatternTrie
+
+
+class LiteralMatcher:
+    """
+    쿼리의 리터럴 단어(와일드카드가 없는 단어)들을 Aho-Corasick 오토마톤으로 한 번에 찾는다.
+    단어 뒤의 경계 문자("[?!,. ]") 검사는 찾은 뒤에 한다.
+    """
+
+    # QueryParser.to_regex_word 가 붙이는 앞, 뒤 패턴
+    PREFIX = " "
+    SUFFIX = "[?!,. ]"
+    BOUNDARY = "?!,. "
+    LITERAL_ATOMS = {"[.]": ".", "[+]": "+"}
+
+    def __init__(self):
+        self.automaton = AhoCorasick()
+        self.__post = None
+        self.__matches = frozenset()
+
+    @staticmethod
+    def to_literal(pattern):
+        """
+        정규 표현식 단어가 리터럴 단어이면 찾을 문자열(앞의 공백 포함)로 바꾼다.
+        :param pattern: 정규 표현식 단어
+        :return: 찾을 문자열, 리터럴 단어가 아니면 None
+        """
+        if not pattern.startswith(LiteralMatcher.PREFIX) or not pattern.endswith(LiteralMatcher.SUFFIX):
+            return None
+        atoms = PatternTrie.tokenize(pattern[:-len(LiteralMatcher.SUFFIX)])
+        if atoms is None:
+            return None
+        literal = []
+        for atom in atoms:
+            if atom in LiteralMatcher.LITERAL_ATOMS:
+                literal.append(LiteralMatcher.LITERAL_ATOMS[atom])
+            elif len(atom) == 1 and atom != ".":
+                literal.append(atom)
+            else:
+                return None
+        return "".join(literal)
+
+    def add(self, literal):
+        self.automaton.add(literal)
+
+    def build(self):
+        self.automaton.build()
+
+    def matches(self, post):
+        """
+        포스트에 존재하는 리터럴 단어들을 구한다. 같은 포스트는 한 번만 훑는다.
+        :param post: 전처리된 포스트 데이터
+        :return: 존재하는 리터럴 단어들
+        """
+        if post is not self.__post:
+            matches = set()
+            post_len = len(post)
+            for end, _, literal in self.automaton.iter(post):
+                if end + 1 < post_len and post[end + 1] in self.BOUNDARY:
+                    matches.add(literal)
+            self.__post = post
+            self.__matches = matches
+        return self.__matches
+
+
+class LiteralTerm:
+    """
+    "LiteralMatcher"로 찾는 리터럴 단어(들). 여러 단어이면 OR 조건이다.
+    "re.Pattern"처럼 "search", "finditer", "pattern"을 제공한다.
+    """
+
+    def __init__(self, matcher, patterns, literals):
+        self.matcher = matcher
+        self.pattern = "|".join(patterns)
+        self.literals = frozenset(literals)
+        self.__regex = None
+
+    def search(self, post):
+        if self.literals.isdisjoint(self.matcher.matches(post)):
+            return None
+        return True
+
+    def finditer(self, post):
+        if self.__regex is None:
+            self.__regex = re.compile(self.pattern)
+        return self.__regex.finditer(post)
+
+    def __repr__(self):
+        return f"LiteralTerm({self.pattern!r})"
@@ -0,0 +1,94 @@
+class PatternTrie:
+    """
+    정규 표현식 단어들을 트라이로 묶어 하나의 교대(alternation) 정규 표현식으로 만든다.
+    공통 접두사(" ", "samsung" 등)를 한 번만 검사하므로 단어 수만큼 포스트를 훑지 않는다.
+    """
+
+    # 트라이로 묶을 수 없는 정규 표현식 메타 문자
+    UNSAFE_CHARS = "\\()|^${}+?"
+    # 단어의 끝을 나타내는 키
+    END = ""
+
+    def __init__(self):
+        self.root = {}
+        self.count = 0
+
+    def add(self, pattern):
+        """
+        정규 표현식 단어를 추가한다.
+        :param pattern: 정규 표현식 단어
+        :return: 추가했는지 여부 (트라이로 묶을 수 없는 단어이면 False)
+        """
+        atoms = self.tokenize(pattern)
+        if atoms is None:
+            return False
+        node = self.root
+        for atom in atoms:
+            node = node.setdefault(atom, {})
+        node[self.END] = True
+        self.count += 1
+        return True
+
+    @staticmethod
+    def tokenize(pattern):
+        """
+        정규 표현식 단어를 원자(문자, 문자 클래스, ".", 수량자가 붙은 원자) 단위로 나눈다.
+        :param pattern: 정규 표현식 단어
+        :return: 원자들, 나눌 수 없는 단어이면 None
+        """
+        atoms = []
+        i = 0
+        while i < len(pattern):
+            c = pattern[i]
+            if c == "[":
+                last = pattern.find("]", i + 2)
+                if last == -1 or "[" in pattern[i + 1:last] or "\\" in pattern[i + 1:last]:
+                    return None
+                atom = pattern[i:last + 1]
+                i = last + 1
+            elif c == "*":
+                if not atoms or atoms[-1].endswith("*"):
+                    return None
+                atoms[-1] += c
+                i += 1
+                continue
+            elif c in PatternTrie.UNSAFE_CHARS or c == "]":
+                return None
+            else:
+                atom = c
+                i += 1
+            atoms.append(atom)
+        return atoms if atoms else None
+
+    def to_regex(self):
+        """
+        트라이를 하나의 정규 표현식으로 만든다.
+        :return: 정규 표현식
+        """
+        return self.node_to_regex(self.root)
+
+    def node_to_regex(self, node):
+        alternatives = []
+        for atom, child in node.items():
+            if atom != self.END:
+                alternatives.append(atom + self.node_to_regex(child))
+        if not alternatives:
+            return ""
+        optional = self.END in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        regex = "(?:" + "|".join(alternatives) + ")"
+        return regex + "?" if optional else regex
+
+    @staticmethod
+    def fuse(patterns):
+        """
+        정규 표현식 단어들 중 트라이로 묶을 수 있는 단어들을 하나로 합친다.
+        :param patterns: 정규 표현식 단어들
+        :return: 합친 정규 표현식 (합친 단어가 없으면 None), 합치지 못한 단어들
+        """
+        trie = PatternTrie()
+        rest = [pattern for pattern in patterns if not trie.add(pattern)]
+        if trie.count == 0:
+            return None, rest
+        return trie.to_regex(), rest
@@ -1,6 +1,13 @@
 import re
+import signal
+import threading
+import time
+from contextlib import contextmanager
 
 import logging_config as log
+from post_selector.data_loader import DataLoader
+from post_selector.preprocessed_post import PreprocessedPost
+from post_selector.shared_node import SharedNode
 from utils.data_utils import DataUtils
 
 
@@ -9,10 +16,22 @@ class PostChecker:
     포스트가 "query"의 패턴과 일치하는지 체크한다.
     """
 
+    # 전처리 방식이 바뀌면 올린다. (저장된 전처리 결과를 쓰지 않는다.)
+    PREPROCESS_VERSION = 1
+
     def __init__(self):
         self.logger = log.get_logger(self.__class__.__name__)
         self.__SPACE = re.compile('\s+')
         self.__SPACE_SEP = "_|_"
+        # 여러 포스트를 한 문자열로 이어 전처리할 때의 구분자 (공백 문자가 아니어야 한다.)
+        self.__POST_SEP = "\x00"
+        # 포스트별 검사 시간 제한 ("time_limit" 안에서만 설정된다.)와 검사 중인 단어
+        self.deadline = None
+        self.current_term = None
+        # 검사 시간 제한을 넘은 포스트들을 기록할 파일 명과 기록된 포스트들
+        self.quarantine_name = "quarantine"
+        self.quarantined = []
+        self.loader = DataLoader()
 
     def check_post(self, post, query, preprocess_post=False):
         """
@@ -28,12 +47,14 @@ class PostChecker:
         result = self.examine_conditions(query, post)
         return 'Y' if result else 'N'
 
-    def check_post_for_queries(self, post, queries, columns=None):
+    def check_post_for_queries(self, post, queries, columns=None, time_budget=None):
         """
         포스트가 "query"의 패턴과 일치하는지 체크한다.
+        검사 시간 제한을 넘은 포스트는 검사 중이던 단어와 함께 격리 파일에 기록하고, 검사하지 못한 컬럼은 'N'으로 둔다.
         :param post: 포스트 데이터
         :param queries: 정의된 패턴들
         :param columns: 컬럼 명들
+        :param time_budget: 포스트별 검사 시간 제한 (초), 없으면 제한하지 않는다.
         :return:
         """
         if columns is None:
@@ -41,15 +62,142 @@ class PostChecker:
 
         post = self.preprocess_post(post)
         values = {}
-        for query, column in zip(queries, columns):
-            values[column] = self.check_post(post, query, True)
+        column = None
+        start = time.perf_counter()
+        try:
+            with self.time_limit(time_budget):
+                for query, column in zip(queries, columns):
+                    values[column] = self.check_post(post, query, True)
+        except TimeoutError:
+            self.quarantine(post, column, self.current_term, time.perf_counter() - start)
+            for column in columns:
+                values.setdefault(column, 'N')
         return values
 
+    def check_post_by_functions(self, post, functions, columns, queries=None, time_budget=None):
+        """
+        포스트를 "QueryCodegen"이 만든 쿼리 함수들로 체크한다.
+        쿼리 함수들은 검사 중인 단어를 기록하지 않으므로, 검사 시간 제한이 있으면 쿼리 함수들 대신
+        "check_post_for_queries"로 한 번만 검사한다. (포스트별 검사 시간은 제한 시간 하나를 넘지 않는다.)
+        :param post: 포스트 데이터
+        :param functions: 쿼리 함수들
+        :param columns: 컬럼 명들
+        :param queries: 쿼리 함수들의 컴파일된 쿼리들 (검사 시간 제한이 있을 때 필요하다.)
+        :param time_budget: 포스트별 검사 시간 제한 (초), 없으면 제한하지 않는다.
+        :return: 컬럼별 'Y'/'N' 결과
+        """
+        post = self.preprocess_post(post)
+        if time_budget is None:
+            return {column: 'Y' if function(post) else 'N' for function, column in zip(functions, columns)}
+        if queries is None:
+            raise ValueError("queries are required to check posts with a time budget")
+        return self.check_post_for_queries(post, queries, columns, time_budget)
+
+    @staticmethod
+    def can_alarm():
+        """
+        검사 중인 정규 표현식을 시그널(SIGALRM)로 중단할 수 있는지 여부 (POSIX의 메인 스레드에서만 가능하다.)
+        :return: 가능 여부
+        """
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    @contextmanager
+    def time_limit(self, time_budget):
+        """
+        검사 시간을 제한한다. 시간을 넘으면 "TimeoutError"가 발생한다.
+        시그널을 쓸 수 있으면 정규 표현식 검사 중에도 중단하고, 쓸 수 없으면 단어를 검사하기 전마다 시간을 확인한다.
+        시그널을 쓸 수 없는 경우(Windows, 메인 스레드가 아닌 스레드)에는 이미 시작한 정규 표현식 검사를 중단할 수 없으므로,
+        단어 하나의 검사가 오래 걸리면 그 검사가 끝난 뒤 다음 단어를 검사하기 전에야 시간 초과를 알 수 있다.
+        :param time_budget: 검사 시간 제한 (초), 없으면 제한하지 않는다.
+        :return:
+        """
+        if time_budget is None:
+            yield
+            return
+        self.deadline = time.perf_counter() + time_budget
+        self.current_term = None
+        alarm = self.can_alarm()
+        if alarm:
+            previous = signal.signal(signal.SIGALRM, self.raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, time_budget)
+        try:
+            yield
+        finally:
+            # 타이머를 끄기 직전에 시그널이 와도 시그널 처리기는 되돌린다.
+            try:
+                if alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            finally:
+                if alarm:
+                    signal.signal(signal.SIGALRM, previous)
+                self.deadline = None
+
+    @staticmethod
+    def raise_timeout(signum, frame):
+        raise TimeoutError("Post check time budget exceeded")
+
+    def enter_term(self, word):
+        """
+        검사할 단어를 기록하고 검사 시간 제한을 넘었는지 확인한다.
+        :param word: 검사할 단어
+        :return:
+        """
+        self.current_term = word
+        if time.perf_counter() > self.deadline:
+            raise TimeoutError("Post check time budget exceeded")
+
+    def quarantine(self, post, column, term, elapsed):
+        """
+        검사 시간 제한을 넘은 포스트를 격리 파일에 기록한다.
+        :param post: 전처리된 포스트
+        :param column: 검사 중이던 컬럼 명
+        :param term: 검사 중이던 단어
+        :param elapsed: 검사한 시간 (초)
+        :return:
+        """
+        if term is not None and not isinstance(term, str):
+            term = getattr(term, "pattern", repr(term))
+        record = {"post": str(post).strip(), "column": None if column is None else str(column),
+                  "term": None if term is None else str(term), "elapsed": round(elapsed, 3)}
+        self.logger.warning(f"Quarantined post: column={record['column']}, term={record['term']!r}, "
+                            f"elapsed={record['elapsed']}s")
+        self.quarantined.append(record)
+        self.loader.save_quarantined_post(record, self.quarantine_name)
+
+    def preprocess_posts(self, posts):
+        """
+        포스트들을 한꺼번에 전처리한다. ("preprocess_post"와 결과가 같다.)
+        포스트들을 구분자로 이어 한 문자열로 만들고 문자 치환, 공백 정리, 소문자 변환을 한 번씩만 한 뒤 다시 나눈다.
+        이미 전처리된 포스트("PreprocessedPost")는 그대로 쓴다.
+        :param posts: 포스트들
+        :return: 전처리된 포스트들 (list)
+        """
+        posts = list(posts)
+        pending = [i for i, post in enumerate(posts) if not isinstance(post, PreprocessedPost)]
+        if not pending:
+            return posts
+        sep = self.__POST_SEP
+        texts = [post if isinstance(post, str) else str(post) for post in (posts[i] for i in pending)]
+        joined = sep.join(texts)
+        if joined.count(sep) != len(texts) - 1:
+            # 구분자가 들어 있는 포스트가 있으면 하나씩 전처리한다.
+            for i in pending:
+                posts[i] = self.preprocess_post(posts[i])
+            return posts
+        # 공백 문자로 나눈 뒤 다시 이으면 공백이 이어진 곳은 공백 하나가 되고 앞뒤 공백은 없어진다. ("\s+"와 같다.)
+        joined = " ".join(self.replace_text(joined).lower().split())
+        joined = joined.replace(" " + sep, sep).replace(sep + " ", sep)
+        for i, text in zip(pending, joined.split(sep)):
+            posts[i] = PreprocessedPost(" " + text + " ")
+        return posts
+
     def preprocess_post(self, post):
+        if isinstance(post, PreprocessedPost):
+            return post
         if not isinstance(post, str):
             post = str(post)
         post = self.replace_text(post)
-        return " " + self.__SPACE.sub(" ", post.strip().lower()) + " "
+        return PreprocessedPost(" " + self.__SPACE.sub(" ", post.strip().lower()) + " ")
 
     def examine_conditions(self, query, post):
         """
@@ -58,7 +206,7 @@ class PostChecker:
         :param post: 포스트 데이터
         :return:
         """
-        if isinstance(query, str):
+        if not isinstance(query, dict):
             return self.exist(query, post)
 
         operator = query["operator"]
@@ -68,7 +216,7 @@ class PostChecker:
         elif operator == 'AND':
             result = self.examine_and_condition(operands, post)
         elif operator == 'NOT':
-            result = self.examine_not_condition(operands, post)
+            result = self.examine_not_condition(operands, post, query.get("not_first", False))
         elif operator == 'NEAR':
             result_idx = self.examine_near_condition(operands, query['distance'], post)
             result = len(result_idx) > 0
@@ -112,15 +260,18 @@ class PostChecker:
                 return False
         return True
 
-    def examine_not_condition(self, not_words, post):
+    def examine_not_condition(self, not_words, post, not_first=False):
         """
         NOT 조건
         :param not_words: NOT 조건의 단어들
         :param post: 포스트 데이터
+        :param not_first: 제외할 단어를 먼저 검사할지 여부
         :return:
         """
         exist_word = not_words[0]
         not_word = not_words[1]
+        if not_first:
+            return not self.exist(not_word, post) and self.exist(exist_word, post)
         if self.exist(exist_word, post) and not self.exist(not_word, post):
             return True
         return False
@@ -131,33 +282,54 @@ class PostChecker:
         :param near_ops: NEAR 피연산자
         :param near_num: NEAR 수
         :param post: 포스트 데이터
-        :return:
+        :return: NEAR 조건을 만족하는 단어들 사이의 index 들 (오름차순)
         """
         self.logger.debug(f"near_ops: {near_ops}, near_num: {near_num}, post: {post}")
-        near_op1 = near_ops[0]
-        near_op2 = near_ops[1]
-        indexes = []
-        op1_indexes = self.words_to_index(near_op1, post)
-        op2_indexes = self.words_to_index(near_op2, post)
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        op1_indexes = sorted(set(self.words_to_index(near_ops[0], post)))
+        op2_indexes = sorted(set(self.words_to_index(near_ops[1], post)))
+
+        # 두 index 목록을 함께 훑으며 각 op1 index 의 범위 안에 있는 가장 작은 op2 index 를 찾는다.
+        ranges = []
+        op2_pos = 0
         for op1_index in op1_indexes:
-            for op2_index in op2_indexes:
-                if op1_index - near_num - 1 <= op2_index <= op1_index + near_num + 1:
-                    min_index = min(op1_index, op2_index)
-                    max_index = max(op1_index, op2_index)
-                    for i in range(min_index, max_index + 1):
-                        indexes.append(i)
-                    break
-        return list(set(indexes))
+            while op2_pos < len(op2_indexes) and op2_indexes[op2_pos] < op1_index - near_num - 1:
+                op2_pos += 1
+            if op2_pos == len(op2_indexes):
+                break
+            op2_index = op2_indexes[op2_pos]
+            if op2_index <= op1_index + near_num + 1:
+                ranges.append((min(op1_index, op2_index), max(op1_index, op2_index)))
+        return self.ranges_to_indexes(ranges)
+
+    @staticmethod
+    def ranges_to_indexes(ranges):
+        """
+        (시작, 끝) 범위들을 겹치지 않게 합쳐 index 들로 만든다.
+        :param ranges: (시작 index, 끝 index) 들
+        :return: 범위들에 포함되는 index 들 (오름차순)
+        """
+        indexes = []
+        last = -1
+        for start, end in sorted(ranges):
+            start = max(start, last + 1)
+            if start <= end:
+                indexes.extend(range(start, end + 1))
+                last = end
+        return indexes
 
     def words_to_index(self, words, post):
         """
         NEAR 조건에 해당하는 단어들에 대한 index 를 구한다.
-        :param words: NEAR 조건에 해당하는 단어들
+        :param words: NEAR 조건에 해당하는 단어들 (단어, 단어들 또는 조건)
         :param post: 포스트 데이터
         :return: 단어들의 index 들
         """
         self.logger.debug(f"words: {words}, post: {post}")
-        if isinstance(words, str):
+        if isinstance(words, dict):
+            return self.condition_to_index(words, post)
+        if not isinstance(words, (list, tuple)):
             words = (words, )
         indexes = []
         for word in words:
@@ -165,6 +337,30 @@ class PostChecker:
             indexes.extend(idx)
         return indexes
 
+    def condition_to_index(self, query, post):
+        """
+        NEAR 조건의 피연산자인 조건에 매칭되는 포스트의 index 를 구한다.
+        :param query: 조건
+        :param post: 포스트 데이터
+        :return: 조건에 매칭되는 포스트의 index 들
+        """
+        operator = query["operator"]
+        operands = query["operands"]
+        if operator == 'NEAR':
+            return self.examine_near_condition(operands, query['distance'], post)
+        elif operator == 'OR':
+            matched = operands
+        elif operator == 'AND':
+            matched = operands if self.examine_and_condition(operands, post) else []
+        elif operator == 'NOT':
+            matched = operands[:1] if self.examine_not_condition(operands, post) else []
+        else:
+            matched = operands[:1]
+        indexes = []
+        for operand in matched:
+            indexes.extend(self.words_to_index(operand, post))
+        return indexes
+
     def word_to_index(self, word, post):
         """
         단어에 매칭되는 포스트의 index 를 구한다.
@@ -172,16 +368,24 @@ class PostChecker:
         :param post: 포스트 데이터
         :return: 단어에 매칭되는 포스트의 index 들
         """
+        if isinstance(word, SharedNode):
+            word = word.node
         if isinstance(word, list):
             return word
+        elif isinstance(word, dict):
+            return self.condition_to_index(word, post)
+        if self.deadline is not None:
+            self.enter_term(word)
+        if isinstance(word, str):
+            word = re.compile(word)
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
 
         indexes = []
-        word_len = word.count(" ")
-        finds = re.finditer(word, post)
-        for r in finds:
-            index = post[:r.start()].count(' ')
-            for i in range(word_len + 1):
-                indexes.append(index + i)
+        word_len = word.pattern.count(" ")
+        for r in word.finditer(post):
+            index = post.token_index(r.start())
+            indexes.extend(range(index, index + word_len + 1))
         return indexes
 
     @staticmethod
@@ -196,15 +400,36 @@ class PostChecker:
     def exist(self, word, post):
         """
         포스트에 단어가 존재하는 지 여부
-        :param word: 검색할 단어
+        :param word: 검색할 단어 (정규 표현식 문자열 또는 컴파일된 패턴)
         :param post: 포스트 데이터
         :return: 존재하는 지 여부
         """
         if isinstance(word, dict):
             return self.examine_conditions(word, post)
+        elif isinstance(word, SharedNode):
+            return self.examine_shared(word, post)
         elif isinstance(word, list):
             return len(word) > 0
-        return bool(re.search(word, post))
+        if self.deadline is not None:
+            self.enter_term(word)
+        if isinstance(word, str):
+            return bool(re.search(word, post))
+        return word.search(post) is not None
+
+    def examine_shared(self, shared, post):
+        """
+        공유 노드를 포스트마다 한 번만 평가한다.
+        :param shared: 공유 노드
+        :param post: 포스트 데이터
+        :return: 존재하는 지 여부
+        """
+        memo = getattr(post, "memo", None)
+        if memo is None:
+            return self.exist(shared.node, post)
+        result = memo.get(shared)
+        if result is None:
+            result = memo[shared] = self.exist(shared.node, post)
+        return result
 
     def replace_query(self, query):
         """
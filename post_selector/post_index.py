@@ -0,0 +1,475 @@
+import itertools
+import re
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+import logging_config as log
+from post_selector.pattern_trie import PatternTrie
+from post_selector.post_checker import PostChecker
+from post_selector.shared_node import SharedNode
+from post_selector.trigram_index import TrigramIndex
+from post_selector.word_term import GlobWordTerm
+
+
+class PostIndex:
+    """
+    전처리된 포스트들의 역색인(inverted index). 단어(공백으로 나눈 토큰)마다 그 단어가 있는 포스트 번호들을 가진다.
+    쿼리는 포스트마다 다시 훑지 않고 포스트 번호 목록(posting list)의 집합 연산으로 평가한다.
+    와일드카드 단어는 단어 사전(접두사는 이분 탐색, 중간 조각은 3-gram 색인)에서 펼치고,
+    여러 단어로 된 단어와 NEAR 조건은 후보 포스트만 정규 표현식으로 확인한다.
+    """
+
+    # 단어 정규 표현식의 앞, 뒤 (" " + 단어 + "[?!,. ]")
+    PREFIX = " "
+    SUFFIX = "[?!,. ]"
+    # 토큰 안에서 단어가 끝나는 곳
+    BOUNDARY = "(?:[?!,.]|$)"
+    # 공백일 수도 있는 "."을 펼칠 최대 개수
+    MAX_AMBIGUOUS = 3
+
+    def __init__(self, texts=(), tokens=(), postings=(), trigrams=None):
+        """
+        :param texts: 전처리된 포스트들
+        :param tokens: 단어 사전 (오름차순)
+        :param postings: 단어별 포스트 번호 배열
+        :param trigrams: 단어 사전의 3-gram 색인 ({3-gram: 단어 번호 배열}), 없으면 필요할 때 만든다.
+        """
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.checker = PostChecker()
+        self.texts = list(texts)
+        self.tokens = list(tokens)
+        self.postings = list(postings)
+        self.trigrams = None if trigrams is None else TrigramIndex(trigrams)
+        self.token_cache = {}
+        self.term_cache = {}
+        # 리터럴 조각 검색용 단어 사전 문자열과 단어별 시작 위치
+        self.dictionary = None
+        self.token_starts = None
+
+    @staticmethod
+    def build(posts):
+        """
+        포스트들로 역색인을 만든다.
+        :param posts: 포스트들
+        :return: "PostIndex"
+        """
+        texts = [str(text) for text in PostChecker().preprocess_posts(posts)]
+        postings = {}
+        for row, text in enumerate(texts):
+            for token in set(text[1:-1].split(" ")):
+                postings.setdefault(token, []).append(row)
+        tokens = sorted(postings)
+        return PostIndex(texts, tokens, [np.array(postings[token], dtype=np.int32) for token in tokens],
+                         TrigramIndex.build(tokens).grams)
+
+    def to_data(self):
+        """
+        저장할 데이터
+        :return: {"texts", "tokens", "postings", "trigrams"}
+        """
+        trigrams = None if self.trigrams is None else self.trigrams.grams
+        return {"texts": self.texts, "tokens": self.tokens, "postings": self.postings, "trigrams": trigrams}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def check_posts(self, compiled_query, index=None):
+        """
+        색인된 포스트들이 쿼리들의 패턴과 일치하는지 체크한다.
+        :param compiled_query: 컴파일된 쿼리
+        :param index: 결과의 index, 없으면 포스트 번호
+        :return: 쿼리(컬럼)별 'Y'/'N' 결과 (DataFrame)
+        """
+        values = {}
+        for query, column in zip(compiled_query.queries, compiled_query.columns):
+            values[column] = np.full(len(self), 'N')
+            values[column][self.evaluate(query)] = 'Y'
+        return pd.DataFrame(values, index=index)
+
+    def evaluate(self, query):
+        """
+        조건 또는 단어를 만족하는 포스트들을 구한다.
+        :param query: 조건 또는 단어
+        :return: 포스트 번호들 (오름차순)
+        """
+        if isinstance(query, SharedNode):
+            query = query.node
+        if isinstance(query, dict):
+            operator = query["operator"]
+            operands = query["operands"]
+            if operator == 'OR':
+                return self.union([self.evaluate(operand) for operand in operands])
+            elif operator == 'AND':
+                rows = self.evaluate(operands[0])
+                for operand in operands[1:]:
+                    if len(rows) == 0:
+                        break
+                    rows = np.intersect1d(rows, self.evaluate(operand), assume_unique=True)
+                return rows
+            elif operator == 'NOT':
+                rows = self.evaluate(operands[0])
+                if len(rows) == 0:
+                    return rows
+                return np.setdiff1d(rows, self.evaluate(operands[1]), assume_unique=True)
+            elif operator == 'NEAR':
+                # 두 피연산자가 모두 있는 포스트만 후보이다.
+                candidates = np.intersect1d(self.evaluate(operands[0]), self.evaluate(operands[1]), assume_unique=True)
+                return self.verify_near(query, candidates)
+            return self.evaluate(operands[0])
+        if isinstance(query, list):
+            return self.all_rows() if len(query) > 0 else self.no_rows()
+        return self.term_rows(query)
+
+    def term_rows(self, term):
+        """
+        단어가 있는 포스트들을 구한다.
+        :param term: 단어 (정규 표현식 문자열, 컴파일된 패턴 또는 "GlobWordTerm")
+        :return: 포스트 번호들 (오름차순)
+        """
+        pattern = term if isinstance(term, str) else term.pattern
+        if pattern in self.term_cache:
+            return self.term_cache[pattern]
+        variants = self.plan_term(pattern)
+        if isinstance(term, GlobWordTerm):
+            # 토큰 단위 정규 표현식도 긴 토큰에서 되돌아가기가 생기므로 리터럴 조각의 후보들을 "GlobWordTerm"으로 확인한다.
+            rows = self.verify(term, self.fragment_rows(pattern))
+        elif variants is None:
+            rows = self.verify(term, self.fragment_rows(pattern))
+        else:
+            variant_rows = []
+            for parts in variants:
+                rows = self.token_rows(parts[0], len(parts) == 1)
+                for i, part in enumerate(parts[1:], 2):
+                    if len(rows) == 0:
+                        break
+                    rows = np.intersect1d(rows, self.token_rows(part, i == len(parts)), assume_unique=True)
+                variant_rows.append(rows)
+            rows = self.union(variant_rows)
+            # 여러 토큰에 걸친 단어는 토큰들이 이어져 있는지 확인한다.
+            if any(len(parts) > 1 for parts in variants):
+                rows = self.verify(term, rows)
+        self.term_cache[pattern] = rows
+        return rows
+
+    def fragment_rows(self, pattern):
+        """
+        토큰 단위로 나눌 수 없는 단어의 후보 포스트들을 구한다.
+        공백이 없는 리터럴 조각은 한 토큰 안에 있으므로 그 조각이 들어 있는 토큰의 포스트들만 후보이다.
+        :param pattern: 정규 표현식 단어
+        :return: 후보 포스트 번호들, 리터럴 조각이 없으면 모든 포스트
+        """
+        atoms = PatternTrie.tokenize(pattern)
+        if atoms is None:
+            return self.all_rows()
+        fragments = [fragment for run in self.literal_runs(atoms) for fragment in run.split(" ")]
+        fragment = max(fragments, key=len)
+        if not fragment:
+            return self.all_rows()
+        return self.union([self.postings[token_id] for token_id in self.find_tokens(fragment)])
+
+    def plan_term(self, pattern):
+        """
+        단어 정규 표현식을 토큰 단위 정규 표현식들로 나눈다.
+        공백과 일치할 수 있는 "."은 공백인 경우와 아닌 경우로 펼친다.
+        :param pattern: 단어 정규 표현식
+        :return: 경우별 토큰 정규 표현식 원자들, 토큰 단위로 나눌 수 없으면 None
+        """
+        atoms = PatternTrie.tokenize(pattern)
+        if atoms is None or len(atoms) < 2 or atoms[0] != self.PREFIX or atoms[-1] != self.SUFFIX:
+            return None
+        atoms = atoms[1:-1]
+        if any(atom != " " and " " in atom and not atom.startswith("[^") for atom in atoms):
+            return None
+        ambiguous = [i for i, atom in enumerate(atoms)
+                     if atom == "." and i > 0 and atoms[i - 1] != " " and (i + 1 == len(atoms) or atoms[i + 1] != " ")]
+        if len(ambiguous) > self.MAX_AMBIGUOUS:
+            return None
+        variants = []
+        for spaces in itertools.product((False, True), repeat=len(ambiguous)):
+            variant = list(atoms)
+            for i, space in zip(ambiguous, spaces):
+                if space:
+                    variant[i] = " "
+            parts = [[]]
+            for atom in variant:
+                if atom == " ":
+                    parts.append([])
+                else:
+                    parts[-1].append(atom)
+            variants.append(parts)
+        return variants
+
+    def token_rows(self, atoms, last):
+        """
+        토큰 정규 표현식과 일치하는 토큰이 있는 포스트들을 구한다.
+        :param atoms: 토큰 정규 표현식 원자들
+        :param last: 단어의 마지막 토큰인지 여부 (마지막 토큰은 "[?!,.]"에서 끝날 수 있다)
+        :return: 포스트 번호들 (오름차순)
+        """
+        regex = "".join(atoms) + (self.BOUNDARY if last else "$")
+        return self.union([self.postings[token_id] for token_id in self.match_tokens(regex, atoms)])
+
+    def match_tokens(self, regex, atoms):
+        """
+        단어 사전에서 토큰 정규 표현식과 일치하는 토큰들을 찾는다.
+        리터럴 접두사가 있으면 사전에서 이분 탐색하고, 없으면 리터럴 조각이 있는 토큰들만 확인한다.
+        리터럴과 "."으로만 된 토큰 정규 표현식(끝에 "[^ ]*"가 있어도 된다.)은 컴파일하지 않고 문자별로 확인한다.
+        :param regex: 토큰 정규 표현식
+        :param atoms: 토큰 정규 표현식 원자들
+        :return: 토큰 번호들
+        """
+        if regex in self.token_cache:
+            return self.token_cache[regex]
+        runs = self.literal_runs(atoms)
+        prefix = runs[0]
+        fragment = max(runs, key=len)
+        if len(runs) == 1:
+            self.token_cache[regex] = self.match_literal(prefix, regex.endswith(self.BOUNDARY))
+            return self.token_cache[regex]
+        if prefix:
+            start = bisect_left(self.tokens, prefix)
+            end = bisect_left(self.tokens, prefix + chr(0x10ffff))
+            token_ids = range(start, end)
+        elif fragment:
+            token_ids = self.find_tokens(fragment)
+        else:
+            token_ids = range(len(self.tokens))
+        tokens = self.tokens
+        simple = self.simple_atoms(atoms)
+        if simple is not None:
+            chars, tail = simple
+            last = regex.endswith(self.BOUNDARY)
+            match_simple = self.match_simple
+            self.token_cache[regex] = [token_id for token_id in token_ids
+                                       if match_simple(tokens[token_id], chars, tail, last)]
+            return self.token_cache[regex]
+        match = re.compile(regex).match
+        self.token_cache[regex] = [token_id for token_id in token_ids if match(tokens[token_id])]
+        return self.token_cache[regex]
+
+    @staticmethod
+    def simple_atoms(atoms):
+        """
+        리터럴과 "."으로만 된 토큰 정규 표현식 원자들을 문자별로 나눈다.
+        :param atoms: 토큰 정규 표현식 원자들
+        :return: (문자들 ("."은 None), 끝에 "[^ ]*"가 있는지 여부), 다른 원자가 있으면 None
+        """
+        tail = len(atoms) > 0 and atoms[-1] == "[^ ]*"
+        chars = []
+        for atom in atoms[:-1] if tail else atoms:
+            literal = PostIndex.to_literal(atom)
+            if literal is None and atom != ".":
+                return None
+            chars.append(literal)
+        return chars, tail
+
+    @staticmethod
+    def match_simple(token, chars, tail, last):
+        """
+        토큰이 "simple_atoms"로 나눈 토큰 정규 표현식과 일치하는지 여부 ("re.match"와 같다.)
+        :param token: 토큰
+        :param chars: 문자들 ("."은 None)
+        :param tail: 끝에 "[^ ]*"가 있는지 여부
+        :param last: 단어의 마지막 토큰인지 여부 (마지막 토큰은 "[?!,.]"에서 끝날 수 있다)
+        :return: 일치 여부
+        """
+        size = len(chars)
+        if len(token) < size:
+            return False
+        for char, expected in zip(token, chars):
+            if char != expected and (expected is not None or char == "\n"):
+                return False
+        # 토큰에는 공백이 없으므로 "[^ ]*"는 토큰의 나머지와 일치한다.
+        if tail or len(token) == size:
+            return True
+        return last and token[size] in "?!,."
+
+    def match_literal(self, literal, last):
+        """
+        리터럴 토큰 정규 표현식과 일치하는 토큰들을 정규 표현식 없이 찾는다.
+        :param literal: 리터럴
+        :param last: 단어의 마지막 토큰인지 여부
+        :return: 토큰 번호들
+        """
+        start = bisect_left(self.tokens, literal)
+        if not last:
+            return [start] if start < len(self.tokens) and self.tokens[start] == literal else []
+        end = bisect_left(self.tokens, literal + chr(0x10ffff))
+        size = len(literal)
+        return [token_id for token_id in range(start, end)
+                if len(self.tokens[token_id]) == size or self.tokens[token_id][size] in "?!,."]
+
+    def find_tokens(self, fragment):
+        """
+        리터럴 조각이 들어 있는 토큰들을 찾는다.
+        3-gram 색인으로 후보 토큰들을 구해 확인하고, 조각이 3글자보다 짧으면 단어 사전 전체에서 찾는다.
+        :param fragment: 리터럴 조각
+        :return: 토큰 번호들 (오름차순)
+        """
+        if len(fragment) >= TrigramIndex.SIZE:
+            if self.trigrams is None:
+                self.trigrams = TrigramIndex.build(self.tokens)
+            tokens = self.tokens
+            return [token_id for token_id in self.trigrams.candidates(fragment).tolist()
+                    if fragment in tokens[token_id]]
+        if self.dictionary is None:
+            self.dictionary = "\n".join(self.tokens) + "\n"
+            self.token_starts = list(itertools.accumulate((len(token) + 1 for token in self.tokens[:-1]), initial=0))
+        dictionary, starts = self.dictionary, self.token_starts
+        token_ids = []
+        index = dictionary.find(fragment)
+        while index != -1:
+            token_id = bisect_right(starts, index) - 1
+            token_ids.append(token_id)
+            index = dictionary.find(fragment, dictionary.index("\n", index) + 1)
+        return token_ids
+
+    @staticmethod
+    def literal_runs(atoms):
+        """
+        토큰 정규 표현식 원자들의 리터럴 조각들
+        :param atoms: 원자들
+        :return: 리터럴 조각들
+        """
+        runs = [[]]
+        for atom in atoms:
+            literal = PostIndex.to_literal(atom)
+            if literal is None:
+                runs.append([])
+            else:
+                runs[-1].append(literal)
+        return ["".join(run) for run in runs]
+
+    @staticmethod
+    def to_literal(atom):
+        """
+        원자가 한 문자만 일치하면 그 문자
+        :param atom: 원자
+        :return: 문자, 아니면 None
+        """
+        if len(atom) == 1 and atom != ".":
+            return atom
+        elif len(atom) == 3 and atom[0] == "[" and atom[2] == "]":
+            return atom[1]
+        return None
+
+    def verify(self, query, rows):
+        """
+        후보 포스트들을 저장된 포스트로 확인한다.
+        :param query: 조건 또는 단어
+        :param rows: 후보 포스트 번호들
+        :return: 조건 또는 단어를 만족하는 포스트 번호들
+        """
+        texts = self.texts
+        if isinstance(query, str):
+            query = re.compile(query)
+        if isinstance(query, re.Pattern):
+            search = query.search
+            found = (search(texts[row]) is not None for row in rows)
+        else:
+            exist = self.checker.exist
+            found = (exist(query, texts[row]) for row in rows)
+        return rows[np.fromiter(found, dtype=bool, count=len(rows))]
+
+    def verify_near(self, query, rows):
+        """
+        NEAR 조건의 후보 포스트들을 확인한다.
+        포스트마다 OR 조건의 피연산자 중 그 포스트에 없는 단어들을 빼고 확인한다.
+        (OR 조건의 피연산자들은 각자 일치 여부와 위치를 더하므로 없는 단어를 빼도 결과가 같다.)
+        :param query: NEAR 조건
+        :param rows: 후보 포스트 번호들
+        :return: 조건을 만족하는 포스트 번호들
+        """
+        if len(rows) == 0:
+            return rows
+        candidates = np.zeros(len(self), dtype=bool)
+        candidates[rows] = True
+        # 후보 포스트별로 있는 단어들
+        present = {}
+        for pattern, term in self.or_terms(query, {}).items():
+            term_rows = self.term_rows(term)
+            for row in term_rows[candidates[term_rows]].tolist():
+                present.setdefault(row, []).append(pattern)
+        exist = self.checker.exist
+        texts = self.texts
+        # 있는 단어들이 같은 포스트들은 같은 조건으로 확인한다.
+        pruned = {}
+        found = np.zeros(len(rows), dtype=bool)
+        for i, row in enumerate(rows.tolist()):
+            key = frozenset(present.get(row, ()))
+            if key not in pruned:
+                pruned[key] = self.prune(query, key)
+            found[i] = exist(pruned[key], texts[row])
+        return rows[found]
+
+    @staticmethod
+    def is_term(node):
+        return not isinstance(node, (dict, list, SharedNode))
+
+    @staticmethod
+    def term_pattern(term):
+        return term if isinstance(term, str) else term.pattern
+
+    def or_terms(self, query, terms):
+        """
+        조건 안의 OR 조건의 피연산자인 단어들을 모은다.
+        :param query: 조건 또는 단어
+        :param terms: {단어 정규 표현식: 단어}
+        :return: "terms"
+        """
+        if isinstance(query, SharedNode):
+            query = query.node
+        if isinstance(query, dict):
+            for operand in query["operands"]:
+                if isinstance(operand, SharedNode):
+                    operand = operand.node
+                if query["operator"] == 'OR' and self.is_term(operand):
+                    terms.setdefault(self.term_pattern(operand), operand)
+                else:
+                    self.or_terms(operand, terms)
+        return terms
+
+    def prune(self, query, present):
+        """
+        OR 조건의 피연산자 중 포스트에 없는 단어들을 뺀 조건
+        :param query: 조건 또는 단어
+        :param present: 포스트에 있는 단어 정규 표현식들
+        :return: 조건 또는 단어
+        """
+        if isinstance(query, SharedNode):
+            query = query.node
+        if not isinstance(query, dict):
+            return query
+        operands = []
+        for operand in query["operands"]:
+            if isinstance(operand, SharedNode):
+                operand = operand.node
+            if query["operator"] == 'OR' and self.is_term(operand):
+                if self.term_pattern(operand) in present:
+                    operands.append(operand)
+            else:
+                operands.append(self.prune(operand, present))
+        return {**query, "operands": operands}
+
+    @staticmethod
+    def union(rows_list):
+        """
+        포스트 번호 배열들의 합집합
+        :param rows_list: 포스트 번호 배열들
+        :return: 포스트 번호들 (오름차순)
+        """
+        rows_list = [rows for rows in rows_list if len(rows) > 0]
+        if not rows_list:
+            return PostIndex.no_rows()
+        if len(rows_list) == 1:
+            return rows_list[0]
+        return np.unique(np.concatenate(rows_list))
+
+    def all_rows(self):
+        return np.arange(len(self), dtype=np.int32)
+
+    @staticmethod
+    def no_rows():
+        return np.zeros(0, dtype=np.int32)
@@ -1,12 +1,22 @@
-from functools import partial
+import copy
+import hashlib
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
 import logging_config as log
+from post_selector.column_checker import ColumnChecker
 from post_selector.post_checker import PostChecker
 from post_selector.data_loader import DataLoader
-from post_selector.query_parser import QueryParser
+from post_selector.post_index import PostIndex
+from post_selector.preprocessed_post import PreprocessedPost
+from post_selector.query_codegen import QueryCodegen
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_planner import QueryPlanner
+from post_selector.query_profiler import QueryProfiler
+from post_selector.result_cache import ResultCache
+from post_selector.term_cache import TermCache
 from utils.parallel_utils import ParallelUtils
 
 
@@ -15,6 +25,14 @@ class PostSelector:
     포스트들이 "query"의 패턴과 일치하는지 체크하여 결과를 저장한다.
     """
 
+    # 워커 프로세스에 설치되는 컴파일된 쿼리와 쿼리 함수들, 포스트별 검사 시간 제한, 포스트를 검사할 "PostChecker"
+    worker_compiled_query = None
+    worker_functions = None
+    worker_time_budget = None
+    worker_checker = None
+    # 프로파일 모드에서 워커 프로세스의 쿼리 함수들이 통계를 모으는 "QueryProfiler"
+    worker_profiler = None
+
     def __init__(self, query_file_names=("query",)):
         self.logger = log.get_logger(self.__class__.__name__)
         self.query_file_names = query_file_names
@@ -22,14 +40,42 @@ class PostSelector:
 
         self.loader = DataLoader()
         self.checker = PostChecker()
+        self.compiler = QueryCompiler()
+        self.codegen = QueryCodegen()
+        self.column_checker = ColumnChecker()
+        self.planner = QueryPlanner()
+        # 역색인과 단어별 결과 캐시는 OR 조건의 단어들을 합치지 않고 단어별로 검사한다.
+        # 역색인으로 후보 포스트를 찾으므로 바이그램 서명 필터는 쓰지 않는다.
+        self.index_compiler = QueryCompiler(fuse_or=False, reorder=False, share=False, bigram_filter=False)
+        # 마지막 검사에서 중복 포스트를 없앤 결과 ({"posts", "unique_posts", "saved_ratio"})
+        self.dedupe_stats = None
+        # 마지막 검사에서 "auto" 검사 방식으로 고른 계획 ({"engine", "features", "costs"})
+        self.last_plan = None
+        # 프로파일 모드에서 워커들의 통계를 합친 "QueryProfiler"와 마지막 검사의 보고서
+        self.profiler = None
+        self.profile_report = None
+        # 마지막 검사에서 검사 시간 제한을 넘은 포스트들의 인덱스 (검사 방식에 넘긴 포스트들의 인덱스)
+        self.timed_out_rows = []
 
-    def check_posts(self, query_file_names=None, column_names=None, cpu_divide_count=2, posts=None):
+    def check_posts(self, query_file_names=None, column_names=None, cpu_divide_count=2, posts=None, engine="auto",
+                    result_cache=False, dedupe=True, save_preprocessed=False, time_budget=None, profile=False):
         """
         포스트들이 "query"의 패턴과 일치하는지 체크하여 결과를 저장한다.
         :param query_file_names: 쿼리 파일 명들
         :param column_names: 컬럼 명들
         :param cpu_divide_count:
         :param posts:
+        :param engine: 검사 방식 ("auto": "QueryPlanner"가 비용 모델로 "post"와 "column" 중에서 고름,
+                       "post": 포스트 순 병렬 검사, "column": 컬럼 전체를 단어 순으로 검사,
+                       "index": 포스트 파일의 역색인으로 검사, "term_cache": 단어별 결과 캐시를 재사용하여 검사)
+                       벤치마크 등에서 계획을 따르지 않으려면 검사 방식을 직접 지정한다.
+        :param result_cache: 포스트 검사 결과 캐시를 사용할지 여부. 캐시에 없는 포스트만 검사한다.
+        :param dedupe: 전처리된 내용이 같은 포스트들을 한 번만 검사할지 여부
+        :param save_preprocessed: 포스트 파일의 전처리된 메시지를 저장하고 재사용할지 여부
+        :param time_budget: 포스트별 검사 시간 제한 (초). 넘은 포스트는 격리 파일에 기록하고 'N'으로 둔다.
+                            ("post" 검사 방식에만 적용한다.)
+        :param profile: 쿼리별, 단어별 검사 수, 적중 수, 건너뛴 수, 누적 검사 시간을 모아 보고서("profile_report")를
+                        만들지 여부. 포스트 파일을 읽었으면 보고서를 CSV, JSON으로 저장한다. ("post" 검사 방식에만 적용한다.)
         :return:
         """
         if query_file_names is not None:
@@ -42,13 +88,179 @@ class PostSelector:
         file_name = None
         if posts is None:
             posts, file_name = self.loader.load_post()
-        posts = self.check_posts_by_post_parallel(posts, query_file_names, column_names,
-                                                  cpu_divide_count=cpu_divide_count)
+        posts = posts.reset_index(drop=True)
+        # 메시지 컬럼은 한 번만 전처리하고, 모든 검사 방식은 전처리된 메시지를 그대로 쓴다.
+        checked = posts.copy()
+        checked.isetitem(0, self.preprocess_posts(posts.iloc[:, 0], file_name if save_preprocessed else None))
+        inverse = None
+        if dedupe:
+            checked, inverse = self.dedupe_posts(checked)
+        if self.compiler.bigram_filter and engine in ("auto", "post", "column"):
+            PreprocessedPost.sign_posts(checked.iloc[:, 0])
+        self.profiler = QueryProfiler() if profile else None
+        if result_cache:
+            checked = self.check_posts_by_result_cache(checked, query_file_names, column_names, engine=engine,
+                                                       cpu_divide_count=cpu_divide_count, time_budget=time_budget,
+                                                       profile=profile)
+        else:
+            checked = self.check_posts_by_engine(checked, query_file_names, column_names, engine=engine,
+                                                 cpu_divide_count=cpu_divide_count, index_name=file_name,
+                                                 time_budget=time_budget, profile=profile)
+        if profile:
+            self.profile_report = self.profiler.report()
+            if file_name is not None:
+                self.loader.save_profile_report(self.profile_report, file_name)
+        values = checked[list(column_names)]
+        if inverse is not None:
+            # 중복을 없앤 포스트들의 결과를 모든 포스트로 펼친다.
+            values = values.iloc[inverse]
+        posts = pd.concat([posts, values.reset_index(drop=True)], axis=1)
         posts = posts.iloc[:, 1:]
         if file_name is not None:
             self.loader.save_result(posts, file_name)
         return posts
 
+    def preprocess_posts(self, messages, name=None):
+        """
+        메시지 컬럼을 한꺼번에 전처리한다.
+        이름이 있으면 전처리된 메시지를 저장해 두고, 다음에 메시지들이 같으면 저장된 결과를 쓴다.
+        :param messages: 메시지들 (Series)
+        :param name: 저장할 이름 (포스트 파일 명)
+        :return: 전처리된 메시지들 (Series)
+        """
+        key = None
+        if name is not None:
+            key = self.messages_key(messages)
+            data = self.loader.load_preprocessed_posts(name)
+            if data is not None and data["key"] == key:
+                texts = [PreprocessedPost(text) for text in data["texts"]]
+                return pd.Series(texts, index=messages.index, dtype=object)
+        texts = self.checker.preprocess_posts(messages)
+        if name is not None:
+            self.loader.save_preprocessed_posts({"key": key, "texts": [str(text) for text in texts]}, name)
+        return pd.Series(texts, index=messages.index, dtype=object)
+
+    @staticmethod
+    def messages_key(messages):
+        """
+        메시지들과 전처리 방식의 키
+        :param messages: 메시지들 (Series)
+        :return: 키
+        """
+        digest = hashlib.sha1(str(PostChecker.PREPROCESS_VERSION).encode("utf8"))
+        # 짝이 없는 서로게이트(깨진 이모지)도 해시할 수 있도록 "surrogatepass"로 인코딩한다.
+        for message in messages.astype(str):
+            digest.update(message.encode("utf-8", "surrogatepass"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def dedupe_posts(self, posts):
+        """
+        전처리된 메시지가 같은 포스트들 중 처음 나온 포스트만 남긴다. 줄어든 검사량은 "dedupe_stats"에 남긴다.
+        :param posts: 포스트들
+        :return: 중복을 없앤 포스트들, 포스트별 중복을 없앤 포스트 번호 배열
+        """
+        texts = self.checker.preprocess_posts(posts.iloc[:, 0])
+        # "pd.factorize"는 짝이 없는 서로게이트(깨진 이모지)가 있는 문자열들을 같은 값으로 보므로 dict로 번호를 붙인다.
+        uniques = {}
+        inverse = np.fromiter((uniques.setdefault(str(text), len(uniques)) for text in texts), dtype=np.int64,
+                              count=len(texts))
+        first = np.unique(inverse, return_index=True)[1]
+        self.dedupe_stats = {"posts": len(posts), "unique_posts": len(uniques),
+                             "saved_ratio": 1 - len(uniques) / len(posts) if len(posts) > 0 else 0.0}
+        self.logger.info(f"Dedupe posts: {self.dedupe_stats}")
+        return posts.iloc[first], inverse
+
+    def check_posts_by_engine(self, posts, query_file_names, column_names, engine="auto", cpu_divide_count=2,
+                              index_name=None, time_budget=None, profile=False):
+        """
+        검사 방식에 따라 포스트들을 체크함
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :param engine: 검사 방식
+        :param cpu_divide_count:
+        :param index_name: 역색인을 저장, 재사용할 이름 (포스트 파일 명)
+        :param time_budget: 포스트별 검사 시간 제한 (초)
+        :param profile: 쿼리별, 단어별 통계를 모을지 여부
+        :return:
+        """
+        self.timed_out_rows = []
+        if engine == "auto":
+            engine = self.plan_engine(posts, query_file_names, column_names, cpu_divide_count=cpu_divide_count,
+                                      fixed=time_budget is not None or profile)
+        if time_budget is not None and engine != "post":
+            self.logger.warning(f"Time budget is not applied to engine: {engine}")
+        if profile and engine != "post":
+            self.logger.warning(f"Profile is not collected by engine: {engine}")
+        if engine == "column":
+            return self.check_posts_by_column(posts, query_file_names, column_names)
+        elif engine == "index":
+            return self.check_posts_by_index(posts, query_file_names, column_names, index_name=index_name)
+        elif engine == "term_cache":
+            return self.check_posts_by_term_cache(posts, query_file_names, column_names)
+        return self.check_posts_by_post_parallel(posts, query_file_names, column_names,
+                                                 cpu_divide_count=cpu_divide_count, time_budget=time_budget,
+                                                 profile=profile)
+
+    def plan_engine(self, posts, query_file_names, column_names, cpu_divide_count=2, fixed=False):
+        """
+        "QueryPlanner"로 검사 방식을 고른다.
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :param cpu_divide_count:
+        :param fixed: 검사 시간 제한이나 프로파일처럼 "post" 검사 방식에만 있는 기능을 쓰는지 여부
+        :return: 검사 방식
+        """
+        if fixed:
+            self.logger.info("Plan: post (time budget or profile requires the post engine)")
+            self.last_plan = {"engine": "post", "features": None, "costs": None}
+            return "post"
+        compiled_query = self.compiler.compile(query_file_names, column_names)
+        self.last_plan = self.planner.plan(posts.iloc[:, 0], compiled_query, cpu_divide_count=cpu_divide_count)
+        return self.last_plan["engine"]
+
+    def check_posts_by_result_cache(self, posts, query_file_names, column_names, engine="auto", cpu_divide_count=2,
+                                    time_budget=None, profile=False):
+        """
+        저장된 포스트 검사 결과를 재사용하여 체크함. (메시지 해시, 쿼리 키)가 캐시에 없는 포스트만 검사하고 캐시를 저장한다.
+        검사 시간 제한을 넘은 포스트의 결과('N'으로 채운 결과)는 캐시에 저장하지 않는다.
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :param engine: 캐시에 없는 포스트들의 검사 방식
+        :param cpu_divide_count:
+        :param time_budget: 포스트별 검사 시간 제한 (초)
+        :param profile: 캐시에 없는 포스트들의 쿼리별, 단어별 통계를 모을지 여부
+        :return:
+        """
+        posts = posts.reset_index(drop=True)
+        data = self.loader.load_result_cache()
+        cache = ResultCache() if data is None else ResultCache(**data)
+        query_keys = [self.compiler.query_key(query_file_name) for query_file_name in query_file_names]
+        hashes = [ResultCache.message_hash(message) for message in posts.iloc[:, 0]]
+
+        values = {column: [cache.get(message_hash, query_key) for message_hash in hashes]
+                  for query_key, column in zip(query_keys, column_names)}
+        missing = [row for row in range(len(posts)) if any(values[column][row] is None for column in column_names)]
+        self.logger.info(f"Result cache hits: {cache.hits}, misses: {cache.misses}, "
+                         f"posts to check: {len(missing)}/{len(posts)}")
+        if missing:
+            checked = self.check_posts_by_engine(posts.iloc[missing], query_file_names, column_names, engine=engine,
+                                                 cpu_divide_count=cpu_divide_count, time_budget=time_budget,
+                                                 profile=profile)
+            timed_out = set(self.timed_out_rows)
+            if timed_out:
+                self.logger.info(f"Result cache skips timed out posts: {len(timed_out)}")
+            for query_key, column in zip(query_keys, column_names):
+                for row, value in zip(missing, checked[column]):
+                    values[column][row] = value
+                    if row not in timed_out:
+                        cache.put(hashes[row], query_key, value)
+            self.loader.save_result_cache(cache.to_data())
+        return pd.concat([posts, pd.DataFrame(values)], axis=1)
+
     def check_posts_by_query(self, posts, query_file_names, column_names):
         """
         쿼리 순으로 포스트를 체크함
@@ -57,43 +269,224 @@ class PostSelector:
         :param column_names: 컬럼명들
         :return:
         """
+        messages = pd.Series(self.checker.preprocess_posts(posts.iloc[:, 0]), index=posts.index, dtype=object)
         for query_file_name, column_name in zip(query_file_names, column_names):
             query = self.get_query(query_file_name)
             self.logger.debug(f"Query : {query}")
             tqdm.pandas(desc=f"Check Posts::{query_file_name}")
-            posts[column_name] = posts.iloc[:, 0].progress_apply(self.checker.check_post, query=query)
+            posts[column_name] = messages.progress_apply(self.checker.check_post, query=query, preprocess_post=True)
         return posts
 
-    def check_posts_by_post(self, posts, query_file_names, column_names, tqdm_disable=False):
+    def check_posts_by_post(self, posts, query_file_names, column_names, tqdm_disable=False, time_budget=None):
         """
         포스트 순으로 쿼리들을 체크함
         :param posts: 포스트들
         :param query_file_names: 쿼리 파일명들
         :param column_names: 컬럼명들
         :param tqdm_disable:
+        :param time_budget: 포스트별 검사 시간 제한 (초)
         :return:
         """
-        parser = QueryParser()
-        queries = []
-        for query_file_name in query_file_names:
-            query = self.get_query(query_file_name)
-            query = parser.query_to_dict(query)
-            queries.append(query)
+        compiled_query = self.compiler.compile(query_file_names, column_names)
+        return self.check_posts_by_compiled_query(posts, compiled_query, tqdm_disable=tqdm_disable,
+                                                  time_budget=time_budget)
 
+    def check_posts_by_compiled_query(self, posts, compiled_query, tqdm_disable=False, functions=None,
+                                      time_budget=None):
+        """
+        컴파일된 쿼리로 포스트 순으로 쿼리들을 체크함. 쿼리들은 "QueryCodegen"의 쿼리 함수들로 바꿔 검사한다.
+        :param posts: 포스트들
+        :param compiled_query: 컴파일된 쿼리
+        :param tqdm_disable:
+        :param functions: 쿼리 함수들, 없으면 컴파일된 쿼리로 만든다.
+        :param time_budget: 포스트별 검사 시간 제한 (초). 넘은 포스트는 격리 파일에 기록하고 인덱스를 "timed_out_rows"에 둔다.
+        :return:
+        """
+        if functions is None:
+            functions = self.codegen.compile_queries(compiled_query.queries)
+        posts, self.timed_out_rows = self.check_posts_by_functions(self.checker, posts, compiled_query, functions,
+                                                                   tqdm_disable=tqdm_disable,
+                                                                   time_budget=time_budget)
+        return posts
+
+    @staticmethod
+    def check_posts_by_functions(checker, posts, compiled_query, functions, tqdm_disable=False, time_budget=None):
+        """
+        쿼리 함수들로 포스트 순으로 쿼리들을 체크함. 워커 프로세스에서도 쓰므로 인스턴스 상태를 쓰지 않는다.
+        :param checker: 포스트를 검사할 "PostChecker"
+        :param posts: 포스트들
+        :param compiled_query: 컴파일된 쿼리
+        :param functions: 쿼리 함수들
+        :param tqdm_disable:
+        :param time_budget: 포스트별 검사 시간 제한 (초)
+        :return: (검사 결과, 검사 시간 제한을 넘은 포스트들의 인덱스)
+        """
+        logger = log.get_logger("PostSelector")
+        quarantined = checker.quarantined
+        labels = posts.index
         posts = posts.reset_index(drop=True)
         values = []
-        for index, post in tqdm(zip(posts.index, posts.iloc[:, 0]), total=len(posts.index),
-                                desc="Check Posts", disable=tqdm_disable):
-            self.logger.debug(f"Post index: {index}")
-            row = self.checker.check_post_for_queries(post, queries, column_names)
+        timed_out_rows = []
+        for index, label, post in tqdm(zip(posts.index, labels, posts.iloc[:, 0]), total=len(posts.index),
+                                       desc="Check Posts", disable=tqdm_disable):
+            logger.debug(f"Post index: {index}")
+            count = len(quarantined)
+            row = checker.check_post_by_functions(post, functions, compiled_query.columns,
+                                                  queries=compiled_query.queries, time_budget=time_budget)
+            if len(quarantined) > count:
+                timed_out_rows.append(label)
             values.append(row)
         posts = pd.concat([posts, pd.DataFrame(values)], axis=1)
-        return posts
+        return posts, timed_out_rows
 
-    def check_posts_by_post_parallel(self, posts, query_file_names, column_names, cpu_divide_count=2):
-        check_posts_by_post = partial(self.check_posts_by_post, query_file_names=query_file_names,
-                                      column_names=column_names, tqdm_disable=True)
-        return ParallelUtils.parallel(posts, check_posts_by_post, cpu_divide_count=cpu_divide_count, desc="Check Posts")
+    def check_posts_by_column(self, posts, query_file_names, column_names):
+        """
+        컬럼 전체를 단어 순으로 체크함
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :return:
+        """
+        compiled_query = self.compiler.compile(query_file_names, column_names)
+        posts = posts.reset_index(drop=True)
+        values = self.column_checker.check_posts(posts.iloc[:, 0], compiled_query)
+        return pd.concat([posts, values], axis=1)
+
+    def check_posts_by_index(self, posts, query_file_names, column_names, index_name=None):
+        """
+        포스트들의 역색인으로 체크함
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :param index_name: 역색인을 저장, 재사용할 이름 (포스트 파일 명), 없으면 저장하지 않는다.
+        :return:
+        """
+        posts = posts.reset_index(drop=True)
+        index = self.get_index(posts.iloc[:, 0], index_name)
+        compiled_query = self.index_compiler.compile(query_file_names, column_names)
+        values = index.check_posts(compiled_query, index=posts.index)
+        return pd.concat([posts, values], axis=1)
+
+    def get_index(self, posts, index_name=None):
+        """
+        포스트들의 역색인을 가져온다. 저장된 역색인이 없거나 포스트 내용의 키가 다르면 새로 만들어 저장한다.
+        :param posts: 포스트들
+        :param index_name: 역색인의 이름 (포스트 파일 명)
+        :return: "PostIndex"
+        """
+        key = None
+        if index_name is not None:
+            key = self.messages_key(posts)
+            data = self.loader.load_post_index(index_name)
+            if data is not None and data.get("key") == key:
+                return PostIndex(**data["index"])
+        self.logger.debug(f"Build index: {index_name}")
+        index = PostIndex.build(posts)
+        if index_name is not None:
+            self.loader.save_post_index({"key": key, "index": index.to_data()}, index_name)
+        return index
+
+    def check_posts_by_term_cache(self, posts, query_file_names, column_names):
+        """
+        저장된 단어별 검사 결과를 재사용하여 체크함. 캐시에 없는 (단어, 포스트)만 검사하고 캐시를 저장한다.
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :return:
+        """
+        posts = posts.reset_index(drop=True)
+        data = self.loader.load_term_cache()
+        cache = TermCache() if data is None else TermCache(**data)
+        compiled_query = self.index_compiler.compile(query_file_names, column_names)
+        values = cache.check_posts(posts.iloc[:, 0], compiled_query, index=posts.index)
+        self.loader.save_term_cache(cache.to_data())
+        return pd.concat([posts, values], axis=1)
+
+    def check_posts_by_post_parallel(self, posts, query_file_names, column_names, cpu_divide_count=2,
+                                     time_budget=None, profile=False):
+        """
+        포스트 순으로 쿼리들을 병렬로 체크함. 쿼리는 한 번만 컴파일하여 워커 초기화 시 설치한다.
+        :param posts: 포스트들
+        :param query_file_names: 쿼리 파일명들
+        :param column_names: 컬럼명들
+        :param cpu_divide_count:
+        :param time_budget: 포스트별 검사 시간 제한 (초)
+        :param profile: 쿼리별, 단어별 통계를 모아 "profiler"에 합칠지 여부
+        :return:
+        """
+        compiler = self.profile_compiler() if profile else self.compiler
+        compiled_query = compiler.compile(query_file_names, column_names)
+        return ParallelUtils.parallel(posts, PostSelector.check_posts_in_worker, cpu_divide_count=cpu_divide_count,
+                                      desc="Check Posts", initializer=PostSelector.init_worker,
+                                      initargs=(compiled_query, time_budget, profile, self.checker.quarantine_name),
+                                      combine=self.combine_worker_results
+                                      if profile or time_budget is not None else None)
+
+    def profile_compiler(self):
+        """
+        프로파일 모드의 컴파일러. 단어별로 통계를 모으도록 OR 조건의 단어들을 합치지 않고 공유 노드를 만들지 않는다.
+        :return: "QueryCompiler"
+        """
+        compiler = copy.copy(self.compiler)
+        compiler.fuse_or = False
+        compiler.share = False
+        return compiler
+
+    @staticmethod
+    def init_worker(compiled_query, time_budget=None, profile=False, quarantine_name="quarantine"):
+        """
+        워커 프로세스에 컴파일된 쿼리를 설치한다. 클로저는 pickle 할 수 없으므로 쿼리 함수들은 워커에서 만든다.
+        :param compiled_query: 컴파일된 쿼리
+        :param time_budget: 포스트별 검사 시간 제한 (초)
+        :param profile: 쿼리 함수들이 쿼리별, 단어별 통계를 모을지 여부
+        :param quarantine_name: 검사 시간 제한을 넘은 포스트를 기록할 격리 파일명
+        :return:
+        """
+        PostSelector.worker_compiled_query = compiled_query
+        PostSelector.worker_time_budget = time_budget
+        PostSelector.worker_checker = PostChecker()
+        PostSelector.worker_checker.quarantine_name = quarantine_name
+        if profile:
+            PostSelector.worker_profiler = QueryProfiler()
+            PostSelector.worker_functions = PostSelector.worker_profiler.compile_queries(compiled_query.queries,
+                                                                                         compiled_query.columns)
+        else:
+            PostSelector.worker_profiler = None
+            PostSelector.worker_functions = QueryCodegen().compile_queries(compiled_query.queries)
+
+    @staticmethod
+    def check_posts_in_worker(posts):
+        """
+        워커 프로세스에 설치된 쿼리로 포스트들을 체크함. 포스트 묶음만 워커로 보내도록 인스턴스를 받지 않는다.
+        :param posts: 포스트들
+        :return: 검사 결과, 프로파일 모드이거나 검사 시간 제한이 있으면
+                 (검사 결과, 이 포스트들로 모은 통계 또는 None, 검사 시간 제한을 넘은 포스트들의 인덱스)
+        """
+        posts, timed_out_rows = PostSelector.check_posts_by_functions(PostSelector.worker_checker, posts,
+                                                                      PostSelector.worker_compiled_query,
+                                                                      PostSelector.worker_functions,
+                                                                      tqdm_disable=True,
+                                                                      time_budget=PostSelector.worker_time_budget)
+        if PostSelector.worker_profiler is None and PostSelector.worker_time_budget is None:
+            return posts
+        stats = None if PostSelector.worker_profiler is None else PostSelector.worker_profiler.take()
+        return posts, stats, timed_out_rows
+
+    def combine_worker_results(self, results):
+        """
+        프로파일 모드이거나 검사 시간 제한이 있는 워커 결과들을 합친다.
+        통계는 "profiler"에 더하고, 검사 시간 제한을 넘은 포스트들의 인덱스는 "timed_out_rows"에 모은다.
+        :param results: [(검사 결과, 통계 또는 None, 검사 시간 제한을 넘은 포스트들의 인덱스)]
+        :return: 검사 결과
+        """
+        self.timed_out_rows = []
+        for _, stats, timed_out_rows in results:
+            if stats is not None:
+                if self.profiler is None:
+                    self.profiler = QueryProfiler()
+                self.profiler.merge(stats)
+            self.timed_out_rows.extend(timed_out_rows)
+        return pd.concat([posts for posts, _, _ in results], ignore_index=True)
 
     def get_query(self, query_file_name):
         """
@@ -101,5 +494,4 @@ class PostSelector:
         :param query_file_name: 쿼리 파일명
         :return:
         """
-        query = self.loader.load_query(query_file_name)
-        return self.checker.replace_query(query)
+        return self.compiler.load_query(query_file_name)
@@ -19,6 +19,22 @@ class PostSelectorConfig(Config):
     def query_dir(self):
         return self.data_dir / 'query'
 
+    @property
+    def query_cache_dir(self):
+        return self.query_dir / 'cache'
+
+    @property
+    def index_dir(self):
+        return self.data_dir / 'index'
+
+    @property
+    def cache_dir(self):
+        return self.data_dir / 'cache'
+
+    @property
+    def quarantine_dir(self):
+        return self.data_dir / 'quarantine'
+
     @property
     def run_dir(self):
         return self.data_dir / 'post' / 'run_file'
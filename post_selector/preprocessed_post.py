@@ -0,0 +1,107 @@
+import re
+from bisect import bisect_left
+
+from post_selector.bigram_signature import BigramSignature
+from post_selector.unicode_scripts import UnicodeScripts
+
+
+class PreprocessedPost(str):
+    """
+    전처리된 포스트 데이터. 문자열처럼 사용하며, 검사에 필요한 부가 정보를 필요할 때 한 번만 구해 둔다.
+    """
+
+    # 해시태그, 멘션의 시작 문자
+    TAG_STARTS = "#@"
+    # 해시태그, 멘션 단어
+    TAG_WORD = re.compile(" ([#@][^ ]*)")
+    # 단어 뒤의 경계 문자 (QueryParser.to_regex_word 의 "[?!,. ]"에서 공백을 뺀 문자들)
+    TAG_BOUNDARY = re.compile("[?!,.]")
+
+    def __new__(cls, post):
+        self = super().__new__(cls, post)
+        self.__spaces = None
+        self.__tags = None
+        self.__tag_words = None
+        self.__scripts = None
+        self.__signature = None
+        # 공유 노드("SharedNode")의 평가 결과
+        self.memo = {}
+        return self
+
+    @property
+    def spaces(self):
+        """
+        공백 문자들의 위치 (오름차순)
+        """
+        if self.__spaces is None:
+            spaces = []
+            index = self.find(" ")
+            while index != -1:
+                spaces.append(index)
+                index = self.find(" ", index + 1)
+            self.__spaces = spaces
+        return self.__spaces
+
+    def token_index(self, offset):
+        """
+        위치(offset) 앞에 있는 공백의 수, 즉 위치에 해당하는 단어의 index 를 구한다.
+        "post[:offset].count(' ')"와 같다.
+        :param offset: 문자 위치
+        :return: 단어의 index
+        """
+        return bisect_left(self.spaces, offset)
+
+    @property
+    def scripts(self):
+        """
+        포스트에 있는 문자 체계들의 비트마스크 ("UnicodeScripts")
+        """
+        if self.__scripts is None:
+            self.__scripts = UnicodeScripts.text_mask(self)
+        return self.__scripts
+
+    @property
+    def signature(self):
+        """
+        포스트의 문자 바이그램 서명 ("BigramSignature")
+        """
+        if self.__signature is None:
+            self.__signature = BigramSignature.text_signature(self)
+        return self.__signature
+
+    @staticmethod
+    def sign_posts(posts):
+        """
+        포스트들의 바이그램 서명을 한꺼번에 구해 둔다. (포스트마다 구하는 것보다 빠르다.)
+        :param posts: 전처리된 포스트들
+        :return:
+        """
+        posts = [post for post in posts if post.__signature is None]
+        for post, signature in zip(posts, BigramSignature.text_signatures(posts)):
+            post.__signature = signature
+
+    @property
+    def tag_words(self):
+        """
+        해시태그, 멘션(공백 뒤의 "#", "@"로 시작하는 단어)들
+        """
+        if self.__tag_words is None:
+            if "#" in self or "@" in self:
+                self.__tag_words = tuple(set(self.TAG_WORD.findall(self)))
+            else:
+                self.__tag_words = ()
+        return self.__tag_words
+
+    @property
+    def tags(self):
+        """
+        해시태그, 멘션과 그 단어의 경계 문자("?!,.") 앞까지의 접두사들.
+        "tag in post.tags"는 정규 표현식 " " + tag + "[?!,. ]"가 포스트에 있는지와 같다.
+        """
+        if self.__tags is None:
+            tags = set(self.tag_words)
+            for word in self.tag_words:
+                for match in self.TAG_BOUNDARY.finditer(word, 1):
+                    tags.add(word[:match.start()])
+            self.__tags = tags
+        return self.__tags
@@ -0,0 +1,344 @@
+import copy
+import random
+import re
+import time
+
+import pandas as pd
+
+import logging_config as log
+from post_selector.bloom_term import BloomTerm
+from post_selector.column_checker import ColumnChecker
+from post_selector.post_checker import PostChecker
+from post_selector.post_index import PostIndex
+from post_selector.post_selector import PostSelector
+from post_selector.preprocessed_post import PreprocessedPost
+from post_selector.query_codegen import QueryCodegen
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_parser import QueryParser
+from post_selector.shared_node import SharedNode
+
+
+class QueryBenchmark:
+    """
+    쿼리 파일들에 대한 포스트 검사 속도를 측정한다.
+    """
+
+    QUERY_FILE_NAMES = ("camera_v2.11", "samsung_v1.0", "with_galaxy_v1.31")
+    FILLER_WORDS = ("the", "new", "today", "we", "are", "happy", "to", "share", "our", "latest", "video", "with",
+                    "you", "check", "out", "link", "in", "bio", "and", "more", "great", "day", "love", "this",
+                    "오늘", "새로운", "영상", "今日", "新しい", "動画", "สวัสดี", "привет", "hola", "nuevo")
+
+    def __init__(self, query_file_names=QUERY_FILE_NAMES):
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.query_file_names = query_file_names
+        self.checker = PostChecker()
+        self.__OPERATOR = re.compile(r'\s+(?:OR|AND|NOT|NEAR/[0-9]+)\s+|[()]')
+
+    def make_posts(self, count=1000, seed=0, min_len=5, max_len=60, hit_ratio=0.05):
+        """
+        쿼리의 단어들과 일반 단어들을 섞어 벤치마크용 포스트들을 만든다.
+        :param count: 포스트 수
+        :param seed: 난수 시드
+        :param min_len: 포스트의 최소 단어 수
+        :param max_len: 포스트의 최대 단어 수
+        :param hit_ratio: 단어가 쿼리의 단어일 확률
+        :return: 포스트들
+        """
+        rand = random.Random(seed)
+        query_words = self.get_query_words()
+        posts = []
+        for _ in range(count):
+            words = []
+            for _ in range(rand.randint(min_len, max_len)):
+                if rand.random() < hit_ratio:
+                    words.append(rand.choice(query_words))
+                else:
+                    words.append(rand.choice(self.FILLER_WORDS))
+            posts.append(" ".join(words))
+        return pd.Series(posts, name="message")
+
+    def get_query_words(self):
+        """
+        쿼리 파일들의 단어들을 와일드카드를 제외하고 가져온다.
+        :return: 단어들
+        """
+        compiler = QueryCompiler(compile_patterns=False)
+        words = []
+        for query_file_name in self.query_file_names:
+            query = compiler.load_query(query_file_name)
+            for word in self.__OPERATOR.split(query):
+                word = word.replace("_|_", " ").strip(" *?")
+                if word:
+                    words.append(word)
+        return sorted(set(words))
+
+    def measure(self, compiled_query, posts):
+        """
+        쿼리별 포스트 한 건당 검사 시간(마이크로초)과 결과를 구한다.
+        "check_post_for_queries"처럼 포스트 순으로 쿼리들을 검사한다.
+        :param compiled_query: 컴파일된 쿼리
+        :param posts: 포스트들
+        :return: 쿼리별 검사 시간, 쿼리별 결과
+        """
+        posts = self.checker.preprocess_posts(posts)
+        columns = compiled_query.columns
+        elapsed = dict.fromkeys(columns, 0.0)
+        results = {column: [] for column in columns}
+        for post in posts:
+            for query, column in zip(compiled_query.queries, columns):
+                start = time.perf_counter()
+                results[column].append(self.checker.check_post(post, query, True))
+                elapsed[column] += time.perf_counter() - start
+        latencies = {column: elapsed[column] / len(posts) * 1e6 for column in columns}
+        return latencies, results
+
+    def compare(self, compilers, posts=None):
+        """
+        컴파일 방식별 검사 시간을 비교한다. 결과가 기준(첫 번째) 방식과 다르면 오류를 낸다.
+        :param compilers: {이름: QueryCompiler}
+        :param posts: 포스트들, 없으면 생성한다.
+        :return: 쿼리별, 방식별 포스트 한 건당 검사 시간(마이크로초)
+        """
+        if posts is None:
+            posts = self.make_posts()
+        latencies, base_results = {}, None
+        for name, compiler in compilers.items():
+            compiled_query = compiler.compile(self.query_file_names)
+            latencies[name], results = self.measure(compiled_query, posts)
+            if base_results is None:
+                base_results = results
+            elif results != base_results:
+                raise ValueError(f"Results of '{name}' differ from the baseline")
+            self.logger.info(f"{name}: {latencies[name]}")
+        return pd.DataFrame(latencies)
+
+    def compare_engines(self, posts=None, compiler=None):
+        """
+        포스트 순(row-at-a-time) 검사, 컬럼(term-at-a-time) 검사, 역색인 검사의 처리량을 비교한다.
+        결과가 다르면 오류를 낸다.
+        :param posts: 포스트들, 없으면 생성한다.
+        :param compiler: "QueryCompiler"
+        :return: 방식별 전체 시간(초)과 초당 처리 포스트 수
+        """
+        if posts is None:
+            posts = self.make_posts()
+        if compiler is None:
+            compiler = QueryCompiler()
+        compiled_query = compiler.compile(self.query_file_names)
+
+        start = time.perf_counter()
+        rows = [self.checker.check_post_for_queries(post, compiled_query.queries, compiled_query.columns)
+                for post in posts]
+        post_seconds = time.perf_counter() - start
+        post_result = pd.DataFrame(rows, index=posts.index)
+
+        start = time.perf_counter()
+        column_result = ColumnChecker().check_posts(posts, compiled_query)
+        column_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = PostIndex.build(posts)
+        build_seconds = time.perf_counter() - start
+        index_compiler = QueryCompiler(fuse_or=False, reorder=False, share=False, bigram_filter=False)
+        index_query = index_compiler.compile(self.query_file_names)
+        start = time.perf_counter()
+        index_result = index.check_posts(index_query, index=posts.index)
+        index_seconds = time.perf_counter() - start
+
+        if not post_result.equals(column_result):
+            raise ValueError("Results of the column engine differ from the post engine")
+        if not post_result.equals(index_result):
+            raise ValueError("Results of the index engine differ from the post engine")
+        result = pd.DataFrame({"seconds": [post_seconds, column_seconds, build_seconds, index_seconds]},
+                              index=["post", "column", "index build", "index query"])
+        result["posts_per_second"] = len(posts) / result["seconds"]
+        self.logger.info(f"{result}")
+        return result
+
+    def compare_planner(self, counts=(300, 3000), selector=None):
+        """
+        포스트 수별로 "QueryPlanner"가 고른 검사 방식과 예상 시간, 검사 방식을 직접 지정했을 때의 실제 시간을 비교한다.
+        :param counts: 포스트 수들
+        :param selector: "PostSelector", 없으면 만든다.
+        :return: 포스트 수별 고른 검사 방식, 검사 방식별 예상 시간(초)과 실제 시간(초), 실제로 빠른 검사 방식
+        """
+        if selector is None:
+            selector = PostSelector()
+        compiled_query = selector.compiler.compile(self.query_file_names)
+        rows = []
+        for count in counts:
+            posts = pd.DataFrame({"message": self.make_posts(count=count, seed=count)})
+            plan = selector.planner.plan(self.checker.preprocess_posts(posts["message"]), compiled_query)
+            row = {"posts": count, "planned": plan["engine"]}
+            results = {}
+            for engine in ("post", "column"):
+                start = time.perf_counter()
+                results[engine] = selector.check_posts(self.query_file_names, posts=posts, engine=engine)
+                row[f"{engine}_seconds"] = time.perf_counter() - start
+                row[f"{engine}_estimate"] = plan["costs"][engine]
+            if not results["post"].equals(results["column"]):
+                raise ValueError("Results of the column engine differ from the post engine")
+            row["fastest"] = min(("post", "column"), key=lambda engine: row[f"{engine}_seconds"])
+            rows.append(row)
+        result = pd.DataFrame(rows).set_index("posts")
+        self.logger.info(f"{result}")
+        return result
+
+    def compare_evaluators(self, posts=None, compiler=None):
+        """
+        "PostChecker"의 해석 방식(interpreter)과 "QueryCodegen"의 쿼리 함수(closure) 방식의 검사 시간을 비교한다.
+        두 방식 모두 전처리된 포스트들을 포스트 순으로 검사한다. 결과가 다르면 오류를 낸다.
+        :param posts: 포스트들, 없으면 생성한다.
+        :param compiler: "QueryCompiler"
+        :return: 방식별 전체 시간(초)과 초당 처리 포스트 수
+        """
+        if posts is None:
+            posts = self.make_posts()
+        if compiler is None:
+            compiler = QueryCompiler()
+        compiled_query = compiler.compile(self.query_file_names)
+        queries = compiled_query.queries
+
+        texts = self.checker.preprocess_posts(posts)
+        start = time.perf_counter()
+        interpreter_result = [[self.checker.examine_conditions(query, text) for query in queries] for text in texts]
+        interpreter_seconds = time.perf_counter() - start
+
+        texts = self.checker.preprocess_posts(posts)
+        start = time.perf_counter()
+        functions = QueryCodegen().compile_queries(queries)
+        codegen_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        closure_result = [[function(text) for function in functions] for text in texts]
+        closure_seconds = time.perf_counter() - start
+
+        if interpreter_result != closure_result:
+            raise ValueError("Results of the closure evaluator differ from the interpreter")
+        result = pd.DataFrame({"seconds": [interpreter_seconds, codegen_seconds, closure_seconds]},
+                              index=["interpreter", "codegen", "closure"])
+        result["posts_per_second"] = len(posts) / result["seconds"]
+        self.logger.info(f"{result}")
+        return result
+
+    def compare_bigram_filter(self, posts=None, compiler=None):
+        """
+        바이그램 서명 필터("BloomTerm")를 쓰지 않을 때와 쓸 때의 검사 시간을 비교한다.
+        두 방식 모두 쿼리 함수로 포스트 순으로 검사하며, 포스트들의 서명을 구하는 시간은 따로 잰다.
+        결과가 다르면 오류를 낸다.
+        :param posts: 포스트들, 없으면 생성한다.
+        :param compiler: "QueryCompiler" (바이그램 서명 필터 옵션만 바꾸어 비교한다.)
+        :return: 방식별 전체 시간(초)과 초당 처리 포스트 수
+        """
+        if posts is None:
+            posts = self.make_posts()
+        if compiler is None:
+            compiler = QueryCompiler()
+        base_compiler, filter_compiler = copy.copy(compiler), copy.copy(compiler)
+        base_compiler.bigram_filter, filter_compiler.bigram_filter = False, True
+        base_functions = QueryCodegen().compile_queries(base_compiler.compile(self.query_file_names).queries)
+        filter_functions = QueryCodegen().compile_queries(filter_compiler.compile(self.query_file_names).queries)
+
+        texts = self.checker.preprocess_posts(posts)
+        start = time.perf_counter()
+        base_result = [[function(text) for function in base_functions] for text in texts]
+        base_seconds = time.perf_counter() - start
+
+        texts = self.checker.preprocess_posts(posts)
+        start = time.perf_counter()
+        PreprocessedPost.sign_posts(texts)
+        sign_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        filter_result = [[function(text) for function in filter_functions] for text in texts]
+        filter_seconds = time.perf_counter() - start
+
+        if base_result != filter_result:
+            raise ValueError("Results of the bigram filter differ from the baseline")
+        result = pd.DataFrame({"seconds": [base_seconds, sign_seconds, filter_seconds, sign_seconds + filter_seconds]},
+                              index=["without filter", "signatures", "with filter", "signatures + with filter"])
+        result["posts_per_second"] = len(posts) / result["seconds"]
+        self.logger.info(f"{result}")
+        return result
+
+    def bigram_reject_rates(self, posts=None, compiler=None):
+        """
+        바이그램 서명 필터를 쓰는 단어("BloomTerm")별로 서명만으로 걸러지는 포스트의 비율을 구한다.
+        :param posts: 포스트들, 없으면 생성한다.
+        :param compiler: 바이그램 서명 필터를 쓰는 "QueryCompiler"
+        :return: 단어별 거른 비율(reject_rate), 일치한 비율(match_rate),
+                 걸러지지 않았지만 일치하지 않은 비율(false_positive_rate)
+        """
+        if posts is None:
+            posts = self.make_posts()
+        if compiler is None:
+            compiler = QueryCompiler()
+        terms = {}
+        for query in compiler.compile(self.query_file_names).queries:
+            self.collect_bloom_terms(query, terms)
+        texts = self.checker.preprocess_posts(posts)
+        PreprocessedPost.sign_posts(texts)
+        rows = []
+        for pattern, term in terms.items():
+            rejected = sum(term.rejects(text) for text in texts)
+            matched = sum(term.term.search(text) is not None for text in texts)
+            rows.append({"pattern": pattern, "reject_rate": rejected / len(texts), "match_rate": matched / len(texts),
+                         "false_positive_rate": (len(texts) - rejected - matched) / len(texts)})
+        result = pd.DataFrame(rows, columns=["pattern", "reject_rate", "match_rate", "false_positive_rate"])
+        self.logger.info(f"Bigram filter terms: {len(result)}, mean reject rate: {result['reject_rate'].mean():.4f}, "
+                         f"mean false positive rate: {result['false_positive_rate'].mean():.4f}")
+        return result
+
+    def collect_bloom_terms(self, node, terms):
+        """
+        쿼리의 "BloomTerm"들을 모은다.
+        :param node: 조건 또는 단어
+        :param terms: {정규 표현식: "BloomTerm"}
+        :return:
+        """
+        if isinstance(node, SharedNode):
+            node = node.node
+        if isinstance(node, dict):
+            for operand in node["operands"]:
+                self.collect_bloom_terms(operand, terms)
+        elif isinstance(node, BloomTerm):
+            terms.setdefault(node.pattern, node)
+
+    def make_query(self, term_count, group_size=10, seed=0):
+        """
+        쿼리 파일들의 단어들로 파싱 벤치마크용 쿼리를 만든다.
+        단어 "group_size" 개마다 괄호로 묶은 OR 조건을 만들고, 조건 둘을 AND 또는 NEAR 로 이은 블록들을 OR 로 잇는다.
+        :param term_count: 단어 수
+        :param group_size: 괄호 하나의 단어 수
+        :param seed: 난수 시드
+        :return: 쿼리
+        """
+        rand = random.Random(seed)
+        query_words = [word.replace(" ", "_|_") for word in self.get_query_words()]
+        groups = []
+        for _ in range(0, term_count, group_size):
+            words = [rand.choice(query_words) for _ in range(group_size)]
+            groups.append("(" + " OR ".join(words) + ")")
+        blocks = []
+        for i in range(0, len(groups) - 1, 2):
+            operator = rand.choice((" AND ", " NEAR/3 "))
+            blocks.append(f"({groups[i]}{operator}{groups[i + 1]})")
+        if len(groups) % 2 == 1:
+            blocks.append(groups[-1])
+        return " OR ".join(blocks)
+
+    def measure_parser(self, term_counts=(10000, 100000)):
+        """
+        단어 수별 쿼리 파싱 시간을 구한다.
+        :param term_counts: 단어 수들
+        :return: 단어 수별 파싱 시간(초)과 단어 하나당 시간(마이크로초)
+        """
+        rows = []
+        for term_count in term_counts:
+            query = self.make_query(term_count)
+            start = time.perf_counter()
+            QueryParser().query_to_dict(query)
+            seconds = time.perf_counter() - start
+            rows.append({"terms": term_count, "length": len(query), "seconds": seconds,
+                         "us_per_term": seconds / term_count * 1e6})
+        result = pd.DataFrame(rows)
+        self.logger.info(f"{result}")
+        return result
@@ -0,0 +1,139 @@
+import re
+
+import logging_config as log
+from post_selector.post_checker import PostChecker
+from post_selector.shared_node import SharedNode
+
+
+class QueryCodegen:
+    """
+    컴파일된 쿼리 트리를 한 번 클로저(closure)들로 바꾼다.
+    노드 종류와 연산자에 따른 분기를 미리 정해 두므로, 포스트 검사는 함수 호출만으로 이루어진다.
+    만든 함수는 전처리된 포스트("PreprocessedPost")를 받아 일치 여부를 돌려준다.
+    """
+
+    def __init__(self):
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.checker = PostChecker()
+
+    def compile_queries(self, queries):
+        """
+        쿼리들을 함수들로 바꾼다. 공유 노드는 한 번만 바꾼다.
+        :param queries: 컴파일된 쿼리들
+        :return: 함수들
+        """
+        functions = {}
+        return [self.compile(query, functions) for query in queries]
+
+    def compile(self, node, functions=None):
+        """
+        노드(조건 또는 단어)를 함수로 바꾼다.
+        :param node: 노드
+        :param functions: {공유 노드: 함수}
+        :return: 함수
+        """
+        if functions is None:
+            functions = {}
+        if isinstance(node, SharedNode):
+            return self.compile_shared(node, functions)
+        if isinstance(node, dict):
+            operator = node["operator"]
+            operands = node["operands"]
+            if operator == 'OR':
+                return self.compile_or(operands, functions)
+            elif operator == 'AND':
+                return self.compile_and(operands, functions)
+            elif operator == 'NOT':
+                return self.compile_not(operands, node.get("not_first", False), functions)
+            elif operator == 'NEAR':
+                return self.compile_near(operands, node["distance"])
+            return self.compile(operands[0], functions)
+        if isinstance(node, list):
+            value = len(node) > 0
+            return lambda post: value
+        search = self.to_search(node)
+        return lambda post: search(post) is not None
+
+    @staticmethod
+    def to_search(term):
+        """
+        단어(정규 표현식 문자열, 패턴 객체, "LiteralTerm")의 "search" 함수
+        """
+        if isinstance(term, str):
+            term = re.compile(term)
+        return term.search
+
+    @staticmethod
+    def is_term(node):
+        return not isinstance(node, (dict, list, SharedNode))
+
+    def compile_or(self, operands, functions):
+        if all(self.is_term(operand) for operand in operands):
+            searches = tuple(self.to_search(operand) for operand in operands)
+
+            def search_any(post):
+                for search in searches:
+                    if search(post) is not None:
+                        return True
+                return False
+            return search_any
+
+        operand_functions = tuple(self.compile(operand, functions) for operand in operands)
+
+        def evaluate_or(post):
+            for function in operand_functions:
+                if function(post):
+                    return True
+            return False
+        return evaluate_or
+
+    def compile_and(self, operands, functions):
+        if all(self.is_term(operand) for operand in operands):
+            searches = tuple(self.to_search(operand) for operand in operands)
+
+            def search_all(post):
+                for search in searches:
+                    if search(post) is None:
+                        return False
+                return True
+            return search_all
+
+        operand_functions = tuple(self.compile(operand, functions) for operand in operands)
+
+        def evaluate_and(post):
+            for function in operand_functions:
+                if not function(post):
+                    return False
+            return True
+        return evaluate_and
+
+    def compile_not(self, operands, not_first, functions):
+        exist = self.compile(operands[0], functions)
+        excluded = self.compile(operands[1], functions)
+        if not_first:
+            return lambda post: not excluded(post) and exist(post)
+        return lambda post: exist(post) and not excluded(post)
+
+    def compile_near(self, operands, distance):
+        """
+        NEAR 조건은 단어들의 위치가 필요하므로 "PostChecker"로 검사한다.
+        """
+        examine_near_condition = self.checker.examine_near_condition
+        return lambda post: len(examine_near_condition(operands, distance, post)) > 0
+
+    def compile_shared(self, shared, functions):
+        """
+        공유 노드는 포스트마다 한 번만 평가하고 결과를 포스트에 기억해 둔다. ("PostChecker.examine_shared"와 같다)
+        """
+        if shared in functions:
+            return functions[shared]
+        function = self.compile(shared.node, functions)
+
+        def evaluate_shared(post):
+            memo = post.memo
+            result = memo.get(shared)
+            if result is None:
+                result = memo[shared] = function(post)
+            return result
+        functions[shared] = evaluate_shared
+        return evaluate_shared
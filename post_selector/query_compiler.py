@@ -0,0 +1,503 @@
+import hashlib
+import re
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+import logging_config as log
+from post_selector.bigram_signature import BigramSignature
+from post_selector.bloom_term import BloomTerm
+from post_selector.data_loader import DataLoader
+from post_selector.literal_matcher import LiteralMatcher, LiteralTerm
+from post_selector.pattern_trie import PatternTrie
+from post_selector.post_checker import PostChecker
+from post_selector.query_optimizer import QueryOptimizer
+from post_selector.query_parser import QueryParser
+from post_selector.query_statistics import QueryStatistics
+from post_selector.script_term import ScriptTerm
+from post_selector.shared_node import SharedNode
+from post_selector.tag_term import TagTerm
+from post_selector.word_term import WordTerm
+
+
+class CompiledQuery:
+    """
+    검사에 바로 사용할 수 있도록 컴파일된 쿼리들.
+    부모 프로세스에서 한 번만 만들어 워커 프로세스에 전달한다.
+    """
+
+    def __init__(self, names, columns, queries):
+        self.names = tuple(names)
+        self.columns = tuple(columns)
+        self.queries = list(queries)
+
+    def __len__(self):
+        return len(self.queries)
+
+
+class QueryCompiler:
+    """
+    쿼리 파일을 읽고 파싱하여 "CompiledQuery"를 만든다.
+    """
+
+    __version = None
+
+    def __init__(self, compile_patterns=True, fuse_or=True, literal_engine="regex", reorder=True, share=True,
+                 cache=True, optimize=True, tag_index=False, script_groups=False,
+                 bigram_filter=True, word_terms=False, glob_terms=True):
+        """
+        :param compile_patterns: 단어들을 정규 표현식 패턴 객체로 컴파일할지 여부
+        :param fuse_or: OR 조건의 단어들을 하나의 정규 표현식으로 합칠지 여부
+        :param literal_engine: 리터럴 단어를 찾는 방식 ("regex", "aho_corasick")
+        :param reorder: 쿼리 파일 옆에 저장된 통계가 있으면 피연산자 평가 순서를 바꿀지 여부
+        :param share: 쿼리들 사이에 같은 조건, 단어를 공유하여 포스트마다 한 번만 평가할지 여부
+        :param cache: 컴파일된 쿼리를 쿼리 폴더에 저장해 두고, 쿼리 파일과 컴파일러가 그대로이면 다시 쓸지 여부
+        :param optimize: 중복되거나 다른 단어에 포함되는 단어를 없애고 조건을 정리할지 여부
+        :param tag_index: 해시태그, 멘션 단어를 포스트의 해시태그 집합에서 찾을지 여부
+                          (합쳐진 OR 조건의 정규 표현식도 충분히 빨라 기본값은 False)
+        :param script_groups: 단어들을 필요한 문자 체계(한글, 태국 문자 등)별로 묶어, 포스트에 그 문자 체계가 없으면
+                              검사하지 않을지 여부 (여러 언어가 섞인 포스트에서는 효과가 작아 기본값은 False)
+        :param bigram_filter: 단어에 반드시 있어야 하는 문자 바이그램이 포스트에 없으면 정규 표현식을 실행하지 않을지 여부
+                              (합쳐진 OR 조건의 단어들에는 쓰지 않는다. 포스트 서명은 "PreprocessedPost.sign_posts"로
+                              한꺼번에 구해 두는 것이 좋다.)
+        :param word_terms: 합쳐지지 않은 리터럴 단어와 단순한 와일드카드 단어를 정규 표현식 대신 문자열 검색("WordTerm")으로
+                           찾을지 여부 (리터럴로 시작하는 정규 표현식도 C 코드에서 문자열 검색을 하므로 기본값은 False)
+        :param glob_terms: "*"로 나뉜 조각이 여럿인 단어를 정규 표현식 대신 선형 시간의 "GlobWordTerm"으로 찾을지 여부
+                           ("*a*b*c*" 같은 단어는 긴 토큰에서 정규 표현식의 되돌아가기로 검사 시간이 토큰 길이의 세제곱이 된다.)
+        """
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.compile_patterns = compile_patterns
+        self.fuse_or = fuse_or
+        self.literal_engine = literal_engine
+        self.reorder = reorder
+        self.share = share
+        self.cache = cache
+        self.optimize = optimize
+        self.tag_index = tag_index
+        self.script_groups = script_groups
+        self.bigram_filter = bigram_filter
+        self.word_terms = word_terms
+        self.glob_terms = glob_terms
+        self.optimizer = QueryOptimizer()
+        self.loader = DataLoader()
+        self.checker = PostChecker()
+
+    def compile(self, query_file_names, column_names=None):
+        """
+        쿼리 파일들을 컴파일한다.
+        :param query_file_names: 쿼리 파일 명들
+        :param column_names: 컬럼 명들
+        :return: 컴파일된 쿼리
+        """
+        if isinstance(query_file_names, str):
+            query_file_names = (query_file_names,)
+        if column_names is None:
+            column_names = query_file_names
+
+        if self.cache:
+            cache_name = f"{'+'.join(query_file_names)}.{self.options_key()}"
+            cache_key = self.cache_key(query_file_names)
+            cached = self.loader.load_compiled_query(cache_name)
+            if cached is not None and cached["key"] == cache_key:
+                self.logger.debug(f"Use cached compiled query: {cache_name}")
+                compiled_query = cached["compiled_query"]
+                return CompiledQuery(query_file_names, column_names, compiled_query.queries)
+            compiled_query = self.compile_files(query_file_names, column_names)
+            self.loader.save_compiled_query({"key": cache_key, "compiled_query": compiled_query}, cache_name)
+            return compiled_query
+        return self.compile_files(query_file_names, column_names)
+
+    def compile_files(self, query_file_names, column_names):
+        """
+        쿼리 파일들을 캐시를 쓰지 않고 컴파일한다.
+        :param query_file_names: 쿼리 파일 명들
+        :param column_names: 컬럼 명들
+        :return: 컴파일된 쿼리
+        """
+        matcher = self.create_matcher()
+        queries = []
+        for query_file_name in query_file_names:
+            self.logger.debug(f"Compile query: {query_file_name}")
+            query = self.load_query(query_file_name)
+            statistics = self.load_statistics(query_file_name) if self.reorder else None
+            queries.append(self.compile_query(query, matcher, statistics))
+        if matcher is not None:
+            matcher.build()
+        if self.share:
+            queries = self.share_nodes(queries)
+        return CompiledQuery(query_file_names, column_names, queries)
+
+    def options_key(self):
+        """
+        컴파일 결과를 바꾸는 옵션들의 키
+        :return: 키
+        """
+        options = (self.compile_patterns, self.fuse_or, self.literal_engine, self.reorder, self.share, self.optimize,
+                   self.tag_index, self.script_groups, self.bigram_filter,
+                   self.word_terms, self.glob_terms)
+        return hashlib.sha1(repr(options).encode("utf8")).hexdigest()[:8]
+
+    def cache_key(self, query_file_names):
+        """
+        캐시된 컴파일 결과가 유효한지 확인할 키. 쿼리 파일, 통계 파일의 내용과 컴파일러 버전으로 만든다.
+        :param query_file_names: 쿼리 파일 명들
+        :return: 키
+        """
+        digest = hashlib.sha1(self.compiler_version().encode("utf8"))
+        for query_file_name in query_file_names:
+            digest.update(query_file_name.encode("utf8"))
+            digest.update(self.loader.load_query_bytes(query_file_name))
+            if self.reorder:
+                digest.update(self.loader.load_query_statistics_bytes(query_file_name))
+        return digest.hexdigest()
+
+    def query_key(self, query_file_name):
+        """
+        검사 결과를 결정하는 쿼리의 키. 쿼리 파일 내용과 컴파일러 버전으로 만든다.
+        컴파일 옵션과 통계는 검사 순서만 바꾸므로 포함하지 않는다.
+        :param query_file_name: 쿼리 파일 명
+        :return: 키
+        """
+        digest = hashlib.sha1(self.compiler_version().encode("utf8"))
+        digest.update(self.loader.load_query_bytes(query_file_name))
+        return digest.hexdigest()
+
+    @staticmethod
+    def compiler_version():
+        """
+        컴파일러 버전. 검사 결과에 영향을 주는 소스들의 내용으로 만든다.
+        :return: 버전
+        """
+        if QueryCompiler.__version is None:
+            digest = hashlib.sha1()
+            for file_path in QueryCompiler.cache_sources():
+                digest.update(file_path.name.encode("utf8"))
+                digest.update(file_path.read_bytes())
+            QueryCompiler.__version = digest.hexdigest()
+        return QueryCompiler.__version
+
+    @staticmethod
+    def cache_sources():
+        """
+        소스가 바뀌면 캐시된 컴파일 결과와 검사 결과를 쓰지 않는 파일들.
+        모듈을 빠뜨리지 않도록 "post_selector" 패키지의 모든 모듈로 한다. (테스트는 제외한다.)
+        :return: 소스 파일 경로들 (이름 순)
+        """
+        return sorted(Path(__file__).parent.glob("*.py"))
+
+    def load_query(self, query_file_name):
+        """
+        쿼리를 불러와 정비한다.
+        :param query_file_name: 쿼리 파일명
+        :return: 정비된 쿼리
+        """
+        query = self.loader.load_query(query_file_name)
+        return self.checker.replace_query(query)
+
+    def create_matcher(self):
+        """
+        리터럴 단어들을 찾을 "LiteralMatcher"를 만든다.
+        :return: "LiteralMatcher", 정규 표현식으로 찾으면 None
+        """
+        return LiteralMatcher() if self.literal_engine == "aho_corasick" else None
+
+    def load_statistics(self, query_file_name):
+        """
+        쿼리 파일 옆에 저장된 통계를 불러온다.
+        :param query_file_name: 쿼리 파일명
+        :return: "QueryStatistics", 통계가 없으면 None
+        """
+        stats = self.loader.load_query_statistics(query_file_name)
+        return None if stats is None else QueryStatistics(stats)
+
+    def collect_statistics(self, query_file_name, posts, save=True):
+        """
+        샘플 포스트들로 쿼리의 조건, 단어별 적중률과 검사 비용을 모아 쿼리 파일 옆에 저장한다.
+        :param query_file_name: 쿼리 파일명
+        :param posts: 샘플 포스트들
+        :param save: 저장할지 여부
+        :return: "QueryStatistics"
+        """
+        matcher = self.create_matcher()
+        query = self.compile_query(self.load_query(query_file_name), matcher)
+        if matcher is not None:
+            matcher.build()
+        statistics = QueryStatistics()
+        statistics.collect(query, self.checker.preprocess_posts(posts))
+        if save:
+            self.loader.save_query_statistics(statistics.stats, query_file_name)
+        return statistics
+
+    def optimize_report(self, query_file_names):
+        """
+        쿼리 파일별로 최적화 전후의 단어 수를 구한다.
+        :param query_file_names: 쿼리 파일 명들
+        :return: 쿼리 파일별 단어 수, 최적화된 단어 수, 줄어든 비율(%)
+        """
+        if isinstance(query_file_names, str):
+            query_file_names = (query_file_names,)
+        rows = []
+        for query_file_name in query_file_names:
+            query = QueryParser().query_to_dict(self.load_query(query_file_name))
+            terms = self.optimizer.count_terms(query)
+            optimized_terms = self.optimizer.count_terms(self.optimizer.optimize(query))
+            rows.append({"terms": terms, "optimized_terms": optimized_terms,
+                         "reduction": (terms - optimized_terms) / terms * 100})
+        report = pd.DataFrame(rows, index=query_file_names)
+        self.logger.info(f"Optimize report:\n{report}")
+        return report
+
+    def compile_query(self, query, matcher=None, statistics=None):
+        """
+        정비된 쿼리를 컴파일한다.
+        :param query: 정비된 쿼리
+        :param matcher: 리터럴 단어들을 찾을 "LiteralMatcher", 없으면 정규 표현식으로 찾는다.
+        :param statistics: 피연산자 평가 순서를 정할 "QueryStatistics"
+        :return: 컴파일된 쿼리
+        """
+        query = QueryParser().query_to_dict(query)
+        if self.optimize:
+            query = self.optimizer.optimize(query)
+        if self.tag_index:
+            query = self.to_tag_terms(query)
+        if matcher is not None:
+            query = self.to_literal_terms(query, matcher)
+        if self.glob_terms:
+            query = self.to_glob_terms(query)
+        if self.fuse_or:
+            query = self.fuse_or_words(query)
+        if self.word_terms:
+            query = self.to_word_terms(query)
+        if self.compile_patterns:
+            query = self.to_patterns(query)
+        if self.script_groups:
+            query = self.to_script_terms(query)
+        if self.bigram_filter:
+            query = self.to_bloom_terms(query)
+        if statistics is not None:
+            query = statistics.reorder(query)
+        return query
+
+    def to_patterns(self, query):
+        """
+        쿼리의 단어(정규 표현식 문자열)들을 패턴 객체로 컴파일한다.
+        "re" 모듈의 내부 캐시(512개)보다 단어가 많은 쿼리도 매번 다시 컴파일하지 않는다.
+        :param query: 파싱된 쿼리
+        :return: 단어들이 패턴 객체로 바뀐 쿼리
+        """
+        if isinstance(query, str):
+            return re.compile(query)
+        elif not isinstance(query, dict):
+            return query
+        compiled = dict(query)
+        compiled["operands"] = [self.to_patterns(operand) for operand in query["operands"]]
+        return compiled
+
+    def to_tag_terms(self, query, near_operand=False):
+        """
+        해시태그, 멘션 단어들을 "TagTerm"으로 바꾼다. 중간에 와일드카드가 있는 단어는 정규 표현식으로 남긴다.
+        OR 조건의 "TagTerm"들은 하나로 합친다. NEAR 조건 아래의 단어들은 합치지 않는다.
+        :param query: 파싱된 쿼리
+        :param near_operand: NEAR 조건 아래에 있는지 여부
+        :return: 해시태그 단어들이 바뀐 쿼리
+        """
+        if isinstance(query, str):
+            term = TagTerm.from_pattern(query)
+            return query if term is None else term
+        elif not isinstance(query, dict):
+            return query
+        operator = query["operator"]
+        near_operand = near_operand or operator == "NEAR"
+        operands = [self.to_tag_terms(operand, near_operand) for operand in query["operands"]]
+        if operator == "OR" and not near_operand:
+            terms = [operand for operand in operands if isinstance(operand, TagTerm)]
+            if len(terms) > 1:
+                operands = [TagTerm.merge(terms)] + [operand for operand in operands
+                                                     if not isinstance(operand, TagTerm)]
+        tag_query = dict(query)
+        tag_query["operands"] = operands
+        return tag_query
+
+    def to_literal_terms(self, query, matcher, near_operand=False):
+        """
+        리터럴 단어들을 "LiteralTerm"으로 바꾼다. 와일드카드가 있는 단어는 정규 표현식으로 남긴다.
+        OR 조건의 리터럴 단어들은 하나의 "LiteralTerm"으로 합친다. NEAR 조건 아래의 단어들은 합치지 않는다.
+        :param query: 파싱된 쿼리
+        :param matcher: 리터럴 단어들을 찾을 "LiteralMatcher"
+        :param near_operand: NEAR 조건 아래에 있는지 여부
+        :return: 리터럴 단어들이 바뀐 쿼리
+        """
+        if isinstance(query, str):
+            literal = LiteralMatcher.to_literal(query)
+            if literal is None:
+                return query
+            matcher.add(literal)
+            return LiteralTerm(matcher, [query], [literal])
+        elif not isinstance(query, dict):
+            return query
+        operator = query["operator"]
+        near_operand = near_operand or operator == "NEAR"
+        operands = [self.to_literal_terms(operand, matcher, near_operand) for operand in query["operands"]]
+        if operator == "OR" and not near_operand:
+            terms = [operand for operand in operands if isinstance(operand, LiteralTerm)]
+            if len(terms) > 1:
+                patterns = [term.pattern for term in terms]
+                literals = [literal for term in terms for literal in term.literals]
+                operands = [LiteralTerm(matcher, patterns, literals)] + \
+                           [operand for operand in operands if not isinstance(operand, LiteralTerm)]
+        literal_query = dict(query)
+        literal_query["operands"] = operands
+        return literal_query
+
+    def to_word_terms(self, query, near_operand=False):
+        """
+        정규 표현식 단어들을 종류(리터럴, 끝 와일드카드, 한 문자 와일드카드)에 맞는 "WordTerm"으로 바꾼다.
+        합쳐진 OR 조건의 정규 표현식과 복잡한 단어는 정규 표현식으로 남긴다.
+        NEAR 조건 아래의 단어들은 위치가 필요하므로 바꾸지 않는다.
+        :param query: 파싱된 쿼리
+        :param near_operand: NEAR 조건 아래에 있는지 여부
+        :return: 단어들이 바뀐 쿼리
+        """
+        if isinstance(query, str):
+            if near_operand:
+                return query
+            term = WordTerm.from_pattern(query)
+            return query if term is None else term
+        elif not isinstance(query, dict):
+            return query
+        near_operand = near_operand or query["operator"] == "NEAR"
+        word_query = dict(query)
+        word_query["operands"] = [self.to_word_terms(operand, near_operand) for operand in query["operands"]]
+        return word_query
+
+    def to_glob_terms(self, query):
+        """
+        첫 "*" 뒤에 조각이 둘 이상인 단어(예: "*a*b*")들을 "GlobWordTerm"으로 바꾼다. OR 조건의 단어들과 합치지 않는다.
+        조각이 하나인 단어(예: "*a*", "a*b")는 정규 표현식도 선형 시간이므로 합칠 수 있도록 남긴다.
+        "GlobWordTerm"은 위치도 정규 표현식과 같게 찾으므로 NEAR 조건 아래의 단어들도 바꾼다.
+        :param query: 파싱된 쿼리
+        :return: 단어들이 바뀐 쿼리
+        """
+        if isinstance(query, str):
+            if WordTerm.classify(query) != "glob":
+                return query
+            term = WordTerm.from_pattern(query)
+            return term if len(term.segments) > 1 else query
+        elif not isinstance(query, dict):
+            return query
+        glob_query = dict(query)
+        glob_query["operands"] = [self.to_glob_terms(operand) for operand in query["operands"]]
+        return glob_query
+
+    def fuse_or_words(self, query, near_operand=False):
+        """
+        OR 조건의 단어들을 트라이로 묶은 하나의 정규 표현식으로 합친다.
+        NEAR 조건 아래의 단어들은 단어별 위치가 필요하므로 합치지 않는다.
+        :param query: 파싱된 쿼리
+        :param near_operand: NEAR 조건 아래에 있는지 여부
+        :return: OR 조건의 단어들이 합쳐진 쿼리
+        """
+        if not isinstance(query, dict):
+            return query
+        operator = query["operator"]
+        near_operand = near_operand or operator == "NEAR"
+        operands = [self.fuse_or_words(operand, near_operand) for operand in query["operands"]]
+        if operator == "OR" and not near_operand:
+            words = [operand for operand in operands if isinstance(operand, str)]
+            fused, rest = PatternTrie.fuse(words)
+            if fused is not None and len(words) - len(rest) > 1:
+                self.logger.debug(f"Fused {len(words) - len(rest)} OR words")
+                if self.script_groups:
+                    fused = self.to_script_term([word for word in words if word not in rest], fused)
+                conditions = [operand for operand in operands if not isinstance(operand, str)]
+                operands = [fused] + rest + conditions
+        fused_query = dict(query)
+        fused_query["operands"] = operands
+        return fused_query
+
+    @staticmethod
+    def to_script_term(words, pattern):
+        """
+        문자 체계(한글, 태국 문자 등)가 필요한 단어가 있으면 단어들을 "ScriptTerm"으로 묶는다.
+        :param words: 정규 표현식 단어들
+        :param pattern: 단어들을 합친 정규 표현식 (또는 패턴 객체)
+        :return: "ScriptTerm", 문자 체계가 필요한 단어가 없으면 "pattern"
+        """
+        term = ScriptTerm(words, pattern if isinstance(pattern, str) else pattern.pattern)
+        return term if term.scripts else pattern
+
+    def to_script_terms(self, query):
+        """
+        문자 체계(한글, 태국 문자 등)가 필요한 단어들을 "ScriptTerm"으로 감싼다. (OR 조건에서 합쳐진 단어들은 이미 묶여 있다.)
+        :param query: 컴파일된 쿼리
+        :return: 단어들이 바뀐 쿼리
+        """
+        if isinstance(query, dict):
+            script_query = dict(query)
+            script_query["operands"] = [self.to_script_terms(operand) for operand in query["operands"]]
+            return script_query
+        if isinstance(query, str):
+            return self.to_script_term([query], query)
+        if isinstance(query, re.Pattern):
+            return self.to_script_term([query.pattern], query)
+        return query
+
+    def to_bloom_terms(self, query):
+        """
+        반드시 있어야 하는 문자 바이그램이 있는 단어들을 "BloomTerm"으로 감싼다.
+        여러 단어를 합친 정규 표현식은 바이그램을 알 수 없으므로 그대로 둔다.
+        :param query: 컴파일된 쿼리
+        :return: 단어들이 바뀐 쿼리
+        """
+        if isinstance(query, dict):
+            bloom_query = dict(query)
+            bloom_query["operands"] = [self.to_bloom_terms(operand) for operand in query["operands"]]
+            return bloom_query
+        if isinstance(query, (str, re.Pattern, ScriptTerm, WordTerm)):
+            signature = BigramSignature.term_signature(query if isinstance(query, str) else query.pattern)
+            if signature:
+                return BloomTerm(query, signature)
+        return query
+
+    def share_nodes(self, queries):
+        """
+        쿼리들을 하나의 DAG 로 합친다. 두 번 이상 나오는 같은 조건, 단어는 하나의 "SharedNode"가 되어
+        포스트마다 한 번만 평가된다.
+        :param queries: 컴파일된 쿼리들
+        :return: 노드를 공유하는 쿼리들
+        """
+        keys = {}
+        counts = Counter()
+        for query in queries:
+            self.count_nodes(query, counts, keys)
+        shared = {}
+        queries = [self.to_shared_nodes(query, counts, keys, shared) for query in queries]
+        shared_count = sum(1 for node in shared.values() if isinstance(node, SharedNode))
+        self.logger.debug(f"Shared nodes: {shared_count}")
+        return queries
+
+    def count_nodes(self, node, counts, keys):
+        """
+        DAG 에서 노드가 참조되는 수를 센다. 같은 노드의 하위 노드는 한 번만 센다.
+        """
+        key = QueryStatistics.node_key(node, keys)
+        counts[key] += 1
+        if counts[key] == 1 and isinstance(node, dict):
+            for operand in node["operands"]:
+                self.count_nodes(operand, counts, keys)
+
+    def to_shared_nodes(self, node, counts, keys, shared):
+        key = QueryStatistics.node_key(node, keys)
+        if key in shared:
+            return shared[key]
+        if isinstance(node, dict):
+            shared_node = dict(node)
+            shared_node["operands"] = [self.to_shared_nodes(operand, counts, keys, shared)
+                                       for operand in node["operands"]]
+        else:
+            shared_node = node
+        if counts[key] > 1:
+            shared_node = SharedNode(shared_node)
+        shared[key] = shared_node
+        return shared_node
@@ -0,0 +1,234 @@
+import logging_config as log
+from post_selector.pattern_trie import PatternTrie
+
+
+class QueryOptimizer:
+    """
+    파싱된 쿼리를 결과가 같은 더 작은 쿼리로 바꾼다.
+    단어를 정규화하고, 같은 연산자의 중첩 조건을 펼치고, 중복되거나 다른 단어에 포함되는 단어를 없애고,
+    상수(리스트) 조건과 피연산자가 하나뿐인 조건을 접는다.
+    NEAR 조건 아래에서는 단어별 위치가 결과에 쓰이므로 중복 제거와 펼치기만 한다.
+    """
+
+    # 공백이 아닌 문자열과 일치하는 원자
+    ANY_WORD = "[^ ]*"
+    # 공백이 아닌 문자 하나와 일치하는 원자
+    NOT_SPACE = "[^ ]"
+
+    def __init__(self):
+        self.logger = log.get_logger(self.__class__.__name__)
+
+    def optimize(self, query, near_operand=False):
+        """
+        쿼리를 최적화한다.
+        :param query: 파싱된 쿼리
+        :param near_operand: NEAR 조건 아래에 있는지 여부
+        :return: 최적화된 쿼리
+        """
+        if isinstance(query, str):
+            return self.canonicalize(query)
+        if not isinstance(query, dict):
+            return query
+        operator = query["operator"]
+        near_operand = near_operand or operator == "NEAR"
+        operands = [self.optimize(operand, near_operand) for operand in query["operands"]]
+        if operator in ("OR", "AND"):
+            operands = self.flatten(operator, operands)
+            operands = self.dedupe(operands)
+            if not near_operand:
+                operands = self.remove_subsumed(operator, operands)
+                folded = self.fold(operator, operands)
+                if folded is not None:
+                    return folded
+            if len(operands) == 1:
+                return operands[0]
+        elif operator == "NOT" and not near_operand:
+            if operands[0] == [] or (isinstance(operands[1], list) and operands[1]):
+                return []
+            if operands[1] == []:
+                return operands[0]
+        optimized = dict(query)
+        optimized["operands"] = operands
+        return optimized
+
+    def canonicalize(self, term):
+        """
+        단어 정규 표현식을 정규화한다. ("**"처럼 이어진 "[^ ]*"는 하나로 줄인다.)
+        :param term: 단어 정규 표현식
+        :return: 정규화된 단어 정규 표현식
+        """
+        double = self.ANY_WORD + self.ANY_WORD
+        while double in term:
+            term = term.replace(double, self.ANY_WORD)
+        return term
+
+    @staticmethod
+    def flatten(operator, operands):
+        """
+        같은 연산자의 중첩 조건을 펼친다. ((a OR b) OR c -> a OR b OR c)
+        """
+        flattened = []
+        for operand in operands:
+            if isinstance(operand, dict) and operand["operator"] == operator:
+                flattened.extend(operand["operands"])
+            else:
+                flattened.append(operand)
+        return flattened
+
+    @staticmethod
+    def dedupe(operands):
+        """
+        중복된 피연산자를 없앤다. 처음 나온 순서를 유지한다.
+        """
+        deduped = []
+        seen = set()
+        for operand in operands:
+            key = repr(operand)
+            if key not in seen:
+                seen.add(key)
+                deduped.append(operand)
+        return deduped
+
+    def remove_subsumed(self, operator, operands):
+        """
+        다른 단어에 포함되는 단어를 없앤다.
+        OR 조건은 더 좁은 단어(예: "108mp", "108mp*"가 있을 때 "108mp")를, AND 조건은 더 넓은 단어를 없앤다.
+        :param operator: 연산자
+        :param operands: 피연산자들
+        :return: 남은 피연산자들
+        """
+        terms = [(i, self.to_atoms(operand)) for i, operand in enumerate(operands) if isinstance(operand, str)]
+        terms = [(i, atoms) for i, atoms in terms if atoms is not None]
+        # 넓은 쪽 단어의 리터럴 접두사는 좁은 쪽 단어의 앞과 같아야 하고, 리터럴 조각들은 좁은 쪽 단어에 있어야 한다.
+        wildcards = {}
+        for j, atoms in terms:
+            if self.has_wildcard(atoms):
+                runs = self.literal_runs(atoms)
+                wildcards.setdefault(runs[0], []).append((j, atoms, max(runs, key=len)))
+        removed = set()
+        for i, atoms in terms:
+            if i in removed:
+                continue
+            text = "\0".join(self.literal_runs(atoms))
+            prefix = self.literal_runs(atoms)[0]
+            candidates = (candidate for k in range(len(prefix) + 1) for candidate in wildcards.get(prefix[:k], ()))
+            for j, wildcard_atoms, run in candidates:
+                if i == j or j in removed or run not in text:
+                    continue
+                if self.contains(wildcard_atoms, atoms):
+                    removed.add(i if operator == "OR" else j)
+                    break
+        if removed:
+            self.logger.debug(f"Removed {len(removed)} subsumed {operator} terms")
+        return [operand for i, operand in enumerate(operands) if i not in removed]
+
+    @staticmethod
+    def fold(operator, operands):
+        """
+        상수(리스트) 피연산자를 접는다. 빈 리스트는 거짓, 비어 있지 않은 리스트는 참이다.
+        결과에 영향이 없는 상수 피연산자들은 "operands"에서 없앤다.
+        :param operator: 연산자 (OR, AND)
+        :param operands: 피연산자들
+        :return: 조건 전체가 상수이면 그 상수, 아니면 None
+        """
+        constants = [operand for operand in operands if isinstance(operand, list)]
+        if not constants:
+            return None
+        for constant in constants:
+            # OR 는 참인 상수, AND 는 거짓인 상수가 있으면 결과가 정해진다.
+            if bool(constant) == (operator == "OR"):
+                return constant
+        operands[:] = [operand for operand in operands if not isinstance(operand, list)]
+        return constants[0] if not operands else None
+
+    def to_atoms(self, term):
+        """
+        단어 정규 표현식을 포함 관계를 비교할 원자들로 나눈다.
+        전처리된 포스트에는 공백이 이어지지 않으므로 공백 옆의 "."은 공백이 아닌 문자 하나이다.
+        :param term: 단어 정규 표현식
+        :return: 원자들, 나눌 수 없으면 None
+        """
+        atoms = PatternTrie.tokenize(term)
+        if atoms is None:
+            return None
+        for i, atom in enumerate(atoms):
+            if atom == "." and ((i > 0 and atoms[i - 1] == " ") or (i + 1 < len(atoms) and atoms[i + 1] == " ")):
+                atoms[i] = self.NOT_SPACE
+        return atoms
+
+    @staticmethod
+    def literal_runs(atoms):
+        """
+        원자들을 리터럴 문자가 아닌 원자로 나눈 리터럴 조각들
+        :param atoms: 원자들
+        :return: 리터럴 조각들 (첫 조각은 리터럴 접두사)
+        """
+        runs = [[]]
+        for atom in atoms:
+            if len(atom) == 1 and atom != ".":
+                runs[-1].append(atom)
+            elif len(atom) == 3 and atom[0] == "[" and atom[2] == "]":
+                runs[-1].append(atom[1])
+            else:
+                runs.append([])
+        return ["".join(run) for run in runs]
+
+    def has_wildcard(self, atoms):
+        return any(atom in (self.ANY_WORD, self.NOT_SPACE, ".") for atom in atoms)
+
+    def contains(self, outer, inner):
+        """
+        "outer" 원자들이 "inner" 원자들과 일치하는 모든 문자열과 일치하는지 확인한다. (보수적으로 판단한다)
+        :param outer: 넓은 쪽 원자들
+        :param inner: 좁은 쪽 원자들
+        :return: 포함하는지 여부
+        """
+        # matched[j]: outer[:i] 가 inner[:j] 를 포함하는지
+        matched = [True] + [False] * len(inner)
+        for atom in outer:
+            if atom == self.ANY_WORD:
+                next_matched = [False] * (len(inner) + 1)
+                for j in range(len(inner) + 1):
+                    next_matched[j] = matched[j] or (j > 0 and next_matched[j - 1]
+                                                     and self.is_word_atom(inner[j - 1]))
+            else:
+                next_matched = [False] + [matched[j] and self.contains_atom(atom, inner[j])
+                                          for j in range(len(inner))]
+            matched = next_matched
+            if not any(matched):
+                return False
+        return matched[-1]
+
+    def is_word_atom(self, atom):
+        """
+        원자가 공백이 아닌 문자들하고만 일치하는지 여부
+        """
+        if atom in (self.ANY_WORD, self.NOT_SPACE):
+            return True
+        if len(atom) == 1:
+            return atom not in " ."
+        return len(atom) == 3 and atom[0] == "[" and atom[2] == "]" and atom[1] != " "
+
+    def contains_atom(self, outer, inner):
+        """
+        "outer" 원자(문자 하나와 일치)가 "inner" 원자와 일치하는 모든 문자와 일치하는지 여부
+        """
+        if outer == inner:
+            return True
+        if inner == self.ANY_WORD or outer.endswith("*") or inner.endswith("*"):
+            return False
+        if outer == ".":
+            return True
+        if outer == self.NOT_SPACE:
+            return self.is_word_atom(inner)
+        return False
+
+    def count_terms(self, query):
+        """
+        쿼리의 단어 수
+        :param query: 쿼리
+        :return: 단어 수
+        """
+        if isinstance(query, dict):
+            return sum(self.count_terms(operand) for operand in query["operands"])
+        return 1
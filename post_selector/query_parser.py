@@ -16,48 +16,66 @@ class QueryParser:
         self.__NUM = re.compile('[0-9]+')
         self.__SPACE_SEP = "_|_"
         self.__COND = re.compile(':[0-9]+:')
-        self.__conditions = []
+        self.__PARENTHESIS = re.compile('[()]')
 
     def query_to_dict(self, query):
-        while True:
-            parenthesis_query, (first, last) = self.extract_parenthesis_query(query)
-            if parenthesis_query is None:
-                break
+        """
+        쿼리를 조건 dict 로 파싱한다.
+        괄호들을 한 번 훑으며 괄호가 닫힐 때마다 괄호 안을 조건으로 만들고, 괄호 자리는 ":n:"(n 번째 조건)으로 바꾼다.
+        :param query: 정의된 패턴
+        :return: 조건 dict (조건이 없으면 문자열)
+        """
+        conditions = []
+        # 열려 있는 괄호들의 (괄호 안 문자열 조각들, "(" 위치)
+        stack = [([], -1)]
+        pos = 0
+        for parenthesis in self.__PARENTHESIS.finditer(query):
+            index = parenthesis.start()
+            stack[-1][0].append(query[pos:index])
+            pos = index + 1
+            if query[index] == "(":
+                stack.append(([], index))
+                continue
+            if len(stack) == 1:
+                raise ValueError(f"Unmatched ')' at position {index}")
+            parts, _ = stack.pop()
+            parenthesis_query = "".join(parts)
             self.logger.debug(f"Parenthesis query: {parenthesis_query}")
-            query_dict = self.conditions_to_dict(parenthesis_query)
-            self.__conditions.append(query_dict)
-            query = query[:first] + ":" + str(len(self.__conditions) - 1) + ":" + query[last + 1:]
-            self.logger.debug(f"Query after parenthesis query: {query}")
-        result = self.conditions_to_dict(query)
-        return result
+            conditions.append(self.conditions_to_dict(parenthesis_query, conditions))
+            stack[-1][0].append(":" + str(len(conditions) - 1) + ":")
+        if len(stack) > 1:
+            raise ValueError(f"Unmatched '(' at position {stack[-1][1]}")
+        stack[0][0].append(query[pos:])
+        return self.conditions_to_dict("".join(stack[0][0]), conditions)
 
-    def conditions_to_dict(self, query):
+    def conditions_to_dict(self, query, conditions):
         """
         쿼리의 조건들을 조사한다.
-        :param query: 정의된 패턴
+        :param query: 정의된 패턴 (괄호 안 조건들은 ":n:"으로 바뀌어 있다)
+        :param conditions: 괄호 안 조건들
         :return:
         """
         query = query.strip()
         or_words = self.split_query(self.__OR, query)
         if len(or_words) > 1:
-            return self.condition_to_dict('OR', or_words)
+            return self.condition_to_dict('OR', or_words, conditions)
         and_words = self.split_query(self.__AND, query)
         if len(and_words) > 1:
-            return self.condition_to_dict('AND', and_words)
+            return self.condition_to_dict('AND', and_words, conditions)
         not_words = self.split_query(self.__NOT, query)
         if len(not_words) > 1:
-            return self.condition_to_dict('NOT', not_words)
+            return self.condition_to_dict('NOT', not_words, conditions)
         near_words = self.split_query(self.__NEAR, query)
         if len(near_words) > 1:
             near_num = self.get_near_num(query)
-            return self.condition_to_dict('NEAR', near_words, near_num)
+            return self.condition_to_dict('NEAR', near_words, conditions, near_num)
         return query
 
-    def condition_to_dict(self, operator, operands, distance=None):
+    def condition_to_dict(self, operator, operands, conditions, distance=None):
         for i, operand in enumerate(operands):
             if self.__COND.search(operand):
                 cond_id = int(self.__NUM.search(operand).group())
-                operands[i] = self.__conditions[cond_id]
+                operands[i] = conditions[cond_id]
             else:
                 operands[i] = self.to_regex_word(operand)
         cond_dict = {'operator': operator, 'operands': operands}
@@ -91,18 +109,3 @@ class QueryParser:
         word = DataUtils.replace_tuples(word, (
             (self.__SPACE_SEP, " "), (".", "[.]"), ("+", "[+]"), ("?", "."), ("*", "[^ ]*")))
         return " " + word + "[?!,. ]"
-
-    @staticmethod
-    def extract_parenthesis_query(query):
-        """
-        괄호가 있는 문자열을 조회한다.
-        :param query: 정의된 패턴
-        :return: 괄호가 있는 문자열, (시작 index, 끝 index)
-        """
-        last = query.find(')')
-        if last == -1:
-            return None, (None, None)
-        else:
-            query = query[:last]
-            first = query.rfind("(")
-            return query[first + 1:last], (first, last)
@@ -0,0 +1,102 @@
+import multiprocessing as mp
+import os
+
+import logging_config as log
+from post_selector.shared_node import SharedNode
+from utils.parallel_utils import ParallelUtils
+
+
+class QueryPlanner:
+    """
+    포스트 수, 쿼리 수, 포스트 평균 길이, 단어 수, NEAR 조건, 사용할 수 있는 코어 수로 검사 비용을 어림하여
+    검사 방식을 고른다.
+    - "post": 포스트 순(post-at-a-time) 병렬 검사. 워커 시작 비용과 포스트를 주고받는 비용이 들지만 코어 수만큼 나뉜다.
+    - "column": 컬럼 전체를 단어 순(term-at-a-time)으로 검사. 한 프로세스에서 검사하지만 포스트별 함수 호출이 없다.
+    """
+
+    # 비용 모델 상수 (초). "QueryBenchmark.make_posts"의 포스트(평균 160자)로 잰 값이다.
+    REFERENCE_LENGTH = 160
+    # 포스트 하나에서 단어(합쳐진 OR 조건 포함) 하나, NEAR 조건 아래 단어 하나를 찾는 비용
+    TERM_COST = 2e-6
+    NEAR_TERM_COST = 2e-6
+    # 포스트 순 검사의 포스트별 함수 호출 비용, 워커에 포스트를 보내고 결과를 받는 비용
+    POST_COST = 2e-6
+    TRANSFER_COST = 50e-6
+    # 워커 프로세스들의 시작 비용 (쿼리 전달과 쿼리 함수 생성 포함, 프로세스 시작 방식별)
+    STARTUP_COST = {"fork": 0.05, "forkserver": 0.3, "spawn": 1.0}
+    # 단어 순 검사의 포스트별 비용, 조건, 단어별 배열 연산 비용
+    COLUMN_POST_COST = 0.5e-6
+    COLUMN_NODE_COST = 20e-6
+
+    def __init__(self):
+        self.logger = log.get_logger(self.__class__.__name__)
+
+    def plan(self, posts, compiled_query, cpu_divide_count=2):
+        """
+        검사 방식을 고른다.
+        :param posts: 전처리된 포스트들
+        :param compiled_query: 컴파일된 쿼리
+        :param cpu_divide_count: 병렬 검사의 "cpu_divide_count"
+        :return: {"engine": 고른 검사 방식, "features": 비용 모델의 입력, "costs": 검사 방식별 예상 시간(초)}
+        """
+        features = self.features(posts, compiled_query, cpu_divide_count)
+        costs = self.costs(features)
+        engine = min(costs, key=costs.get)
+        self.logger.info(f"Plan: {engine}, costs: {', '.join(f'{k}={v:.3f}s' for k, v in costs.items())}, "
+                         f"features: {features}")
+        return {"engine": engine, "features": features, "costs": costs}
+
+    def features(self, posts, compiled_query, cpu_divide_count=2):
+        """
+        비용 모델의 입력
+        :param posts: 전처리된 포스트들
+        :param compiled_query: 컴파일된 쿼리
+        :param cpu_divide_count: 병렬 검사의 "cpu_divide_count"
+        :return: {"posts", "queries", "avg_length", "terms", "near", "near_terms", "nodes", "workers", "cores"}
+        """
+        counts = {"terms": 0, "near": 0, "near_terms": 0, "nodes": 0}
+        seen = set()
+        for query in compiled_query.queries:
+            self.count_nodes(query, counts, seen)
+        size = len(posts)
+        return {"posts": size, "queries": len(compiled_query.queries),
+                "avg_length": sum(len(post) for post in posts) / size if size else 0.0,
+                **counts, "workers": ParallelUtils.get_num_process(cpu_divide_count), "cores": os.cpu_count() or 1}
+
+    def count_nodes(self, node, counts, seen, near_operand=False):
+        """
+        단어, NEAR 조건, NEAR 조건 아래 단어, 조건과 단어 수를 센다. 공유 노드는 한 번만 센다.
+        """
+        if isinstance(node, SharedNode):
+            if node in seen:
+                return
+            seen.add(node)
+            node = node.node
+        counts["nodes"] += 1
+        if isinstance(node, dict):
+            if node["operator"] == "NEAR":
+                counts["near"] += 1
+                near_operand = True
+            for operand in node["operands"]:
+                self.count_nodes(operand, counts, seen, near_operand)
+        elif not isinstance(node, list):
+            counts["near_terms" if near_operand else "terms"] += 1
+
+    def costs(self, features):
+        """
+        검사 방식별 예상 시간
+        :param features: 비용 모델의 입력
+        :return: {"post": 초, "column": 초}
+        """
+        size = features["posts"]
+        # 포스트 하나를 검사하는 비용 (단어를 찾는 비용은 포스트 길이에 비례한다.)
+        length = features["avg_length"] / self.REFERENCE_LENGTH
+        work = length * (self.TERM_COST * features["terms"] + self.NEAR_TERM_COST * features["near_terms"])
+        parallel = max(min(features["workers"], features["cores"]), 1)
+        # 시작 방식을 정하지 않았으면 플랫폼 기본값(목록의 첫 번째)을 쓴다. ("get_start_method"는 기본값을 고정한다.)
+        method = mp.get_start_method(allow_none=True) or mp.get_all_start_methods()[0]
+        startup = self.STARTUP_COST.get(method, self.STARTUP_COST["spawn"])
+        return {
+            "post": startup + size * (self.TRANSFER_COST + (self.POST_COST + work) / parallel),
+            "column": size * (self.COLUMN_POST_COST + work) + features["nodes"] * self.COLUMN_NODE_COST,
+        }
@@ -0,0 +1,167 @@
+import time
+
+import pandas as pd
+
+import logging_config as log
+from post_selector.query_codegen import QueryCodegen
+from post_selector.shared_node import SharedNode
+from post_selector.term_cache import TermCache
+
+
+class QueryProfiler:
+    """
+    쿼리별, 단어별 검사 수, 적중 수, 단락 평가로 건너뛴 수, 누적 검사 시간을 모은다.
+    "QueryCodegen"처럼 쿼리를 함수들로 바꾸되 단어(와 NEAR 조건) 함수마다 시간을 재고,
+    AND/OR/NOT 조건이 앞의 피연산자로 결론을 내면 평가하지 않은 피연산자의 단어들을 센다.
+    단어별로 보려면 OR 조건의 단어들을 합치지 않고 공유 노드 없이 컴파일한 쿼리를 쓴다.
+    """
+
+    COLUMNS = ["query", "term", "evaluations", "hits", "short_circuits", "seconds"]
+
+    def __init__(self, stats=None):
+        """
+        :param stats: {(쿼리 컬럼 명, 단어 키): [검사 수, 적중 수, 건너뛴 수, 검사 시간(초)]}
+        """
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.codegen = QueryCodegen()
+        self.stats = {} if stats is None else stats
+
+    def compile_queries(self, queries, columns):
+        """
+        쿼리들을 시간을 재는 함수들로 바꾼다.
+        :param queries: 컴파일된 쿼리들
+        :param columns: 컬럼 명들 (쿼리별 통계의 이름)
+        :return: 함수들
+        """
+        return [self.compile(query, column)[0] for query, column in zip(queries, columns)]
+
+    def compile(self, node, column):
+        """
+        노드(조건 또는 단어)를 시간을 재는 함수로 바꾼다.
+        :param node: 노드
+        :param column: 쿼리 컬럼 명
+        :return: (함수, 노드 아래 단어들의 통계 목록)
+        """
+        if isinstance(node, SharedNode):
+            return self.compile(node.node, column)
+        if isinstance(node, dict) and node["operator"] in ('OR', 'AND', 'NOT'):
+            operands = node["operands"]
+            compiled = [self.compile(operand, column) for operand in operands]
+            entries = [entry for _, operand_entries in compiled for entry in operand_entries]
+            if node["operator"] == 'OR':
+                return self.compile_or(compiled), entries
+            elif node["operator"] == 'AND':
+                return self.compile_and(compiled), entries
+            return self.compile_not(compiled, node.get("not_first", False)), entries
+        if isinstance(node, dict) and node["operator"] != 'NEAR':
+            return self.compile(node["operands"][0], column)
+        return self.compile_term(node, column)
+
+    def compile_term(self, node, column):
+        """
+        단어(또는 NEAR 조건)를 검사 수, 적중 수, 검사 시간을 세는 함수로 바꾼다.
+        """
+        function = self.codegen.compile(node)
+        entry = self.stats.setdefault((column, TermCache.term_key(node)), [0, 0, 0, 0.0])
+        perf_counter = time.perf_counter
+
+        def evaluate_term(post):
+            start = perf_counter()
+            result = function(post)
+            entry[3] += perf_counter() - start
+            entry[0] += 1
+            if result:
+                entry[1] += 1
+            return result
+        return evaluate_term, [entry]
+
+    @staticmethod
+    def skip(compiled, start):
+        """
+        "start"번째부터 평가하지 않은 피연산자들의 단어들을 건너뛴 수에 더한다.
+        """
+        for _, entries in compiled[start:]:
+            for entry in entries:
+                entry[2] += 1
+
+    def compile_or(self, compiled):
+        functions = tuple(function for function, _ in compiled)
+        skip = self.skip
+
+        def evaluate_or(post):
+            for i, function in enumerate(functions):
+                if function(post):
+                    skip(compiled, i + 1)
+                    return True
+            return False
+        return evaluate_or
+
+    def compile_and(self, compiled):
+        functions = tuple(function for function, _ in compiled)
+        skip = self.skip
+
+        def evaluate_and(post):
+            for i, function in enumerate(functions):
+                if not function(post):
+                    skip(compiled, i + 1)
+                    return False
+            return True
+        return evaluate_and
+
+    def compile_not(self, compiled, not_first):
+        (exist, exist_entries), (excluded, excluded_entries) = compiled
+
+        def skip(entries):
+            for entry in entries:
+                entry[2] += 1
+
+        if not_first:
+            def evaluate_not(post):
+                if excluded(post):
+                    skip(exist_entries)
+                    return False
+                return exist(post)
+        else:
+            def evaluate_not(post):
+                if not exist(post):
+                    skip(excluded_entries)
+                    return False
+                return not excluded(post)
+        return evaluate_not
+
+    def take(self):
+        """
+        모은 통계를 꺼내고 0으로 되돌린다. (함수들이 통계 목록을 그대로 쓰므로 목록은 바꾸지 않는다.)
+        :return: {(쿼리 컬럼 명, 단어 키): [검사 수, 적중 수, 건너뛴 수, 검사 시간(초)]}
+        """
+        stats = {key: list(entry) for key, entry in self.stats.items() if entry[0] or entry[2]}
+        for entry in self.stats.values():
+            entry[:] = [0, 0, 0, 0.0]
+        return stats
+
+    def merge(self, stats):
+        """
+        다른 프로세스에서 모은 통계를 더한다.
+        :param stats: {(쿼리 컬럼 명, 단어 키): [검사 수, 적중 수, 건너뛴 수, 검사 시간(초)]}
+        :return:
+        """
+        for key, (evaluations, hits, short_circuits, seconds) in stats.items():
+            entry = self.stats.setdefault(key, [0, 0, 0, 0.0])
+            entry[0] += evaluations
+            entry[1] += hits
+            entry[2] += short_circuits
+            entry[3] += seconds
+
+    def report(self):
+        """
+        쿼리별, 단어별 통계를 누적 검사 시간이 큰 순으로 정리한다.
+        :return: 보고서 (query, term, evaluations, hits, short_circuits, seconds, hit_rate, mean_us)
+        """
+        rows = [[column, term] + entry for (column, term), entry in self.stats.items()]
+        report = pd.DataFrame(rows, columns=self.COLUMNS)
+        evaluations = report["evaluations"].where(report["evaluations"] > 0)
+        report["hit_rate"] = (report["hits"] / evaluations).fillna(0.0)
+        report["mean_us"] = (report["seconds"] / evaluations * 1e6).fillna(0.0)
+        report = report.sort_values(["seconds", "evaluations"], ascending=False, ignore_index=True)
+        self.logger.info(f"Profiled {len(report)} terms, never matched: {int((report['hits'] == 0).sum())}")
+        return report
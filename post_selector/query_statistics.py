@@ -0,0 +1,116 @@
+import hashlib
+import time
+
+import logging_config as log
+from post_selector.post_checker import PostChecker
+from post_selector.shared_node import SharedNode
+
+
+class QueryStatistics:
+    """
+    쿼리의 조건, 단어별 적중률과 검사 비용을 모으고, 이를 이용해 AND/OR/NOT 조건의 평가 순서를 정한다.
+    평가 순서만 바뀌므로 결과는 같다.
+    """
+
+    def __init__(self, stats=None):
+        """
+        :param stats: {노드 키: [검사 수, 적중 수, 검사 시간(초)]}
+        """
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.checker = PostChecker()
+        self.stats = {} if stats is None else stats
+
+    @staticmethod
+    def node_key(node, keys=None):
+        """
+        노드(조건 또는 단어)의 키. 같은 내용의 노드는 같은 키를 가진다.
+        AND, OR 조건은 피연산자의 순서와 관계없이 같은 키를 가진다.
+        :param node: 노드
+        :param keys: {id(노드): 키} 캐시
+        :return: 키
+        """
+        if keys is not None and id(node) in keys:
+            return keys[id(node)]
+        if isinstance(node, SharedNode):
+            return QueryStatistics.node_key(node.node, keys)
+        if isinstance(node, dict):
+            operand_keys = [QueryStatistics.node_key(operand, keys) for operand in node["operands"]]
+            if node["operator"] in ('AND', 'OR'):
+                operand_keys.sort()
+            parts = [node["operator"], str(node.get("distance", ""))] + operand_keys
+        elif isinstance(node, (str, list)):
+            parts = [str(node)]
+        else:
+            parts = [node.pattern]
+        key = hashlib.sha1("\x00".join(parts).encode("utf8")).hexdigest()
+        if keys is not None:
+            keys[id(node)] = key
+        return key
+
+    def collect(self, query, posts):
+        """
+        포스트들로 쿼리의 모든 노드를 각각 검사하여 적중 수와 검사 시간을 모은다.
+        :param query: 컴파일된 쿼리
+        :param posts: 전처리된 포스트들
+        :return: 모은 통계
+        """
+        nodes = {}
+        self.collect_nodes(query, nodes, {})
+        for key, node in nodes.items():
+            count, hits, seconds = self.stats.get(key, [0, 0, 0.0])
+            for post in posts:
+                start = time.perf_counter()
+                result = self.checker.exist(node, post)
+                seconds += time.perf_counter() - start
+                count += 1
+                hits += 1 if result else 0
+            self.stats[key] = [count, hits, seconds]
+        self.logger.debug(f"Collected statistics of {len(nodes)} nodes with {len(posts)} posts")
+        return self.stats
+
+    def collect_nodes(self, node, nodes, keys):
+        nodes.setdefault(self.node_key(node, keys), node)
+        if isinstance(node, dict):
+            for operand in node["operands"]:
+                self.collect_nodes(operand, nodes, keys)
+
+    def hit_rate(self, key):
+        count, hits, _ = self.stats[key]
+        return (hits + 1) / (count + 2)
+
+    def cost(self, key):
+        count, _, seconds = self.stats[key]
+        return seconds / count if count else 0.0
+
+    def reorder(self, query, keys=None):
+        """
+        통계를 이용해 피연산자의 평가 순서를 정한다.
+        AND 는 싸고 거짓일 가능성이 큰 것, OR 는 싸고 참일 가능성이 큰 것을 먼저 평가한다.
+        NOT 은 제외 조건이 더 빨리 결론을 내면 제외 조건을 먼저 평가한다("not_first").
+        통계가 없는 노드가 있는 조건은 순서를 바꾸지 않는다.
+        :param query: 컴파일된 쿼리
+        :param keys: {id(노드): 키} 캐시
+        :return: 평가 순서가 정해진 쿼리
+        """
+        if not isinstance(query, dict):
+            return query
+        if keys is None:
+            keys = {}
+        operator = query["operator"]
+        operand_keys = [self.node_key(operand, keys) for operand in query["operands"]]
+        operands = [self.reorder(operand, keys) for operand in query["operands"]]
+        reordered = dict(query)
+        if all(key in self.stats for key in operand_keys):
+            if operator == 'AND':
+                ranks = [self.cost(key) / max(1 - self.hit_rate(key), 1e-9) for key in operand_keys]
+                operands = [operand for _, operand in sorted(zip(ranks, operands), key=lambda r: r[0])]
+            elif operator == 'OR':
+                ranks = [self.cost(key) / self.hit_rate(key) for key in operand_keys]
+                operands = [operand for _, operand in sorted(zip(ranks, operands), key=lambda r: r[0])]
+            elif operator == 'NOT':
+                exist_key, not_key = operand_keys[0], operand_keys[1]
+                exist_rank = self.cost(exist_key) / max(1 - self.hit_rate(exist_key), 1e-9)
+                not_rank = self.cost(not_key) / self.hit_rate(not_key)
+                reordered["not_first"] = not_rank < exist_rank
+        reordered["operands"] = operands
+        return reordered
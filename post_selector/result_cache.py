@@ -0,0 +1,82 @@
+import hashlib
+from collections import OrderedDict
+
+import logging_config as log
+
+
+class ResultCache:
+    """
+    포스트 검사 결과의 영구 캐시. (메시지 해시, 쿼리 키)마다 'Y'/'N' 결과를 기억한다.
+    쿼리 키는 쿼리 파일 내용과 컴파일러 버전으로 만들므로 쿼리나 검사 코드가 바뀌면 이전 결과를 쓰지 않는다.
+    항목 수가 "max_entries"를 넘으면 가장 오래 쓰지 않은 항목부터 지운다. (LRU)
+    """
+
+    HASH_SIZE = 16
+    MAX_ENTRIES = 1000000
+
+    def __init__(self, entries=None, max_entries=MAX_ENTRIES):
+        """
+        :param entries: {(메시지 해시, 쿼리 키): 'Y'/'N'} (오래 쓰지 않은 순서)
+        :param max_entries: 최대 항목 수
+        """
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.entries = OrderedDict() if entries is None else OrderedDict(entries)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evict()
+
+    def to_data(self):
+        """
+        저장할 캐시 데이터
+        :return: {"entries", "max_entries"}
+        """
+        return {"entries": self.entries, "max_entries": self.max_entries}
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def message_hash(message):
+        """
+        메시지 내용의 해시
+        """
+        if not isinstance(message, str):
+            message = str(message)
+        return hashlib.blake2b(message.encode("utf-8", "surrogatepass"), digest_size=ResultCache.HASH_SIZE).digest()
+
+    def get(self, message_hash, query_key):
+        """
+        캐시된 결과를 가져온다.
+        :param message_hash: 메시지 해시
+        :param query_key: 쿼리 키
+        :return: 'Y'/'N', 없으면 None
+        """
+        key = (message_hash, query_key)
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, message_hash, query_key, value):
+        """
+        결과를 캐시에 넣는다.
+        :param message_hash: 메시지 해시
+        :param query_key: 쿼리 키
+        :param value: 'Y'/'N'
+        :return:
+        """
+        key = (message_hash, query_key)
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self.evict()
+
+    def evict(self):
+        """
+        최대 항목 수를 넘는 오래된 항목들을 지운다.
+        """
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
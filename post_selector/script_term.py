@@ -0,0 +1,85 @@
+import re
+
+from post_selector.pattern_trie import PatternTrie
+from post_selector.preprocessed_post import PreprocessedPost
+from post_selector.unicode_scripts import UnicodeScripts
+
+
+class ScriptTerm:
+    """
+    필요한 문자 체계(한글, 태국 문자 등)별로 묶인 단어(들).
+    단어들을 필요한 문자 체계별로 나누어 묶음마다 정규 표현식을 만들고, 포스트에 없는 문자 체계
+    ("PreprocessedPost.scripts")의 묶음은 실행하지 않는다.
+    "re.Pattern"처럼 "search", "finditer", "pattern"을 제공한다.
+    """
+
+    def __init__(self, words, pattern=None):
+        """
+        :param words: 정규 표현식 단어들
+        :param pattern: 단어들을 합친 정규 표현식 (없으면 단어들을 합쳐 만든다.)
+        """
+        self.words = list(words)
+        self.masks = [UnicodeScripts.term_mask(word) for word in self.words]
+        self.scripts = 0
+        for mask in self.masks:
+            self.scripts |= mask
+        self.pattern = self.fuse(self.words) if pattern is None else pattern
+        # [(문자 체계들, 묶음의 패턴 객체)] (문자 체계가 필요 없는 묶음이 먼저 온다.)
+        groups = {}
+        for word, mask in zip(self.words, self.masks):
+            groups.setdefault(mask, []).append(word)
+        self.groups = [(mask, re.compile(self.fuse(groups[mask]))) for mask in sorted(groups)]
+        # 위치를 찾을 때("finditer") 쓰는 {포스트의 문자 체계들: 검사할 단어들만 합친 패턴 객체 (없으면 None)}
+        self.variants = {}
+        # 디버그 로그에 자주 쓰이므로 미리 만들어 둔다.
+        self.__repr = f"ScriptTerm({self.pattern!r})"
+
+    @staticmethod
+    def fuse(words):
+        """
+        단어들을 하나의 정규 표현식으로 합친다.
+        :param words: 정규 표현식 단어들
+        :return: 합친 정규 표현식
+        """
+        fused, rest = PatternTrie.fuse(words)
+        parts = ([] if fused is None else [fused]) + rest
+        if len(parts) == 1:
+            return parts[0]
+        return "|".join(f"(?:{part})" for part in parts)
+
+    def variant(self, post):
+        """
+        포스트에 있는 문자 체계들로 검사할 수 있는 단어들만 합친 패턴 객체
+        :param post: 전처리된 포스트
+        :return: 패턴 객체, 검사할 단어가 없으면 None
+        """
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        scripts = post.scripts & self.scripts
+        try:
+            return self.variants[scripts]
+        except KeyError:
+            words = [word for word, mask in zip(self.words, self.masks) if scripts & mask == mask]
+            variant = self.variants[scripts] = re.compile(self.fuse(words)) if words else None
+            return variant
+
+    def search(self, post):
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        scripts = post.scripts
+        for mask, pattern in self.groups:
+            if scripts & mask == mask:
+                found = pattern.search(post)
+                if found is not None:
+                    return found
+        return None
+
+    def finditer(self, post):
+        try:
+            variant = self.variants[post.scripts & self.scripts]
+        except (AttributeError, KeyError):
+            variant = self.variant(post)
+        return iter(()) if variant is None else variant.finditer(post)
+
+    def __repr__(self):
+        return self.__repr
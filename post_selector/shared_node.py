@@ -0,0 +1,11 @@
+class SharedNode:
+    """
+    여러 쿼리 또는 여러 조건에서 공유되는 노드(조건 또는 단어).
+    "PostChecker"는 포스트마다 한 번만 평가하고 결과를 포스트에 기억해 둔다.
+    """
+
+    def __init__(self, node):
+        self.node = node
+
+    def __repr__(self):
+        return f"SharedNode({self.node!r})"
@@ -0,0 +1,74 @@
+import re
+
+from post_selector.literal_matcher import LiteralMatcher
+from post_selector.preprocessed_post import PreprocessedPost
+
+
+class TagTerm:
+    """
+    해시태그, 멘션 단어(들). 정규 표현식 대신 포스트의 해시태그 집합("PreprocessedPost.tags")에서 찾는다.
+    리터럴 단어("#withgalaxy")는 집합에서 찾고, 접두사 와일드카드 단어("#withgalaxy*")는 포스트의 해시태그들의 접두사를 확인한다.
+    여러 단어이면 OR 조건이다. "re.Pattern"처럼 "search", "finditer", "pattern"을 제공한다.
+    """
+
+    # 접두사 와일드카드 단어의 끝 ("*" + QueryParser.to_regex_word 가 붙이는 뒤 패턴)
+    PREFIX_SUFFIX = "[^ ]*" + LiteralMatcher.SUFFIX
+
+    def __init__(self, patterns, tags, prefixes):
+        """
+        :param patterns: 정규 표현식 단어들
+        :param tags: 리터럴 해시태그들
+        :param prefixes: 접두사 와일드카드 해시태그들의 접두사들
+        """
+        self.pattern = "|".join(patterns)
+        self.tags = frozenset(tags)
+        self.prefixes = tuple(sorted(set(prefixes)))
+        self.__regex = None
+
+    @staticmethod
+    def from_pattern(pattern):
+        """
+        정규 표현식 단어가 해시태그, 멘션 단어이면 "TagTerm"으로 바꾼다.
+        :param pattern: 정규 표현식 단어
+        :return: "TagTerm", 해시태그 단어가 아니거나 중간에 와일드카드가 있으면 None
+        """
+        prefix = pattern.endswith(TagTerm.PREFIX_SUFFIX)
+        if prefix:
+            literal = LiteralMatcher.to_literal(pattern[:-len(TagTerm.PREFIX_SUFFIX)] + LiteralMatcher.SUFFIX)
+        else:
+            literal = LiteralMatcher.to_literal(pattern)
+        if literal is None or len(literal) < 2 or literal[1] not in PreprocessedPost.TAG_STARTS or " " in literal[1:]:
+            return None
+        tag = literal[1:]
+        return TagTerm([pattern], [] if prefix else [tag], [tag] if prefix else [])
+
+    @staticmethod
+    def merge(terms):
+        """
+        "TagTerm"들을 OR 조건인 하나의 "TagTerm"으로 합친다.
+        """
+        return TagTerm([term.pattern for term in terms], [tag for term in terms for tag in term.tags],
+                       [prefix for term in terms for prefix in term.prefixes])
+
+    def search(self, post):
+        if not isinstance(post, PreprocessedPost):
+            post = PreprocessedPost(post)
+        words = post.tag_words
+        if not words:
+            return None
+        prefixes = self.prefixes
+        if prefixes:
+            for word in words:
+                if word.startswith(prefixes):
+                    return True
+        if self.tags and not self.tags.isdisjoint(post.tags):
+            return True
+        return None
+
+    def finditer(self, post):
+        if self.__regex is None:
+            self.__regex = re.compile(self.pattern)
+        return self.__regex.finditer(post)
+
+    def __repr__(self):
+        return f"TagTerm({self.pattern!r})"
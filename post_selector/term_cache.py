@@ -0,0 +1,244 @@
+import hashlib
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import logging_config as log
+from post_selector.post_checker import PostChecker
+from post_selector.post_index import PostIndex
+from post_selector.query_compiler import QueryCompiler
+from post_selector.shared_node import SharedNode
+
+
+class TermCache:
+    """
+    단어별 포스트 검사 결과의 영구 캐시. (단어, 포스트 내용 해시)마다 일치 여부를 기억한다.
+    포스트는 전처리된 내용의 해시로 번호를 붙이고, 단어마다 검사한 포스트들은 비트맵(packbits)으로,
+    일치한 포스트들은 포스트 번호 목록(posting list)으로 가진다.
+    쿼리가 조금 바뀌거나 포스트가 대부분 같으면 새 단어와 새 포스트만 검사하고 나머지는 캐시된 결과를 합친다.
+    NEAR 조건은 단어별 위치가 필요하므로 조건 전체를 하나의 단어로 캐시한다.
+    단어 키에는 컴파일러 버전과 전처리 버전을 붙이고, 단어는 최근에 쓴 순으로 "max_terms"개까지,
+    포스트는 "max_posts"개까지 가진다. (포스트 수를 넘으면 캐시를 비운다.)
+    """
+
+    HASH_SIZE = 16
+    MAX_TERMS = 10000
+    MAX_POSTS = 200000
+
+    def __init__(self, post_ids=None, evaluated=None, matched=None, max_terms=MAX_TERMS, max_posts=MAX_POSTS):
+        """
+        :param post_ids: {포스트 해시: 포스트 번호}
+        :param evaluated: {단어 키: 검사한 포스트 번호 비트맵 (np.packbits)}, 최근에 쓴 단어가 뒤에 온다.
+        :param matched: {단어 키: 일치한 포스트 번호 배열 (오름차순)}
+        :param max_terms: 캐시할 최대 단어 수 (넘으면 가장 오래 쓰지 않은 단어부터 지운다.)
+        :param max_posts: 캐시할 최대 포스트 수 (넘으면 캐시를 비운다.)
+        """
+        self.logger = log.get_logger(self.__class__.__name__)
+        self.checker = PostChecker()
+        self.post_ids = {} if post_ids is None else post_ids
+        self.evaluated = {} if evaluated is None else evaluated
+        self.matched = {} if matched is None else matched
+        self.max_terms = max_terms
+        self.max_posts = max_posts
+        self.version = self.cache_version()
+        # (단어, 포스트) 검사 중 캐시에서 찾은 수, 새로 검사한 수
+        self.hits = 0
+        self.misses = 0
+
+    def to_data(self):
+        """
+        저장할 캐시 데이터
+        :return: {"post_ids", "evaluated", "matched"}
+        """
+        return {"post_ids": self.post_ids, "evaluated": self.evaluated, "matched": self.matched}
+
+    @staticmethod
+    def post_hash(text):
+        """
+        전처리된 포스트 내용의 해시
+        """
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=TermCache.HASH_SIZE).digest()
+
+    @staticmethod
+    def cache_version():
+        """
+        캐시 키의 버전. 단어별 검사 결과를 결정하는 컴파일러 버전과 전처리 버전으로 만든다.
+        :return: 버전
+        """
+        digest = hashlib.sha1(QueryCompiler.compiler_version().encode("utf8"))
+        digest.update(str(PostChecker.PREPROCESS_VERSION).encode("utf8"))
+        return digest.hexdigest()
+
+    def cache_key(self, node):
+        """
+        단어(또는 NEAR 조건)의 캐시 키. 버전이 바뀌면 이전 버전의 단어들은 쓰지 않고 오래된 순으로 지워진다.
+        :param node: 단어 또는 조건
+        :return: 캐시 키
+        """
+        return f"{self.version}:{self.term_key(node)}"
+
+    @staticmethod
+    def term_key(node):
+        """
+        단어(또는 NEAR 조건)의 캐시 키. 정규 표현식 문자열과 컴파일된 패턴은 같은 키가 된다.
+        :param node: 단어 또는 조건
+        :return: 캐시 키
+        """
+        if isinstance(node, SharedNode):
+            return TermCache.term_key(node.node)
+        if isinstance(node, dict):
+            operands = ", ".join(TermCache.term_key(operand) for operand in node["operands"])
+            distance = node.get("distance")
+            operator = node["operator"] if distance is None else f"{node['operator']}/{distance}"
+            return f"{operator}({operands})"
+        if isinstance(node, (list, tuple)):
+            return "[" + ", ".join(TermCache.term_key(operand) for operand in node) + "]"
+        if isinstance(node, str):
+            return node
+        return node.pattern
+
+    def add_posts(self, texts):
+        """
+        포스트들에 번호를 붙인다. 캐시에 있는 포스트는 캐시의 번호를 쓴다.
+        :param texts: 전처리된 포스트들
+        :return: 포스트 번호 배열
+        """
+        post_ids = self.post_ids
+        ids = np.empty(len(texts), dtype=np.int32)
+        for i, text in enumerate(texts):
+            ids[i] = post_ids.setdefault(self.post_hash(text), len(post_ids))
+        return ids
+
+    def clear(self):
+        """
+        캐시를 비운다.
+        :return:
+        """
+        self.post_ids = {}
+        self.evaluated = {}
+        self.matched = {}
+
+    def evict(self):
+        """
+        캐시한 단어 수가 "max_terms"를 넘으면 가장 오래 쓰지 않은 단어들을 지운다.
+        :return:
+        """
+        count = len(self.evaluated) - self.max_terms
+        if count <= 0:
+            return
+        for key in list(itertools.islice(self.evaluated, count)):
+            del self.evaluated[key]
+            self.matched.pop(key, None)
+        self.logger.info(f"Term cache evicts terms: {count}")
+
+    def check_posts(self, posts, compiled_query, index=None):
+        """
+        포스트들이 쿼리들과 일치하는지 체크한다.
+        캐시에 없는 (단어, 포스트)들은 해당 포스트들만의 역색인("PostIndex")을 만들어 한꺼번에 검사한다.
+        :param posts: 포스트들
+        :param compiled_query: 컴파일된 쿼리 (OR 조건의 단어들을 합치지 않은 쿼리)
+        :param index: 결과의 index
+        :return: 쿼리(컬럼)별 'Y'/'N' 결과 (DataFrame)
+        """
+        texts = self.checker.preprocess_posts(posts)
+        ids = self.add_posts(texts)
+        if len(self.post_ids) > self.max_posts:
+            self.logger.info(f"Term cache clears posts: {len(self.post_ids)} (max posts: {self.max_posts})")
+            self.clear()
+            ids = self.add_posts(texts)
+        # 같은 내용의 포스트는 한 번만 검사한다.
+        ids, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+        terms = {}
+        for query in compiled_query.queries:
+            self.collect_terms(query, terms)
+        self.update(terms, [texts[i] for i in first], ids)
+        values = {}
+        for query, column in zip(compiled_query.queries, compiled_query.columns):
+            result = self.examine(query, ids)
+            values[column] = np.where(result[inverse], 'Y', 'N')
+        self.evict()
+        return pd.DataFrame(values, index=index)
+
+    def collect_terms(self, query, terms):
+        """
+        쿼리의 단어(와 NEAR 조건)들을 모은다.
+        :param query: 조건 또는 단어
+        :param terms: {단어 키: 단어}
+        :return:
+        """
+        if isinstance(query, SharedNode):
+            query = query.node
+        if isinstance(query, list):
+            return
+        if isinstance(query, dict) and query["operator"] in ('OR', 'AND', 'NOT'):
+            for operand in query["operands"]:
+                self.collect_terms(operand, terms)
+            return
+        terms.setdefault(self.cache_key(query), query)
+
+    def update(self, terms, texts, ids):
+        """
+        캐시에 없는 (단어, 포스트)들을 검사하여 캐시에 더한다. 쓴 단어들은 최근에 쓴 단어로 옮긴다.
+        :param terms: {단어 키: 단어}
+        :param texts: 전처리된 포스트들 (중복 없음)
+        :param ids: 포스트 번호 배열
+        :return:
+        """
+        # 비트맵은 이번 포스트들의 가장 큰 번호까지만 늘린다.
+        size = (int(ids.max()) >> 3) + 1 if len(ids) else 0
+        missing = {}
+        for key in terms:
+            evaluated = self.evaluated.pop(key, None)
+            if evaluated is None:
+                evaluated = np.zeros(size, dtype=np.uint8)
+            elif len(evaluated) < size:
+                evaluated = np.concatenate([evaluated, np.zeros(size - len(evaluated), dtype=np.uint8)])
+            self.evaluated[key] = evaluated
+            self.matched[key] = self.matched.pop(key, np.zeros(0, dtype=np.int32))
+            known = ((evaluated[ids >> 3] >> (7 - (ids & 7))) & 1).astype(bool)
+            if not known.all():
+                missing[key] = np.flatnonzero(~known)
+        misses = sum(len(rows) for rows in missing.values())
+        self.logger.info(f"Term cache hits: {len(terms) * len(ids) - misses}, misses: {misses}")
+        self.hits += len(terms) * len(ids) - misses
+        self.misses += misses
+        if not missing:
+            return
+
+        # 검사할 포스트들로만 역색인을 만든다.
+        selected = np.zeros(len(ids), dtype=bool)
+        for term_rows in missing.values():
+            selected[term_rows] = True
+        rows = np.flatnonzero(selected)
+        positions = np.cumsum(selected) - 1
+        index = PostIndex.build([texts[row] for row in rows])
+        for key, term_rows in missing.items():
+            found = np.zeros(len(rows), dtype=bool)
+            found[index.evaluate(terms[key])] = True
+            found = found[positions[term_rows]]
+            term_ids = ids[term_rows]
+            np.bitwise_or.at(self.evaluated[key], term_ids >> 3, (0x80 >> (term_ids & 7)).astype(np.uint8))
+            self.matched[key] = np.union1d(self.matched[key], term_ids[found]).astype(np.int32)
+
+    def examine(self, query, ids):
+        """
+        캐시된 단어별 결과를 합쳐 포스트들을 검사한다. AND/OR/NOT 조건은 배열 연산으로 합친다.
+        :param query: 조건 또는 단어
+        :param ids: 포스트 번호 배열
+        :return: 포스트별 결과 배열
+        """
+        if isinstance(query, SharedNode):
+            query = query.node
+        if isinstance(query, list):
+            return np.full(len(ids), len(query) > 0)
+        if isinstance(query, dict):
+            operator = query["operator"]
+            operands = query["operands"]
+            if operator == 'OR':
+                return np.logical_or.reduce([self.examine(operand, ids) for operand in operands])
+            elif operator == 'AND':
+                return np.logical_and.reduce([self.examine(operand, ids) for operand in operands])
+            elif operator == 'NOT':
+                return self.examine(operands[0], ids) & ~self.examine(operands[1], ids)
+        return np.isin(ids, self.matched[self.cache_key(query)])
@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from post_selector.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick(TestCase):
+
+    def test_iter(self):
+        automaton = AhoCorasick()
+        for word in ("he", "she", "his", "hers"):
+            automaton.add(word)
+        result = sorted(automaton.iter("ushers"))
+        self.assertEqual([(3, 3, "she"), (3, 2, "he"), (5, 4, "hers")], sorted(result, key=lambda r: (r[0], -r[1])))
+
+    def test_iter_skip_first(self):
+        automaton = AhoCorasick()
+        automaton.add(" samsung", 1)
+        automaton.add(" sam", 2)
+        automaton.add(" 1.08", 3)
+        self.assertEqual([2, 1, 3], [value for _, _, value in automaton.iter(" xsam samsung a 1.08 ")])
+        self.assertEqual([], list(automaton.iter("samsung")))
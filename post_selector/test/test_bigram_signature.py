@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from post_selector.bigram_signature import BigramSignature
+from post_selector.query_parser import QueryParser
+
+
+class TestBigramSignature(TestCase):
+
+    def setUp(self) -> None:
+        self.parser = QueryParser()
+
+    def test_text_signatures(self):
+        texts = [" samsung galaxy ", " 갤럭시 카메라 ", " ", "", "a", " #withgalaxy! "]
+        self.assertEqual([BigramSignature.text_signature(text) for text in texts],
+                         BigramSignature.text_signatures(texts))
+        self.assertEqual(0, BigramSignature.text_signature("a"))
+
+    def test_text_signatures_surrogate(self):
+        # 스크랩한 글의 깨진 이모지(짝이 없는 서로게이트)
+        texts = [" samsung galaxy \ud83d phone ", " \ud83d"]
+        self.assertEqual([BigramSignature.text_signature(text) for text in texts],
+                         BigramSignature.text_signatures(texts))
+
+    def test_term_signature(self):
+        pattern = self.parser.to_regex_word("galaxy")
+        signature = BigramSignature.term_signature(pattern)
+        self.assertEqual(signature, BigramSignature.text_signature(" galaxy") & signature)
+        post = BigramSignature.text_signature(" new galaxy phone ")
+        self.assertEqual(signature, post & signature)
+        post = BigramSignature.text_signature(" new samsung phone ")
+        self.assertNotEqual(signature, post & signature)
+        # 와일드카드 앞뒤의 바이그램은 쓰지 않는다.
+        self.assertEqual(BigramSignature.term_signature(" ga"), BigramSignature.term_signature(" ga[^ ]*[?!,. ]"))
+        self.assertEqual(0, BigramSignature.term_signature(" (?:galaxy|samsung)[?!,. ]"))
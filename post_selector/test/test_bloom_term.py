@@ -0,0 +1,38 @@
+import re
+from unittest import TestCase
+
+from post_selector.bigram_signature import BigramSignature
+from post_selector.bloom_term import BloomTerm
+from post_selector.post_checker import PostChecker
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_parser import QueryParser
+
+
+class TestBloomTerm(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+        self.parser = QueryParser()
+
+    def test_search(self):
+        words = ["galaxy", "galaxy*", "갤럭시", "s.pen", "with galaxy", "#withgalaxy"]
+        posts = ["new galaxy", "galaxys", "갤럭시 폰", "s.pen", "spen", "with  galaxy", "#withGalaxy!", "nothing", ""]
+        for word in words:
+            pattern = self.parser.to_regex_word(word)
+            term = BloomTerm(pattern, BigramSignature.term_signature(pattern))
+            for post in posts:
+                post = self.checker.preprocess_post(post)
+                self.assertEqual(re.search(pattern, post) is not None, term.search(post) is not None, (word, post))
+                self.assertEqual([r.start() for r in re.finditer(pattern, post)],
+                                 [r.start() for r in term.finditer(post)], (word, post))
+            self.assertTrue(term.rejects(self.checker.preprocess_post("nothing")))
+
+    def test_compile_query(self):
+        query = "(galaxy OR phone) AND (camera NEAR/2 photo) NOT case"
+        plain = QueryCompiler().compile_query(query)
+        bloom = QueryCompiler(bigram_filter=True).compile_query(query)
+        print(bloom)
+        for text in ("galaxy camera photo", "phone camera nice photo", "galaxy camera a b c photo", "camera photo",
+                     "galaxy camera photo case"):
+            post = self.checker.preprocess_post(text)
+            self.assertEqual(self.checker.check_post(post, plain, True), self.checker.check_post(post, bloom, True))
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from post_selector.column_checker import ColumnChecker
+from post_selector.post_checker import PostChecker
+from post_selector.query_compiler import CompiledQuery, QueryCompiler
+
+
+class TestColumnChecker(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = ColumnChecker()
+
+    def test_check_posts(self):
+        compiler = QueryCompiler()
+        queries = [compiler.compile_query(query) for query in
+                   ("(a OR b) AND c", "(a OR b) NOT (c OR d)", "(a OR x) NEAR/1 (b OR y)", "a")]
+        compiled_query = CompiledQuery(("q1", "q2", "q3", "q4"), ("q1", "q2", "q3", "q4"),
+                                       compiler.share_nodes(queries))
+        posts = pd.Series(["a c", "b", "b d", "x y", "a z z z b", "", None, "c"], name="message")
+        result = self.checker.check_posts(posts, compiled_query)
+        print(result)
+
+        checker = PostChecker()
+        expected = pd.DataFrame([checker.check_post_for_queries(post, compiled_query.queries, compiled_query.columns)
+                                 for post in posts])
+        self.assertTrue(expected.equals(result))
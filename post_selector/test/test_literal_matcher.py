@@ -0,0 +1,32 @@
+import re
+from unittest import TestCase
+
+from post_selector.literal_matcher import LiteralMatcher, LiteralTerm
+from post_selector.query_parser import QueryParser
+
+
+class TestLiteralMatcher(TestCase):
+
+    def setUp(self) -> None:
+        self.parser = QueryParser()
+
+    def test_to_literal(self):
+        self.assertEqual(" samsung", LiteralMatcher.to_literal(self.parser.to_regex_word("samsung")))
+        self.assertEqual(" 1.08 a+", LiteralMatcher.to_literal(self.parser.to_regex_word("1.08_|_a+")))
+        self.assertIsNone(LiteralMatcher.to_literal(self.parser.to_regex_word("samsung*")))
+        self.assertIsNone(LiteralMatcher.to_literal(self.parser.to_regex_word("?samsung")))
+        self.assertIsNone(LiteralMatcher.to_literal("Samsung*"))
+
+    def test_search(self):
+        words = [self.parser.to_regex_word(word) for word in ("samsung", "galaxy", "1.08", "a b")]
+        matcher = LiteralMatcher()
+        terms = []
+        for word in words:
+            literal = LiteralMatcher.to_literal(word)
+            matcher.add(literal)
+            terms.append(LiteralTerm(matcher, [word], [literal]))
+        matcher.build()
+        posts = [" samsung ", " samsungs ", " galaxy? ", " 1.08, ", " 1x08 ", " a b ", " ab ", " xsamsung "]
+        for post in posts:
+            for word, term in zip(words, terms):
+                self.assertEqual(bool(re.search(word, post)), term.search(post) is not None, (word, post))
@@ -0,0 +1,34 @@
+import re
+from unittest import TestCase
+
+from post_selector.pattern_trie import PatternTrie
+from post_selector.query_parser import QueryParser
+
+
+class TestPatternTrie(TestCase):
+
+    def setUp(self) -> None:
+        self.parser = QueryParser()
+
+    def test_tokenize(self):
+        self.assertEqual([" ", "a", "[.]", "[^ ]*", "[?!,. ]"], PatternTrie.tokenize(" a[.][^ ]*[?!,. ]"))
+        self.assertEqual(["S", "a", "m", "s", "u", "n", "g*"], PatternTrie.tokenize("Samsung*"))
+        self.assertIsNone(PatternTrie.tokenize("a|b"))
+        self.assertIsNone(PatternTrie.tokenize("a?"))
+
+    def test_fuse(self):
+        words = [self.parser.to_regex_word(word) for word in
+                 ("samsung", "samsung*", "sam", "?108mp", "108mp?", "*108mp*", "1.08", "a+", "a b")]
+        fused, rest = PatternTrie.fuse(words + ["a|b"])
+        print(fused)
+        self.assertEqual(["a|b"], rest)
+        posts = [" samsung ", " samsungs. ", " sam, ", " sa ", " x108mp ", " 108mpx ", " a108mpb ", " 108 mp ",
+                 " 1.08 ", " 1x08 ", " a+ ", " a ", " a b ", " ab "]
+        for post in posts:
+            expected = any(re.search(word, post) for word in words)
+            self.assertEqual(expected, bool(re.search(fused, post)), post)
+
+    def test_fuse_nothing(self):
+        fused, rest = PatternTrie.fuse(["a|b", "(c)"])
+        self.assertIsNone(fused)
+        self.assertEqual(["a|b", "(c)"], rest)
@@ -1,13 +1,25 @@
+import tempfile
+from pathlib import Path
 from unittest import TestCase
+from unittest.mock import PropertyMock, patch
 
 from post_selector.data_loader import DataLoader
 from post_selector.post_checker import PostChecker
+from post_selector.post_selector_config import PostSelectorConfig
+from post_selector.query_compiler import QueryCompiler
 from post_selector.query_parser import QueryParser
 
 
 class TestPostChecker(TestCase):
 
     def setUp(self) -> None:
+        # 격리 파일은 저장소의 "data/quarantine" 대신 임시 디렉터리에 쓴다.
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = patch.object(PostSelectorConfig, "quarantine_dir", new_callable=PropertyMock,
+                               return_value=Path(temp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.checker = PostChecker()
 
     def test_exist(self):
@@ -25,6 +37,18 @@ class TestPostChecker(TestCase):
         self.assertFalse(self.checker.exist([ ], " ccc "))
         self.assertTrue(self.checker.exist([1], " ccc "))
 
+    def test_time_budget(self):
+        self.checker.quarantine_name = "test_quarantine"
+        compiler = QueryCompiler(glob_terms=False)
+        queries = [compiler.compile_query("galaxy"), compiler.compile_query("*a*b*c* OR galaxy")]
+        post = " " + "ab" * 2000 + " galaxy "
+        result = self.checker.check_post_for_queries(post, queries, ["galaxy", "abc"], time_budget=0.2)
+        self.assertEqual({"galaxy": 'Y', "abc": 'N'}, result)
+        record = self.checker.quarantined[-1]
+        self.assertEqual("abc", record["column"])
+        self.assertIn("[^ ]*a[^ ]*b[^ ]*c", record["term"])
+        self.assertEqual([record], DataLoader().load_quarantined_posts("test_quarantine"))
+
     def test_word_to_index(self):
         result = self.checker.word_to_index("b", " a b c b ")
         print(result)
@@ -37,6 +61,45 @@ class TestPostChecker(TestCase):
         result = self.checker.examine_near_condition([['a'], ['b c']], 1, ' a b c d ')
         print("Result: ", result)
 
+        parser = QueryParser()
+        post = self.checker.preprocess_post("a b c d e f g")
+        self.assertEqual([0, 1, 2], self.checker.examine_near_condition(
+            [parser.to_regex_word("a"), parser.to_regex_word("c")], 1, post))
+        self.assertEqual([], self.checker.examine_near_condition(
+            [parser.to_regex_word("a"), parser.to_regex_word("g")], 1, post))
+
+    def test_examine_near_condition_with_condition(self):
+        parser = QueryParser()
+        query = parser.query_to_dict("(x OR a) NEAR/1 (y OR c)")
+        self.assertTrue(self.checker.examine_conditions(query, self.checker.preprocess_post("a b c d")))
+        self.assertFalse(self.checker.examine_conditions(query, self.checker.preprocess_post("a b d e f c")))
+
+        def condition(operator, *operands):
+            return {"operator": operator, "operands": list(operands)}
+
+        post = self.checker.preprocess_post("a b c d")
+        self.assertEqual([1, 2, 3], self.checker.examine_near_condition(
+            [condition("OR", "x", "a"), condition("OR", "y", "c")], 1, post))
+        # 조건 피연산자는 피연산자 순서와 관계없이 범위 안의 가장 앞 위치를 쓴다.
+        self.assertEqual([1, 2, 3, 4], self.checker.examine_near_condition(["d", condition("OR", "c", "a")], 3, post))
+        self.assertEqual([1, 2, 3, 4], self.checker.examine_near_condition(["d", condition("OR", "a", "c")], 3, post))
+        self.assertEqual([3, 4], self.checker.examine_near_condition([condition("AND", "a", "c"), "d"], 1, post))
+        self.assertEqual([1, 2], self.checker.examine_near_condition([condition("NOT", "a", "x"), "b"], 1, post))
+        self.assertEqual([], self.checker.condition_to_index(condition("NOT", "a", "b"), post))
+        # 안쪽 NEAR 는 자신을 만족하는 위치들을 바깥 NEAR 의 피연산자로 넘긴다.
+        inner = {"operator": "NEAR", "operands": ["a", "c"], "distance": 1}
+        self.assertEqual([1, 2, 3], self.checker.condition_to_index(inner, post))
+        self.assertEqual([2, 3, 4], self.checker.examine_near_condition([inner, "d"], 1, post))
+
+    def test_preprocess_posts(self):
+        posts = ["", "   ", " Galaxy  Note\t10\n", "ΟΔΟΣ Σ", "“Hi” Cafe\u0301", 5, None, "x\u3000y", "end "]
+        expected = [self.checker.preprocess_post(post) for post in posts]
+        self.assertEqual(expected, self.checker.preprocess_posts(posts))
+        self.assertEqual(" galaxy note 10 ", self.checker.preprocess_posts(posts)[2])
+        # 구분자가 들어 있는 포스트가 있으면 하나씩 전처리한다.
+        self.assertEqual(expected + [" a\x00b "], self.checker.preprocess_posts(posts + ["A\x00B"]))
+        self.assertIs(expected[2], self.checker.preprocess_posts(expected)[2])
+
     def test_replace_query(self):
         result = self.checker.replace_query(' d "addd fdb" "dsafase" c ')
         print(result)
@@ -0,0 +1,70 @@
+import re
+from unittest import TestCase
+
+import pandas as pd
+
+from post_selector.post_checker import PostChecker
+from post_selector.post_index import PostIndex
+from post_selector.query_compiler import CompiledQuery, QueryCompiler
+
+
+class TestPostIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.posts = pd.Series(["Samsung Galaxy S20, camera", "galaxy note", "a b c d", "mp, and mp!", "MP3 player",
+                                "#withgalaxy rocks", "I love x#withgalaxy", "b a", "", None, "1억800만화소 카메라"])
+        self.index = PostIndex.build(self.posts)
+
+    def test_build(self):
+        print(self.index.tokens)
+        self.assertEqual(len(self.posts), len(self.index))
+        self.assertEqual([0], list(self.index.postings[self.index.tokens.index("s20,")]))
+
+    def test_plan_term(self):
+        self.assertEqual([[["a"], ["b"]]], self.index.plan_term(" a b[?!,. ]"))
+        self.assertEqual([[["m", "p", "."]], [["m", "p"], []]], self.index.plan_term(" mp.[?!,. ]"))
+        self.assertEqual([[[".", "#", "w"]]], self.index.plan_term(" .#w[?!,. ]"))
+        self.assertIsNone(self.index.plan_term("Samsung*"))
+
+    def test_check_posts(self):
+        compiler = QueryCompiler(fuse_or=False, reorder=False, share=False)
+        queries = ["samsung_|_galaxy OR note", "galaxy* AND camera", "mp? NOT player", "a NEAR/1 c", "a NEAR/2 d",
+                   "?#withgalaxy OR #withgalaxy", "(Samsung*)", "note OR *800만화소*", "b_|_a OR c_|_d"]
+        compiled_query = CompiledQuery(queries, queries,
+                                       [compiler.compile_query(compiler.checker.replace_query(query))
+                                        for query in queries])
+        result = self.index.check_posts(compiled_query)
+        print(result)
+
+        checker = PostChecker()
+        expected = pd.DataFrame([checker.check_post_for_queries(post, compiled_query.queries, compiled_query.columns)
+                                 for post in self.posts])
+        self.assertTrue(expected.equals(result))
+
+    def test_find_tokens(self):
+        self.assertEqual(["#withgalaxy", "x#withgalaxy"],
+                         [self.index.tokens[token_id] for token_id in self.index.find_tokens("withgalaxy")])
+        self.assertEqual(["1억800만화소"], [self.index.tokens[token_id] for token_id in self.index.find_tokens("800만")])
+        self.assertEqual(["mp!", "mp,", "mp3"],
+                         [self.index.tokens[token_id] for token_id in self.index.find_tokens("mp")])
+
+    def test_match_simple(self):
+        tokens = ["mp", "mp3", "mp!", "mp3,", "mpx3", "m", "samsung", "samsung!"]
+        for atoms in (["m", "p"], ["m", "p", "."], ["m", ".", "3"], ["m", "p", "[^ ]*"], ["s", "a", "m", "[^ ]*"]):
+            chars, tail = PostIndex.simple_atoms(atoms)
+            for last in (False, True):
+                match = re.compile("".join(atoms) + (PostIndex.BOUNDARY if last else "$")).match
+                for token in tokens:
+                    self.assertEqual(match(token) is not None, PostIndex.match_simple(token, chars, tail, last),
+                                     (atoms, last, token))
+        self.assertIsNone(PostIndex.simple_atoms(["m", "[^ ]*", "3"]))
+
+    def test_prune(self):
+        query = {"operator": "NEAR", "distance": 1, "operands": [
+            {"operator": "OR", "operands": [" a[?!,. ]", " x[?!,. ]"]},
+            {"operator": "OR", "operands": [" c[?!,. ]", " y[?!,. ]", {"operator": "AND", "operands": [" d[?!,. ]"]}]}]}
+        self.assertEqual({" a[?!,. ]", " x[?!,. ]", " c[?!,. ]", " y[?!,. ]"}, set(self.index.or_terms(query, {})))
+        pruned = self.index.prune(query, {" a[?!,. ]"})
+        self.assertEqual([" a[?!,. ]"], pruned["operands"][0]["operands"])
+        self.assertEqual([{"operator": "AND", "operands": [" d[?!,. ]"]}], pruned["operands"][1]["operands"])
+        self.assertEqual([2], self.index.verify_near(query, self.index.all_rows()).tolist())
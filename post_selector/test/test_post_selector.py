@@ -1,15 +1,172 @@
+import tempfile
+from pathlib import Path
 from unittest import TestCase
+from unittest.mock import PropertyMock, patch
+
+import pandas as pd
 
 from post_selector.post_selector import PostSelector
+from post_selector.post_selector_config import PostSelectorConfig
 
 
 class TestPostSelector(TestCase):
 
     def setUp(self) -> None:
+        # 캐시, 격리 파일들은 저장소의 "data" 대신 임시 디렉터리에 쓴다.
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.patch_dir("cache_dir", Path(temp_dir.name) / "cache")
+        self.patch_dir("index_dir", Path(temp_dir.name) / "index")
+        self.patch_dir("quarantine_dir", Path(temp_dir.name) / "quarantine")
         self.selector = PostSelector()
         self.selector.input_csv_sep = "\t"
 
+    def patch_dir(self, name, path):
+        patcher = patch.object(PostSelectorConfig, name, new_callable=PropertyMock, return_value=path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_check_posts(self):
         self.selector.check_posts(
             query_file_names=("with_galaxy_v1.31", "camera_v2.11"),
             column_names=("withGalaxy", "Camera"))
+
+    def test_check_posts_by_post_parallel(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 100})
+        result = self.selector.check_posts_by_post_parallel(posts, ("with_galaxy_v1.31", "samsung_v1.0"),
+                                                            ("withGalaxy", "samsung_yn"))
+        expected = self.selector.check_posts_by_post(posts, ("with_galaxy_v1.31", "samsung_v1.0"),
+                                                     ("withGalaxy", "samsung_yn"))
+        self.assertEqual(expected.to_dict(), result.to_dict())
+        self.assertEqual(["Y", "N", "N"], list(result["withGalaxy"][:3]))
+
+    def test_check_posts_by_post_parallel_time_budget(self):
+        # 워커에는 포스트 묶음만 보내고, 검사 시간 제한을 넘은 포스트들은 결과와 함께 돌려받는다.
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 100})
+        self.selector.checker.quarantine_name = "test_quarantine"
+        result = self.selector.check_posts_by_post_parallel(posts, ("with_galaxy_v1.31", "samsung_v1.0"),
+                                                            ("withGalaxy", "samsung_yn"), time_budget=1e-7)
+        self.assertEqual([['N', 'N']] * len(posts), result[["withGalaxy", "samsung_yn"]].values.tolist())
+        self.assertEqual(list(posts.index), sorted(self.selector.timed_out_rows))
+        self.assertEqual(len(posts), len(self.selector.loader.load_quarantined_posts("test_quarantine")))
+
+    def test_check_posts_profile(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 100})
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts)
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, profile=True)
+        self.assertEqual(expected.to_dict(), result.to_dict())
+        report = self.selector.profile_report
+        print(report.head(20))
+        self.assertEqual({"withGalaxy", "samsung_yn"}, set(report["query"]))
+        # 중복 포스트를 없앤 3개의 포스트만 검사한다.
+        self.assertTrue((report["evaluations"] + report["short_circuits"] >= 3).all())
+
+    def test_check_posts_auto(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 10})
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts, engine="post")
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, engine="auto")
+        self.assertEqual(expected.to_dict(), result.to_dict())
+        print(self.selector.last_plan)
+        self.assertIn(self.selector.last_plan["engine"], ("post", "column"))
+
+    def test_check_posts_surrogate(self):
+        posts = pd.DataFrame({"message": ["samsung galaxy \ud83d phone", "\ud83d I love #withGalaxy"]})
+        for engine in ("auto", "post", "column"):
+            result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                               posts=posts, engine=engine)
+            self.assertEqual([['N', 'Y'], ['Y', 'N']], result.values.tolist())
+
+    def test_check_posts_by_column(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 10})
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, engine="column")
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts)
+        self.assertEqual(expected.to_dict(), result.to_dict())
+
+    def test_check_posts_by_index(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 10})
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, engine="index")
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts)
+        self.assertEqual(expected.to_dict(), result.to_dict())
+
+    def test_get_index(self):
+        posts = self.selector.preprocess_posts(pd.Series(["galaxy note", "samsung phone"]))
+        index = self.selector.get_index(posts, "test_posts")
+        self.assertEqual([0], index.evaluate(" galaxy[?!,. ]").tolist())
+        # 포스트 수가 같아도 내용이 다르면 역색인을 새로 만든다.
+        posts = self.selector.preprocess_posts(pd.Series(["samsung phone", "galaxy note"]))
+        index = self.selector.get_index(posts, "test_posts")
+        self.assertEqual([1], index.evaluate(" galaxy[?!,. ]").tolist())
+        self.assertEqual([1], self.selector.get_index(posts, "test_posts").evaluate(" galaxy[?!,. ]").tolist())
+        # 읽을 수 없는 역색인 파일은 새로 만든다.
+        (self.selector.loader.cfg.index_dir / "test_posts.index.pkl").write_bytes(b"broken")
+        self.assertEqual([1], self.selector.get_index(posts, "test_posts").evaluate(" galaxy[?!,. ]").tolist())
+
+    def test_check_posts_by_term_cache(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 10})
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts)
+        for _ in range(2):
+            result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                               posts=posts, engine="term_cache")
+            self.assertEqual(expected.to_dict(), result.to_dict())
+
+    def test_check_posts_by_result_cache(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing here", "Samsung Galaxy phone"] * 10})
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts)
+        for messages in (posts, pd.concat([posts, pd.DataFrame({"message": ["new Samsung Galaxy phone"]})])):
+            result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                               posts=messages, engine="column", result_cache=True)
+            self.assertEqual(expected.to_dict(), result.iloc[:len(posts)].to_dict())
+        self.assertEqual('Y', result["samsung_yn"].iloc[-1])
+
+    def test_check_posts_by_result_cache_time_budget(self):
+        # 캐시에 없는 포스트들로 검사 시간 제한을 넘긴 뒤 제한 없이 다시 검사한다.
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "Samsung Galaxy phone", "nothing here"]})
+        self.selector.checker.quarantine_name = "test_quarantine"
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, result_cache=True, time_budget=1e-7)
+        self.assertEqual([['N', 'N']] * 3, result.values.tolist())
+        self.assertEqual(3, len(self.selector.timed_out_rows))
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, result_cache=True)
+        self.assertEqual([['Y', 'N'], ['N', 'Y'], ['N', 'N']], result.values.tolist())
+
+    def test_check_posts_by_result_cache_surrogate(self):
+        posts = pd.DataFrame({"message": ["samsung galaxy \ud83d phone", "\ud83d I love #withGalaxy"]})
+        for _ in range(2):
+            result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                               posts=posts, result_cache=True)
+            self.assertEqual([['N', 'Y'], ['Y', 'N']], result.values.tolist())
+
+    def test_check_posts_dedupe(self):
+        posts = pd.DataFrame({"message": ["I love #withGalaxy", "nothing  here", "Samsung Galaxy phone",
+                                          "Nothing here"] * 10})
+        result = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                           posts=posts, engine="column")
+        print(self.selector.dedupe_stats)
+        self.assertEqual(3, self.selector.dedupe_stats["unique_posts"])
+        expected = self.selector.check_posts(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"),
+                                             posts=posts, engine="column", dedupe=False)
+        self.assertEqual(expected.to_dict(), result.to_dict())
+
+    def test_preprocess_posts(self):
+        messages = pd.Series(["I love #withGalaxy", "Samsung  Galaxy phone"])
+        expected = self.selector.preprocess_posts(messages)
+        self.assertEqual([" i love #withgalaxy ", " samsung galaxy phone "], expected.tolist())
+        for _ in range(2):
+            self.assertEqual(expected.tolist(), self.selector.preprocess_posts(messages, "test_posts").tolist())
+        # 저장된 전처리 결과는 임시 디렉터리에 쓴다.
+        self.assertTrue((self.selector.loader.cfg.cache_dir / "test_posts.preprocessed.pkl").exists())
+        messages = pd.Series(["samsung galaxy \ud83d phone"])
+        self.assertNotEqual(PostSelector.messages_key(messages), PostSelector.messages_key(messages.str[:-1]))
+        self.assertEqual([" samsung galaxy \ud83d phone "],
+                         self.selector.preprocess_posts(messages, "test_posts").tolist())
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from post_selector.bigram_signature import BigramSignature
+from post_selector.preprocessed_post import PreprocessedPost
+from post_selector.unicode_scripts import UnicodeScripts
+
+
+class TestPreprocessedPost(TestCase):
+
+    def test_token_index(self):
+        post = PreprocessedPost(" a bb ccc d ")
+        self.assertEqual(" a bb ccc d ", post)
+        self.assertEqual([0, 2, 5, 9, 11], post.spaces)
+        for offset in range(len(post)):
+            self.assertEqual(post[:offset].count(" "), post.token_index(offset))
+
+    def test_tags(self):
+        post = PreprocessedPost(" #withgalaxy, new #a.b @samsung x#y ")
+        self.assertEqual(["#a.b", "#withgalaxy,", "@samsung"], sorted(post.tag_words))
+        self.assertEqual({"#withgalaxy,", "#withgalaxy", "#a.b", "#a", "@samsung"}, post.tags)
+        self.assertEqual((), PreprocessedPost(" no tags ").tag_words)
+
+    def test_scripts(self):
+        self.assertEqual(0, PreprocessedPost(" samsung galaxy ").scripts)
+        self.assertEqual(["hangul", "thai"], UnicodeScripts.names(PreprocessedPost(" 갤럭시 สวัสดี café ").scripts))
+
+    def test_signature(self):
+        posts = [PreprocessedPost(" samsung galaxy "), PreprocessedPost(" 갤럭시 ")]
+        expected = [BigramSignature.text_signature(post) for post in posts]
+        PreprocessedPost.sign_posts(posts)
+        self.assertEqual(expected, [post.signature for post in posts])
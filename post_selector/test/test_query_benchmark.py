@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from post_selector.query_benchmark import QueryBenchmark
+from post_selector.query_compiler import QueryCompiler
+
+
+class TestQueryBenchmark(TestCase):
+
+    def setUp(self) -> None:
+        self.benchmark = QueryBenchmark()
+
+    def test_make_posts(self):
+        posts = self.benchmark.make_posts(count=10)
+        self.assertEqual(10, len(posts))
+        print(posts)
+
+    def test_compare_compiled_patterns(self):
+        result = self.benchmark.compare({
+            "regex string": QueryCompiler(compile_patterns=False, fuse_or=False),
+            "compiled pattern": QueryCompiler(compile_patterns=True, fuse_or=False),
+        }, self.benchmark.make_posts(count=100))
+        print(result)
+
+    def test_compare_fused_or(self):
+        result = self.benchmark.compare({
+            "compiled pattern": QueryCompiler(fuse_or=False),
+            "fused or": QueryCompiler(fuse_or=True),
+        })
+        print(result)
+
+    def test_compare_aho_corasick(self):
+        result = self.benchmark.compare({
+            "fused or": QueryCompiler(),
+            "aho-corasick": QueryCompiler(literal_engine="aho_corasick"),
+        })
+        print(result)
+
+    def test_compare_engines(self):
+        result = self.benchmark.compare_engines(self.benchmark.make_posts(count=1000))
+        print(result)
+
+    def test_compare_evaluators(self):
+        result = self.benchmark.compare_evaluators(self.benchmark.make_posts(count=1000))
+        print(result)
+
+    def test_measure_parser(self):
+        result = self.benchmark.measure_parser((1000, 10000))
+        print(result)
+
+    def test_compare_bigram_filter(self):
+        posts = self.benchmark.make_posts(count=1000)
+        result = self.benchmark.compare_bigram_filter(posts)
+        print(result)
+        result = self.benchmark.bigram_reject_rates(posts)
+        print(result.describe())
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_codegen import QueryCodegen
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_parser import QueryParser
+
+
+class TestQueryCodegen(TestCase):
+
+    def setUp(self) -> None:
+        self.codegen = QueryCodegen()
+        self.checker = PostChecker()
+        self.parser = QueryParser()
+
+    def test_compile(self):
+        queries = ["galaxy AND (note OR s2*)", "galaxy NOT note", "(camera OR lens) NEAR/2 (galaxy AND s*)"]
+        posts = ["Galaxy note 10", "galaxy s20 camera", "my camera, the galaxy s20", "nothing here"]
+        for query in queries:
+            query = self.parser.query_to_dict(query)
+            function = self.codegen.compile(query)
+            for post in posts:
+                post = self.checker.preprocess_post(post)
+                self.assertEqual(self.checker.examine_conditions(query, post), function(post))
+
+    def test_compile_queries(self):
+        compiled_query = QueryCompiler().compile(("camera_v2.11", "samsung_v1.0", "with_galaxy_v1.31"))
+        functions = self.codegen.compile_queries(compiled_query.queries)
+        post = "New Samsung Galaxy S21 Ultra 108MP camera review"
+        result = self.checker.check_post_by_functions(post, functions, compiled_query.columns)
+        print(result)
+        self.assertEqual(self.checker.check_post_for_queries(post, compiled_query.queries, compiled_query.columns),
+                         result)
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_compiler import QueryCompiler
+from post_selector.shared_node import SharedNode
+
+
+class TestQueryCompiler(TestCase):
+
+    def setUp(self) -> None:
+        self.compiler = QueryCompiler()
+
+    def test_compile(self):
+        compiled_query = self.compiler.compile(("with_galaxy_v1.31", "samsung_v1.0"), ("withGalaxy", "samsung_yn"))
+        self.assertEqual(("with_galaxy_v1.31", "samsung_v1.0"), compiled_query.names)
+        self.assertEqual(("withGalaxy", "samsung_yn"), compiled_query.columns)
+        self.assertEqual(2, len(compiled_query))
+        self.assertEqual("NOT", compiled_query.queries[0]["operator"])
+        print(compiled_query.queries[0])
+
+    def test_compile_default_columns(self):
+        compiled_query = self.compiler.compile("with_galaxy_v1.31")
+        self.assertEqual(("with_galaxy_v1.31",), compiled_query.columns)
+
+    def test_share_nodes(self):
+        compiler = QueryCompiler(fuse_or=False)
+        queries = [compiler.compile_query("(a OR b) AND c"), compiler.compile_query("(b OR a) NOT d")]
+        shared_queries = compiler.share_nodes(queries)
+        self.assertIsInstance(shared_queries[0]["operands"][0], SharedNode)
+        self.assertIs(shared_queries[0]["operands"][0], shared_queries[1]["operands"][0])
+
+        checker = PostChecker()
+        for text in ("a c", "b d", "b", "c d", "a"):
+            post = checker.preprocess_post(text)
+            for query, shared_query in zip(queries, shared_queries):
+                self.assertEqual(checker.check_post(post, query, True), checker.check_post(post, shared_query, True))
+
+    def test_compile_cache(self):
+        names = ("with_galaxy_v1.31", "samsung_v1.0")
+        compiled_query = self.compiler.compile(names)
+        cached_query = self.compiler.compile(names, ("withGalaxy", "samsung_yn"))
+        self.assertEqual(("withGalaxy", "samsung_yn"), cached_query.columns)
+        self.assertEqual(repr(QueryCompiler(cache=False).compile(names).queries), repr(cached_query.queries))
+        self.assertEqual(repr(compiled_query.queries), repr(cached_query.queries))
+
+        self.assertNotEqual(self.compiler.cache_key(names), self.compiler.cache_key(names[:1]))
+        self.assertNotEqual(self.compiler.options_key(), QueryCompiler(fuse_or=False).options_key())
+
+    def test_cache_sources(self):
+        names = [file_path.name for file_path in QueryCompiler.cache_sources()]
+        for name in ("query_compiler.py", "post_checker.py", "preprocessed_post.py", "query_codegen.py",
+                     "column_checker.py", "term_cache.py"):
+            self.assertIn(name, names)
+        self.assertNotIn("test_query_compiler.py", names)
+
+    def test_optimize_report(self):
+        report = self.compiler.optimize_report(("with_galaxy_v1.31", "samsung_v1.0"))
+        print(report)
+        self.assertEqual(9, report.loc["with_galaxy_v1.31", "terms"])
+        self.assertGreater(report.loc["with_galaxy_v1.31", "reduction"], 0)
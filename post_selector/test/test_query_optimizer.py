@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_optimizer import QueryOptimizer
+from post_selector.query_parser import QueryParser
+
+
+class TestQueryOptimizer(TestCase):
+
+    def setUp(self) -> None:
+        self.optimizer = QueryOptimizer()
+        self.parser = QueryParser()
+
+    def test_optimize(self):
+        query = self.parser.query_to_dict("(108mp OR 108mp* OR ?108mp OR *108mp* OR 108mp) AND ((a OR b) OR a)")
+        optimized = self.optimizer.optimize(query)
+        print(optimized)
+        self.assertEqual({'operator': 'AND', 'operands': [
+            ' [^ ]*108mp[^ ]*[?!,. ]',
+            {'operator': 'OR', 'operands': [' a[?!,. ]', ' b[?!,. ]']}]}, optimized)
+        self.assertEqual(8, self.optimizer.count_terms(query))
+        self.assertEqual(3, self.optimizer.count_terms(optimized))
+
+    def test_optimize_and(self):
+        query = self.parser.query_to_dict("galaxy* AND galaxy AND (c AND c)")
+        self.assertEqual({'operator': 'AND', 'operands': [' galaxy[?!,. ]', ' c[?!,. ]']},
+                         self.optimizer.optimize(query))
+
+    def test_optimize_near(self):
+        query = self.parser.query_to_dict("(mp OR mp* OR mp) NEAR/2 (a AND a*)")
+        self.assertEqual({'operator': 'NEAR', 'operands': [
+            {'operator': 'OR', 'operands': [' mp[?!,. ]', ' mp[^ ]*[?!,. ]']},
+            {'operator': 'AND', 'operands': [' a[?!,. ]', ' a[^ ]*[?!,. ]']}], 'distance': 2},
+            self.optimizer.optimize(query))
+
+    def test_fold(self):
+        self.assertEqual(' a[?!,. ]', self.optimizer.optimize({'operator': 'OR', 'operands': [' a[?!,. ]', []]}))
+        self.assertEqual([], self.optimizer.optimize({'operator': 'AND', 'operands': [' a[?!,. ]', []]}))
+        self.assertEqual([1], self.optimizer.optimize({'operator': 'OR', 'operands': [' a[?!,. ]', [1]]}))
+        self.assertEqual(' a[?!,. ]', self.optimizer.optimize({'operator': 'NOT', 'operands': [' a[?!,. ]', []]}))
+
+    def test_contains(self):
+        atoms = self.optimizer.to_atoms
+        self.assertTrue(self.optimizer.contains(atoms(" 108mp[^ ]*[?!,. ]"), atoms(" 108mp[?!,. ]")))
+        self.assertTrue(self.optimizer.contains(atoms(" [^ ]*108mp[?!,. ]"), atoms(" .108mp[?!,. ]")))
+        self.assertFalse(self.optimizer.contains(atoms(" 108mp[?!,. ]"), atoms(" 108mp[^ ]*[?!,. ]")))
+        self.assertFalse(self.optimizer.contains(atoms(" [^ ]*mp[?!,. ]"), atoms(" a.mp[?!,. ]")))
+
+        checker = PostChecker()
+        query = self.parser.query_to_dict("108mp OR 108mp* OR ?108mp OR *108mp*")
+        optimized = self.optimizer.optimize(query)
+        for text in ("108mp", "108mpx", "#108mp", "x108mpx!", "108 mp", "", "a 108mp."):
+            post = checker.preprocess_post(text)
+            self.assertEqual(checker.check_post(post, query, True), checker.check_post(post, optimized, True))
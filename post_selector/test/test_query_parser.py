@@ -950,6 +950,20 @@ OR WindFree )
         result = self.parser.query_to_dict(doc)
         print(result)
 
+    def test_query_to_dict_twice(self):
+        query = "(a OR b) AND (c NEAR/2 d)"
+        self.assertEqual(self.parser.query_to_dict(query), self.parser.query_to_dict(query))
+        self.assertEqual({'operator': 'AND', 'operands': [
+            {'operator': 'OR', 'operands': [' a[?!,. ]', ' b[?!,. ]']},
+            {'operator': 'NEAR', 'operands': [' c[?!,. ]', ' d[?!,. ]'], 'distance': 2}]},
+            self.parser.query_to_dict(query))
+
+    def test_unmatched_parenthesis(self):
+        with self.assertRaisesRegex(ValueError, "position 8"):
+            self.parser.query_to_dict("(a OR b))")
+        with self.assertRaisesRegex(ValueError, "position 6"):
+            self.parser.query_to_dict("a AND (b OR (c)")
+
     def test_nears_to_dict(self):
         result = self.parser.nears_to_dict(" ab OR ((a OR b) NEAR/1 (c OR d)) OR cd ")
         print(result)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from post_selector.query_benchmark import QueryBenchmark
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_planner import QueryPlanner
+
+
+class TestQueryPlanner(TestCase):
+
+    def setUp(self) -> None:
+        self.planner = QueryPlanner()
+
+    def test_features(self):
+        compiled_query = QueryCompiler(cache=False).compile(("with_galaxy_v1.31", "samsung_v1.0"))
+        features = self.planner.features([" a b ", " cdef "], compiled_query)
+        print(features)
+        self.assertEqual(2, features["posts"])
+        self.assertEqual(2, features["queries"])
+        self.assertEqual(5.5, features["avg_length"])
+        self.assertEqual(1, features["near"])
+        self.assertGreater(features["terms"], 0)
+
+    def test_costs(self):
+        features = {"posts": 1000, "queries": 1, "avg_length": 160, "terms": 10, "near": 0, "near_terms": 0,
+                    "nodes": 20, "workers": 8, "cores": 8}
+        # 가벼운 쿼리는 워커를 띄우는 비용이 더 크다.
+        costs = self.planner.costs(features)
+        self.assertLess(costs["column"], costs["post"])
+        # 무거운 쿼리와 많은 포스트는 코어 수만큼 나누는 것이 낫다.
+        costs = self.planner.costs(dict(features, posts=100000, near=5, near_terms=500))
+        self.assertLess(costs["post"], costs["column"])
+        # 코어가 하나이면 병렬 검사의 이점이 없다.
+        costs = self.planner.costs(dict(features, posts=100000, near=5, near_terms=500, cores=1))
+        self.assertLess(costs["column"], costs["post"])
+
+    def test_compare_planner(self):
+        result = QueryBenchmark().compare_planner(counts=(300,))
+        print(result)
@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_codegen import QueryCodegen
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_profiler import QueryProfiler
+
+
+class TestQueryProfiler(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+        self.compiler = QueryCompiler(fuse_or=False, share=False, cache=False)
+
+    def test_compile_queries(self):
+        queries = [self.compiler.compile_query("(a OR b OR c) AND (x NOT y)"),
+                   self.compiler.compile_query("(a NEAR/1 x) OR zzz")]
+        posts = [self.checker.preprocess_post(post) for post in ("a", "b x", "c x y", "z", "a x", "x a b")]
+        profiler = QueryProfiler()
+        functions = profiler.compile_queries(queries, ["first", "second"])
+        expected = QueryCodegen().compile_queries(queries)
+        for post in posts:
+            self.assertEqual([function(post) for function in expected], [function(post) for function in functions])
+
+        report = profiler.report()
+        print(report)
+        # 쿼리 안에서 단어마다 포스트별로 한 번 검사하거나 한 번 건너뛴다.
+        self.assertTrue(((report["evaluations"] + report["short_circuits"]) == len(posts)).all())
+        first = report[report["query"] == "first"].set_index("term")
+        self.assertEqual(6, first.loc[" a[?!,. ]", "evaluations"])
+        self.assertEqual(3, first.loc[" a[?!,. ]", "hits"])
+        self.assertEqual(4, first.loc[" c[?!,. ]", "short_circuits"])
+        self.assertEqual(0, report.set_index("term").loc[" zzz[?!,. ]", "hits"])
+
+    def test_take_and_merge(self):
+        profiler = QueryProfiler()
+        function = profiler.compile_queries([self.compiler.compile_query("a OR b")], ["q"])[0]
+        function(self.checker.preprocess_post("a"))
+        stats = profiler.take()
+        self.assertEqual([1, 1, 0], stats[("q", " a[?!,. ]")][:3])
+        self.assertEqual([0, 0, 1], stats[("q", " b[?!,. ]")][:3])
+        self.assertEqual({}, profiler.take())
+
+        merged = QueryProfiler()
+        merged.merge(stats)
+        merged.merge(stats)
+        self.assertEqual([2, 2, 0], merged.stats[("q", " a[?!,. ]")][:3])
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_benchmark import QueryBenchmark
+from post_selector.query_compiler import CompiledQuery, QueryCompiler
+from post_selector.query_parser import QueryParser
+from post_selector.query_statistics import QueryStatistics
+
+
+class TestQueryStatistics(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+
+    def test_node_key(self):
+        parser = QueryParser()
+        self.assertEqual(QueryStatistics.node_key(parser.query_to_dict("a OR b")),
+                         QueryStatistics.node_key(QueryParser().query_to_dict("a OR b")))
+        self.assertEqual(QueryStatistics.node_key(parser.query_to_dict("a OR b")),
+                         QueryStatistics.node_key(QueryParser().query_to_dict("b OR a")))
+        self.assertNotEqual(QueryStatistics.node_key(parser.query_to_dict("a NOT b")),
+                            QueryStatistics.node_key(QueryParser().query_to_dict("b NOT a")))
+
+    def test_reorder(self):
+        query = QueryParser().query_to_dict("(a OR b OR c) AND (x NOT y)")
+        posts = [self.checker.preprocess_post(post) for post in ("a", "b x", "c x y", "z", "a x")]
+        statistics = QueryStatistics()
+        statistics.collect(query, posts)
+        reordered = statistics.reorder(query)
+        print(reordered)
+        for post in posts:
+            self.assertEqual(self.checker.check_post(post, query, True), self.checker.check_post(post, reordered, True))
+
+    def test_reorder_query_files(self):
+        benchmark = QueryBenchmark()
+        compiler = QueryCompiler(reorder=False)
+        sample = benchmark.make_posts(count=100, seed=1, hit_ratio=0.3)
+        posts = benchmark.make_posts(count=200, hit_ratio=0.3)
+        compiled_query = compiler.compile(benchmark.query_file_names)
+        reordered = []
+        for name in benchmark.query_file_names:
+            statistics = compiler.collect_statistics(name, sample, save=False)
+            reordered.append(compiler.compile_query(compiler.load_query(name), statistics=statistics))
+        reordered_query = CompiledQuery(compiled_query.names, compiled_query.columns, reordered)
+        latencies, results = benchmark.measure(compiled_query, posts)
+        reordered_latencies, reordered_results = benchmark.measure(reordered_query, posts)
+        self.assertEqual(results, reordered_results)
+        print(latencies, reordered_latencies)
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from post_selector.result_cache import ResultCache
+
+
+class TestResultCache(TestCase):
+
+    def test_get_put(self):
+        cache = ResultCache()
+        message_hash = ResultCache.message_hash("Galaxy note 10")
+        self.assertIsNone(cache.get(message_hash, "query"))
+        cache.put(message_hash, "query", 'Y')
+        self.assertEqual('Y', cache.get(message_hash, "query"))
+        self.assertIsNone(cache.get(message_hash, "other query"))
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+    def test_message_hash_surrogate(self):
+        # 짝이 없는 서로게이트(깨진 이모지)가 있는 메시지
+        self.assertNotEqual(ResultCache.message_hash("galaxy \ud83d"), ResultCache.message_hash("galaxy \ud83e"))
+
+    def test_evict(self):
+        cache = ResultCache(max_entries=2)
+        cache.put(b"a", "query", 'Y')
+        cache.put(b"b", "query", 'N')
+        cache.get(b"a", "query")
+        cache.put(b"c", "query", 'N')
+        # 가장 오래 쓰지 않은 "b"를 지운다.
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(b"b", "query"))
+        self.assertEqual('Y', cache.get(b"a", "query"))
+
+        cache = ResultCache(**cache.to_data())
+        self.assertEqual('N', cache.get(b"c", "query"))
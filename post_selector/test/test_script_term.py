@@ -0,0 +1,36 @@
+import re
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_parser import QueryParser
+from post_selector.script_term import ScriptTerm
+
+
+class TestScriptTerm(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+        self.parser = QueryParser()
+
+    def test_search(self):
+        words = ["갤럭시", "galaxy", "카메라*", "กล้อง", "カメラ", "камера"]
+        patterns = [self.parser.to_regex_word(word) for word in words]
+        term = ScriptTerm(patterns)
+        posts = ["new galaxy", "갤럭시 폰", "갤럭시카메라", "카메라가 좋아요", "กล้อง galaxy", "新しいカメラ", "камера!", "nothing", ""]
+        for post in posts:
+            post = self.checker.preprocess_post(post)
+            expected = any(re.search(pattern, post) for pattern in patterns)
+            self.assertEqual(expected, term.search(post) is not None, post)
+            expected = [r.start() for r in re.finditer(term.pattern, post)]
+            self.assertEqual(expected, [r.start() for r in term.finditer(post)], post)
+        print(term, term.variants)
+
+    def test_compile_query(self):
+        compiler = QueryCompiler(script_groups=True)
+        query = compiler.compile_query("(갤럭시 OR galaxy OR 카메라 OR กล้อง) AND (폰 OR phone) NOT 케이스")
+        print(query)
+        plain = QueryCompiler().compile_query("(갤럭시 OR galaxy OR 카메라 OR กล้อง) AND (폰 OR phone) NOT 케이스")
+        for text in ("갤럭시 폰", "galaxy phone", "กล้อง phone", "갤럭시 폰 케이스", "galaxy", "폰", "카메라 phone"):
+            post = self.checker.preprocess_post(text)
+            self.assertEqual(self.checker.check_post(post, plain, True), self.checker.check_post(post, query, True))
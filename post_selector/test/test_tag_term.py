@@ -0,0 +1,38 @@
+import re
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_parser import QueryParser
+from post_selector.tag_term import TagTerm
+
+
+class TestTagTerm(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+        self.parser = QueryParser()
+
+    def test_from_pattern(self):
+        self.assertEqual(frozenset({"#withgalaxy"}), TagTerm.from_pattern(" #withgalaxy[?!,. ]").tags)
+        self.assertEqual(("#withgalaxy",), TagTerm.from_pattern(" #withgalaxy[^ ]*[?!,. ]").prefixes)
+        self.assertEqual(frozenset({"#a.b"}), TagTerm.from_pattern(" #a[.]b[?!,. ]").tags)
+        self.assertIsNone(TagTerm.from_pattern(" #with[^ ]*galaxy[?!,. ]"))
+        self.assertIsNone(TagTerm.from_pattern(" withgalaxy[?!,. ]"))
+        self.assertIsNone(TagTerm.from_pattern(" #with galaxy[?!,. ]"))
+
+    def test_search(self):
+        words = ["#withgalaxy", "#withgalaxy*", "#a.b", "#a", "@samsung", "#with*", "#galaxy"]
+        posts = ["#withGalaxy", "#withgalaxy, yes", "#withgalaxys", "x#withgalaxy", "#a.b", "#a.bc", "#a!b",
+                 "(#withgalaxy)", "@samsung.", "@samsungmobile", "#with", "#galaxy?#withgalaxy", ""]
+        for word in words:
+            pattern = self.parser.to_regex_word(word)
+            term = TagTerm.from_pattern(pattern)
+            for post in posts:
+                post = self.checker.preprocess_post(post)
+                self.assertEqual(re.search(pattern, post) is not None, term.search(post) is not None, (word, post))
+
+        merged = TagTerm.merge([TagTerm.from_pattern(self.parser.to_regex_word(word)) for word in words])
+        for post in posts:
+            post = self.checker.preprocess_post(post)
+            expected = any(re.search(self.parser.to_regex_word(word), post) for word in words)
+            self.assertEqual(expected, merged.search(post) is not None, post)
@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_compiler import CompiledQuery
+from post_selector.query_parser import QueryParser
+from post_selector.term_cache import TermCache
+
+
+class TestTermCache(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+        self.parser = QueryParser()
+        self.posts = pd.Series(["Galaxy note 10", "galaxy s20 camera", "my camera, the galaxy s20", "nothing here",
+                                "Galaxy note 10"])
+
+    def compile(self, *queries):
+        queries = [self.parser.query_to_dict(query) for query in queries]
+        return CompiledQuery(range(len(queries)), [f"q{i}" for i in range(len(queries))], queries)
+
+    def expected(self, compiled_query):
+        rows = [self.checker.check_post_for_queries(post, compiled_query.queries, compiled_query.columns)
+                for post in self.posts]
+        return pd.DataFrame(rows, index=self.posts.index)
+
+    def test_check_posts(self):
+        cache = TermCache()
+        compiled_query = self.compile("galaxy AND (note OR s2*)", "galaxy NOT note",
+                                      "(camera OR lens) NEAR/2 (galaxy AND s*)")
+        result = cache.check_posts(self.posts, compiled_query, index=self.posts.index)
+        print(result)
+        self.assertTrue(self.expected(compiled_query).equals(result))
+        self.assertEqual(4, len(cache.post_ids))
+        self.assertEqual(4 * 4, cache.misses)
+
+        cache = TermCache(**cache.to_data())
+        cache.check_posts(self.posts, compiled_query, index=self.posts.index)
+        self.assertEqual(0, cache.misses)
+
+    def test_check_edited_query(self):
+        cache = TermCache()
+        cache.check_posts(self.posts, self.compile("galaxy AND (note OR s2*)"))
+        cache.hits, cache.misses = 0, 0
+        compiled_query = self.compile("galaxy AND (note OR s2* OR camera)")
+        posts = pd.concat([self.posts, pd.Series(["galaxy camera"])], ignore_index=True)
+        self.posts = posts
+        result = cache.check_posts(posts, compiled_query, index=posts.index)
+        self.assertTrue(self.expected(compiled_query).equals(result))
+        # 새 단어 "camera"는 모든 포스트, 기존 단어들은 새 포스트만 검사한다.
+        self.assertEqual(5 + 3, cache.misses)
+
+    def test_check_posts_surrogate(self):
+        # 짝이 없는 서로게이트(깨진 이모지)가 있는 포스트
+        self.posts = pd.Series(["galaxy \ud83d note", "\ud83d galaxy s20"])
+        compiled_query = self.compile("galaxy AND note")
+        result = TermCache().check_posts(self.posts, compiled_query, index=self.posts.index)
+        self.assertTrue(self.expected(compiled_query).equals(result))
+
+    def test_cache_key(self):
+        cache = TermCache()
+        compiled_query = self.compile("galaxy AND note")
+        cache.check_posts(self.posts, compiled_query)
+        self.assertEqual(2, len(cache.evaluated))
+        self.assertTrue(all(key.startswith(f"{cache.version}:") for key in cache.evaluated))
+        # 버전이 바뀌면 이전 버전의 단어들은 쓰지 않는다.
+        cache = TermCache(**cache.to_data())
+        cache.version = "other"
+        cache.check_posts(self.posts, compiled_query)
+        self.assertEqual(2 * 4, cache.misses)
+
+    def test_bounds(self):
+        cache = TermCache(max_terms=2)
+        cache.check_posts(self.posts, self.compile("galaxy AND note"))
+        compiled_query = self.compile("camera OR galaxy")
+        result = cache.check_posts(self.posts, compiled_query)
+        # 가장 오래 쓰지 않은 "note"를 지운다.
+        terms = {}
+        cache.collect_terms(compiled_query.queries[0], terms)
+        self.assertEqual(list(terms), list(cache.evaluated))
+        self.assertEqual(list(cache.evaluated), list(cache.matched))
+        self.assertTrue(self.expected(compiled_query).equals(result))
+
+        cache = TermCache(max_posts=4)
+        cache.check_posts(self.posts, self.compile("galaxy"))
+        posts = pd.Series(["galaxy camera"])
+        result = cache.check_posts(posts, self.compile("galaxy"))
+        self.assertEqual(['Y'], result["q0"].tolist())
+        self.assertEqual(1, len(cache.post_ids))
@@ -0,0 +1,15 @@
+from unittest import TestCase
+
+from post_selector.trigram_index import TrigramIndex
+
+
+class TestTrigramIndex(TestCase):
+
+    def test_candidates(self):
+        index = TrigramIndex.build(["1億800萬像素", "108เมกะพิกเซล", "800萬", "samsung"])
+        print(index.grams.keys())
+        self.assertEqual([0], list(index.candidates("800萬像")))
+        self.assertEqual([0, 2], list(index.candidates("800萬")))
+        self.assertEqual([1], list(index.candidates("เมกะ")))
+        self.assertEqual([], list(index.candidates("galaxy")))
+        self.assertIsNone(index.candidates("萬像"))
@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from post_selector.query_parser import QueryParser
+from post_selector.unicode_scripts import UnicodeScripts
+
+
+class TestUnicodeScripts(TestCase):
+
+    def setUp(self) -> None:
+        self.parser = QueryParser()
+
+    def test_text_mask(self):
+        self.assertEqual(0, UnicodeScripts.text_mask(" samsung galaxy café 123 "))
+        self.assertEqual(["hangul"], UnicodeScripts.names(UnicodeScripts.text_mask("삼성 galaxy ㅋㅋ")))
+        self.assertEqual(["kana", "han"], UnicodeScripts.names(UnicodeScripts.text_mask("新しいカメラ")))
+        self.assertEqual(["cyrillic", "greek"], UnicodeScripts.names(UnicodeScripts.text_mask("привет αβγ")))
+
+    def test_term_mask(self):
+        self.assertEqual(["hangul"], UnicodeScripts.names(UnicodeScripts.term_mask(self.parser.to_regex_word("갤럭시"))))
+        self.assertEqual(["hangul"], UnicodeScripts.names(UnicodeScripts.term_mask(self.parser.to_regex_word("갤*"))))
+        self.assertEqual(["thai"], UnicodeScripts.names(UnicodeScripts.term_mask(self.parser.to_regex_word("กล้อง"))))
+        self.assertEqual(0, UnicodeScripts.term_mask(self.parser.to_regex_word("galaxy")))
+        self.assertEqual(0, UnicodeScripts.term_mask(" (?:갤럭시|galaxy)[?!,. ]"))
@@ -0,0 +1,85 @@
+import random
+import re
+import time
+from unittest import TestCase
+
+from post_selector.post_checker import PostChecker
+from post_selector.query_compiler import QueryCompiler
+from post_selector.query_parser import QueryParser
+from post_selector.word_term import WordTerm
+
+
+class TestWordTerm(TestCase):
+
+    def setUp(self) -> None:
+        self.checker = PostChecker()
+        self.parser = QueryParser()
+
+    def test_classify(self):
+        self.assertEqual("literal", WordTerm.classify(self.parser.to_regex_word("s.pen")))
+        self.assertEqual("literal", WordTerm.classify(self.parser.to_regex_word("with_|_galaxy")))
+        self.assertEqual("prefix", WordTerm.classify(self.parser.to_regex_word("galaxy*")))
+        self.assertEqual("wildcard", WordTerm.classify(self.parser.to_regex_word("gal?xy")))
+        self.assertEqual("wildcard", WordTerm.classify(self.parser.to_regex_word("g?laxy*")))
+        self.assertEqual("glob", WordTerm.classify(self.parser.to_regex_word("ga*xy")))
+        self.assertEqual("glob", WordTerm.classify(self.parser.to_regex_word("*a*b*")))
+        self.assertEqual("regex", WordTerm.classify(self.parser.to_regex_word("ga*x?")))
+        self.assertEqual("regex", WordTerm.classify(self.parser.to_regex_word("ga*_|_xy")))
+        self.assertEqual("regex", WordTerm.classify(" (?:galaxy|samsung)[?!,. ]"))
+
+    def test_search(self):
+        words = ["galaxy", "galaxy*", "gal?xy", "g?l?xy*", "s.pen", "s+", "a", "with_|_galaxy", "?x", "x?", "갤럭시",
+                 "#with*"]
+        alphabet = list("galxyspen.+?!, #w\nith갤럭시")
+        rand = random.Random(0)
+        posts = ["".join(rand.choice(alphabet) for _ in range(rand.randint(0, 20))) for _ in range(2000)]
+        posts += [self.checker.preprocess_post(post) for post in posts]
+        for word in words:
+            pattern = self.parser.to_regex_word(word)
+            term = WordTerm.from_pattern(pattern)
+            regex = re.compile(pattern)
+            for post in posts:
+                self.assertEqual(regex.search(post) is not None, term.search(post) is not None, (word, post))
+            post = self.checker.preprocess_post("galaxy galaxy! gal?xy s.pen")
+            self.assertEqual([r.start() for r in regex.finditer(post)], [r.start() for r in term.finditer(post)])
+
+    def test_glob(self):
+        words = ["*a*b*", "a*b", "*a", "ab*b*", "*ab*ba", "a*a*a", ".*a", "#*a*", "갤*시"]
+        alphabet = list("ab.!, #?\n갤럭시")
+        rand = random.Random(0)
+        posts = ["".join(rand.choice(alphabet) for _ in range(rand.randint(0, 16))) for _ in range(5000)]
+        posts += [self.checker.preprocess_post(post) for post in posts]
+        for word in words:
+            pattern = self.parser.to_regex_word(word)
+            term = WordTerm.from_pattern(pattern)
+            regex = re.compile(pattern)
+            for post in posts:
+                self.assertEqual(regex.search(post) is not None, term.search(post) is not None, (word, post))
+                self.assertEqual([r.span() for r in regex.finditer(post)], [r.span() for r in term.finditer(post)],
+                                 (word, post))
+
+        # 정규 표현식은 되돌아가기로 수 초가 걸리는 포스트
+        term = WordTerm.from_pattern(self.parser.to_regex_word("*a*b*c*"))
+        post = " " + "ab" * 100000 + " "
+        start = time.perf_counter()
+        self.assertIsNone(term.search(post))
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_compile_query(self):
+        query = "(galaxy* AND s.pen) NOT (gal?xy NEAR/2 case)"
+        compiler = QueryCompiler(word_terms=True)
+        compiled = compiler.compile_query(query)
+        print(compiled)
+        plain = QueryCompiler(word_terms=False).compile_query(query)
+        for text in ("galaxys s.pen", "galaxy s.pen galaxy case", "s.pen", "galaxy, s.pen!"):
+            post = self.checker.preprocess_post(text)
+            self.assertEqual(self.checker.check_post(post, plain, True), self.checker.check_post(post, compiled, True))
+
+    def test_compile_glob_query(self):
+        query = "(*a*b* OR galaxy) AND (s*n NEAR/1 ga*y)"
+        compiled = QueryCompiler(glob_terms=True).compile_query(query)
+        print(compiled)
+        plain = QueryCompiler(glob_terms=False).compile_query(query)
+        for text in ("xaxb s.pen galaxy", "ab galaxy", "galaxy sun gay", "galaxy sun x gray", "ba sn gy"):
+            post = self.checker.preprocess_post(text)
+            self.assertEqual(self.checker.check_post(post, plain, True), self.checker.check_post(post, compiled, True))
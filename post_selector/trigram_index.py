@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class TrigramIndex:
+    """
+    문자 3-gram 색인. 3-gram 마다 그 3-gram 이 들어 있는 문자열 번호들을 가진다.
+    리터럴 조각의 모든 3-gram 을 가진 문자열들만 조각이 들어 있을 수 있는 후보이다.
+    띄어쓰기가 없는 중국어, 태국어 등의 긴 토큰에서도 와일드카드 단어의 후보를 빠르게 찾는다.
+    """
+
+    SIZE = 3
+
+    def __init__(self, grams=None):
+        """
+        :param grams: {3-gram: 문자열 번호 배열}
+        """
+        self.grams = {} if grams is None else grams
+
+    @staticmethod
+    def build(texts):
+        """
+        문자열들로 3-gram 색인을 만든다.
+        :param texts: 문자열들
+        :return: "TrigramIndex"
+        """
+        size = TrigramIndex.SIZE
+        grams = {}
+        for text_id, text in enumerate(texts):
+            for gram in {text[i:i + size] for i in range(len(text) - size + 1)}:
+                grams.setdefault(gram, []).append(text_id)
+        return TrigramIndex({gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()})
+
+    def candidates(self, fragment):
+        """
+        리터럴 조각이 들어 있을 수 있는 문자열들을 구한다.
+        :param fragment: 리터럴 조각
+        :return: 후보 문자열 번호들 (오름차순), 조각이 짧아 구할 수 없으면 None
+        """
+        size = self.SIZE
+        if len(fragment) < size:
+            return None
+        postings = []
+        for gram in {fragment[i:i + size] for i in range(len(fragment) - size + 1)}:
+            ids = self.grams.get(gram)
+            if ids is None:
+                return np.zeros(0, dtype=np.int32)
+            postings.append(ids)
+        postings.sort(key=len)
+        ids = postings[0]
+        for other in postings[1:]:
+            if len(ids) == 0:
+                break
+            ids = np.intersect1d(ids, other, assume_unique=True)
+        return ids
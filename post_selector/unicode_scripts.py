@@ -0,0 +1,104 @@
+from bisect import bisect_right
+
+from post_selector.pattern_trie import PatternTrie
+
+
+class UnicodeScripts:
+    """
+    문자들의 유니코드 문자 체계(script)를 비트마스크로 나타낸다.
+    쿼리 단어의 리터럴 문자들이 속한 문자 체계가 포스트에 하나라도 없으면 그 단어는 포스트와 일치할 수 없다.
+    라틴 문자, 숫자, 기호 등 대부분의 포스트에 있는 문자는 비트를 갖지 않는다.
+    """
+
+    # 문자 체계별 비트 번호
+    SCRIPTS = ("hangul", "kana", "han", "thai", "bengali", "devanagari", "arabic", "hebrew", "cyrillic", "greek")
+    # (시작 코드 포인트, 끝 코드 포인트, 문자 체계) (시작 코드 포인트 순)
+    RANGES = (
+        (0x0370, 0x03FF, "greek"),
+        (0x0400, 0x052F, "cyrillic"),
+        (0x0590, 0x05FF, "hebrew"),
+        (0x0600, 0x06FF, "arabic"),
+        (0x0750, 0x077F, "arabic"),
+        (0x0900, 0x097F, "devanagari"),
+        (0x0980, 0x09FF, "bengali"),
+        (0x0E00, 0x0E7F, "thai"),
+        (0x1100, 0x11FF, "hangul"),
+        (0x1F00, 0x1FFF, "greek"),
+        (0x3040, 0x30FF, "kana"),
+        (0x3130, 0x318F, "hangul"),
+        (0x31F0, 0x31FF, "kana"),
+        (0x3400, 0x4DBF, "han"),
+        (0x4E00, 0x9FFF, "han"),
+        (0xAC00, 0xD7AF, "hangul"),
+        (0xF900, 0xFAFF, "han"),
+        (0xFB50, 0xFDFF, "arabic"),
+        (0xFE70, 0xFEFF, "arabic"),
+        (0xFF66, 0xFF9F, "kana"),
+    )
+    # 비트를 갖는 가장 작은 코드 포인트
+    FIRST = "Ͱ"
+
+    __starts = [start for start, _, _ in RANGES]
+    __chars = {}
+
+    @staticmethod
+    def char_mask(char):
+        """
+        문자의 문자 체계 비트
+        :param char: 문자
+        :return: 비트마스크 (비트를 갖지 않는 문자이면 0)
+        """
+        mask = UnicodeScripts.__chars.get(char)
+        if mask is None:
+            mask = 0
+            code = ord(char)
+            i = bisect_right(UnicodeScripts.__starts, code) - 1
+            if i >= 0:
+                start, end, script = UnicodeScripts.RANGES[i]
+                if code <= end:
+                    mask = 1 << UnicodeScripts.SCRIPTS.index(script)
+            UnicodeScripts.__chars[char] = mask
+        return mask
+
+    @staticmethod
+    def text_mask(text):
+        """
+        문자열에 있는 문자 체계들
+        :param text: 문자열
+        :return: 비트마스크
+        """
+        if text.isascii():
+            return 0
+        mask = 0
+        first = UnicodeScripts.FIRST
+        char_mask = UnicodeScripts.char_mask
+        for char in set(text):
+            if char >= first:
+                mask |= char_mask(char)
+        return mask
+
+    @staticmethod
+    def term_mask(pattern):
+        """
+        정규 표현식 단어와 일치하는 문자열에 반드시 있어야 하는 문자 체계들.
+        수량자가 붙지 않은 리터럴 문자(원자)들만 본다.
+        :param pattern: 정규 표현식 단어
+        :return: 비트마스크 (알 수 없으면 0)
+        """
+        atoms = PatternTrie.tokenize(pattern)
+        if atoms is None:
+            return 0
+        mask = 0
+        for atom in atoms:
+            if len(atom) == 1 and atom != ".":
+                mask |= UnicodeScripts.char_mask(atom)
+            elif len(atom) == 3 and atom[0] == "[" and atom[2] == "]":
+                mask |= UnicodeScripts.char_mask(atom[1])
+        return mask
+
+    @staticmethod
+    def names(mask):
+        """
+        비트마스크의 문자 체계 이름들
+        """
+        return [script for i, script in enumerate(UnicodeScripts.SCRIPTS) if mask & (1 << i)]
@@ -0,0 +1,305 @@
+import re
+from abc import ABC, abstractmethod
+
+from post_selector.pattern_trie import PatternTrie
+
+
+class WordTerm(ABC):
+    """
+    정규 표현식 엔진 없이 문자열 검색("str.find")으로 찾는 단어.
+    "QueryParser.to_regex_word"가 만든 단어(" " + 단어 + "[?!,. ]")를 종류별로 나누어 종류에 맞는 방식으로 찾는다.
+    - "literal": 와일드카드가 없는 단어. 찾은 뒤 경계 문자를 확인한다.
+    - "prefix": 끝에만 "*"가 있는 단어. 단어 뒤 토큰의 나머지에 경계 문자가 있는지 확인한다.
+    - "wildcard": "?"(한 문자)가 있는 단어 (끝에 "*"가 있어도 된다.). 리터럴 조각을 찾은 뒤 문자별로 확인한다.
+    - "glob": 가운데에 "*"가 있는 단어 ("?"와 공백은 없다.). 토큰 안에서 조각들을 찾는다. (선형 시간)
+    - "regex": 그 밖의 단어. 정규 표현식으로 찾는다.
+    "re.Pattern"처럼 "search", "finditer", "pattern"을 제공한다.
+    위치를 찾을 때("finditer", NEAR 조건)는 정규 표현식과 결과가 같도록 정규 표현식을 쓴다. ("glob"은 직접 구한다.)
+    """
+
+    PREFIX = " "
+    SUFFIX = "[?!,. ]"
+    BOUNDARY = "?!,. "
+    TAIL = "[^ ]*"
+    LITERAL_ATOMS = {"[.]": ".", "[+]": "+"}
+
+    def __init__(self, pattern, template):
+        """
+        :param pattern: 정규 표현식 단어
+        :param template: 단어의 문자들 (앞의 공백 포함, 한 문자 와일드카드는 None, 가운데의 "*"는 "TAIL")
+        """
+        self.pattern = pattern
+        self.template = template
+        self.__regex = None
+
+    @staticmethod
+    def parse(pattern):
+        """
+        정규 표현식 단어를 종류와 문자들로 나눈다.
+        :param pattern: 정규 표현식 단어
+        :return: (종류, 문자들 (한 문자 와일드카드는 None, 가운데의 "*"는 "TAIL"), 끝에 "*"가 있는지 여부),
+                 종류가 "regex"이면 문자들은 None
+        """
+        if not pattern.startswith(WordTerm.PREFIX) or not pattern.endswith(WordTerm.SUFFIX):
+            return "regex", None, False
+        atoms = PatternTrie.tokenize(pattern[:-len(WordTerm.SUFFIX)])
+        if atoms is None:
+            return "regex", None, False
+        tail = atoms[-1] == WordTerm.TAIL
+        if tail:
+            atoms = atoms[:-1]
+        template = []
+        for atom in atoms:
+            if atom in WordTerm.LITERAL_ATOMS:
+                template.append(WordTerm.LITERAL_ATOMS[atom])
+            elif atom == ".":
+                template.append(None)
+            elif atom == WordTerm.TAIL:
+                template.append(WordTerm.TAIL)
+            elif len(atom) == 1:
+                template.append(atom)
+            else:
+                return "regex", None, False
+        if WordTerm.TAIL in template:
+            # 한 문자 와일드카드와 공백은 토큰 경계를 넘을 수 있으므로 정규 표현식으로 찾는다.
+            if None in template or " " in template[1:]:
+                return "regex", None, False
+            kind = "glob"
+        elif None in template:
+            kind = "wildcard"
+        elif tail:
+            kind = "prefix"
+        else:
+            kind = "literal"
+        return kind, template, tail
+
+    @staticmethod
+    def classify(pattern):
+        """
+        정규 표현식 단어의 종류
+        :param pattern: 정규 표현식 단어
+        :return: "literal", "prefix", "wildcard", "glob", "regex"
+        """
+        return WordTerm.parse(pattern)[0]
+
+    @staticmethod
+    def from_pattern(pattern):
+        """
+        정규 표현식 단어를 종류에 맞는 "WordTerm"으로 바꾼다.
+        :param pattern: 정규 표현식 단어
+        :return: "WordTerm", 정규 표현식으로 찾아야 하는 단어이면 None
+        """
+        kind, template, tail = WordTerm.parse(pattern)
+        if kind == "literal":
+            return LiteralWordTerm(pattern, template)
+        elif kind == "prefix":
+            return PrefixWordTerm(pattern, template)
+        elif kind == "wildcard":
+            return WildcardWordTerm(pattern, template, tail)
+        elif kind == "glob":
+            return GlobWordTerm(pattern, template, tail)
+        return None
+
+    @staticmethod
+    def has_tail_boundary(post, end):
+        """
+        "[^ ]*[?!,. ]"가 "end" 위치부터 일치하는지 여부. 토큰의 나머지에 경계 문자가 있거나 뒤에 공백이 있으면 일치한다.
+        :param post: 포스트 데이터
+        :param end: 단어 다음 위치
+        :return: 일치 여부
+        """
+        space = post.find(" ", end)
+        rest = post[end:] if space == -1 else post[end:space + 1]
+        return any(char in rest for char in WordTerm.BOUNDARY)
+
+    @abstractmethod
+    def search(self, post):
+        pass
+
+    def finditer(self, post):
+        if self.__regex is None:
+            self.__regex = re.compile(self.pattern)
+        return self.__regex.finditer(post)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.pattern!r})"
+
+
+class LiteralWordTerm(WordTerm):
+    """
+    와일드카드가 없는 단어
+    """
+
+    def __init__(self, pattern, template):
+        super().__init__(pattern, template)
+        self.literal = "".join(template)
+
+    def search(self, post):
+        literal = self.literal
+        boundary = self.BOUNDARY
+        size = len(literal)
+        index = post.find(literal)
+        while index != -1:
+            end = index + size
+            if end < len(post) and post[end] in boundary:
+                return True
+            index = post.find(literal, index + 1)
+        return None
+
+
+class PrefixWordTerm(WordTerm):
+    """
+    끝에만 "*"가 있는 단어
+    """
+
+    def __init__(self, pattern, template):
+        super().__init__(pattern, template)
+        self.literal = "".join(template)
+
+    def search(self, post):
+        # 뒤에 오는 같은 단어는 첫 번째 단어 뒤 토큰의 나머지에 있으므로 첫 번째 단어만 확인하면 된다.
+        index = post.find(self.literal)
+        if index == -1 or not self.has_tail_boundary(post, index + len(self.literal)):
+            return None
+        return True
+
+
+class WildcardWordTerm(WordTerm):
+    """
+    "?"(한 문자 와일드카드)가 있는 단어
+    """
+
+    def __init__(self, pattern, template, tail):
+        super().__init__(pattern, template)
+        self.tail = tail
+        # 가장 긴 리터럴 조각과 단어 안에서의 위치
+        self.anchor, self.offset = "", 0
+        start = 0
+        for i, char in enumerate(template + [None]):
+            if char is None:
+                if i - start > len(self.anchor):
+                    self.anchor, self.offset = "".join(template[start:i]), start
+                start = i + 1
+        self.checks = [(i, char) for i, char in enumerate(template)
+                       if not self.offset <= i < self.offset + len(self.anchor)]
+
+    def search(self, post):
+        size = len(self.template)
+        index = post.find(self.anchor)
+        while index != -1:
+            start = index - self.offset
+            if start >= 0 and start + size <= len(post) and self.matches(post, start):
+                end = start + size
+                if self.tail:
+                    if self.has_tail_boundary(post, end):
+                        return True
+                elif end < len(post) and post[end] in self.BOUNDARY:
+                    return True
+            index = post.find(self.anchor, index + 1)
+        return None
+
+    def matches(self, post, start):
+        """
+        "start" 위치부터 단어의 문자들이 일치하는지 여부 ("."은 줄바꿈 문자가 아닌 모든 문자와 일치한다.)
+        """
+        for i, char in self.checks:
+            if char is None:
+                if post[start + i] == "\n":
+                    return False
+            elif post[start + i] != char:
+                return False
+        return True
+
+
+class GlobWordTerm(WordTerm):
+    """
+    가운데에 "*"가 있는 단어 (예: "*a*b*").
+    "[^ ]*"는 공백을 넘지 않으므로 일치하는 부분은 시작 공백 뒤의 한 토큰 안에 있다. 토큰마다 조각들을 뒤에서부터
+    가장 늦은 위치로 놓아 보면(rfind) 되돌아가기(backtracking) 없이 토큰 길이에 비례하는 시간에 찾는다.
+    이 위치는 정규 표현식의 탐욕적(greedy) "[^ ]*"가 고르는 위치와 같으므로 "finditer"의 결과도 정규 표현식과 같다.
+    """
+
+    def __init__(self, pattern, template, tail):
+        super().__init__(pattern, template)
+        self.tail = tail
+        segments = "".join(template[1:]).split(self.TAIL)
+        # 시작 공백과 첫 조각, 나머지 조각들
+        self.head = " " + segments[0]
+        self.segments = segments[1:]
+
+    def search(self, post):
+        head = self.head
+        index = post.find(head)
+        while index != -1:
+            if self.match_end(post, index + len(head)) != -1:
+                return True
+            index = post.find(head, index + 1)
+        return None
+
+    def finditer(self, post):
+        head = self.head
+        index = post.find(head)
+        while index != -1:
+            end = self.match_end(post, index + len(head))
+            if end == -1:
+                index = post.find(head, index + 1)
+            else:
+                yield GlobMatch(index, end)
+                index = post.find(head, end)
+
+    def match_end(self, post, start):
+        """
+        첫 조각 다음 위치부터 나머지 조각들과 경계 문자가 일치하는 부분의 끝 위치 (정규 표현식이 고르는 끝 위치)
+        :param post: 포스트 데이터
+        :param start: 첫 조각 다음 위치
+        :return: 끝 위치, 일치하지 않으면 -1
+        """
+        token_end = post.find(" ", start)
+        if token_end == -1:
+            token_end = len(post)
+        segments = self.segments
+        if self.tail:
+            if token_end < len(post):
+                # 끝의 "[^ ]*"는 토큰 끝까지 가고 뒤의 공백이 경계 문자가 된다.
+                limit, end = token_end, token_end + 1
+            else:
+                limit = max(post.rfind(char, start) for char in self.BOUNDARY)
+                if limit == -1:
+                    return -1
+                end = limit + 1
+        else:
+            last = segments[-1]
+            index = post.rfind(last, start, token_end)
+            while index != -1:
+                after = index + len(last)
+                if after < len(post) and post[after] in self.BOUNDARY:
+                    break
+                index = post.rfind(last, start, after - 1)
+            if index == -1:
+                return -1
+            limit, end = index, index + len(last) + 1
+            segments = segments[:-1]
+        for segment in reversed(segments):
+            limit = post.rfind(segment, start, limit)
+            if limit == -1:
+                return -1
+        return end
+
+
+class GlobMatch:
+    """
+    "GlobWordTerm.finditer"가 찾은 위치 ("re.Match"의 "start", "end", "span"을 제공한다.)
+    """
+
+    def __init__(self, start, end):
+        self.__start = start
+        self.__end = end
+
+    def start(self):
+        return self.__start
+
+    def end(self):
+        return self.__end
+
+    def span(self):
+        return self.__start, self.__end
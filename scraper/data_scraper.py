@@ -57,7 +57,7 @@ class DataScraper:
     def add_samsung_classification(self, data_df):
         selector = PostSelector()
         samsung_yn_df = selector.check_posts(query_file_names=("samsung_v1.0",), column_names=("samsung_yn",),
-                                             posts=data_df[['message']])
+                                             posts=data_df[['message']], result_cache=True)
         data_df = data_df.merge(samsung_yn_df, how="left", left_index=True, right_index=True)
         file_path = f'mx_pr_sns_classed_{self.cfg.today}.xlsx'
         data_df['total_engagements'] = data_df[['post_likes', 'post_comments', 'post_shares']].sum(axis=1)
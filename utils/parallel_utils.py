@@ -1,8 +1,10 @@
 import math
 import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import pandas as pd
+from tqdm import tqdm
 from tqdm.contrib.concurrent import process_map
 
 import logging_config as log
@@ -11,17 +13,20 @@ import logging_config as log
 class ParallelUtils:
 
     @staticmethod
-    def parallel(data_df, func, cpu_divide_count=2, split_len=100, desc="Processing"):
+    def parallel(data_df, func, cpu_divide_count=2, split_len=100, desc="Processing", initializer=None, initargs=(),
+                 combine=None):
         num_processes = ParallelUtils.get_num_process(cpu_divide_count)
         total = len(data_df.index)
         if total > split_len * num_processes:
             divided_df = np.array_split(data_df, len(data_df.index) // split_len)
         else:
             divided_df = np.array_split(data_df, num_processes)
-        return ParallelUtils.parallel_divided(divided_df, func, cpu_divide_count, desc, total)
+        return ParallelUtils.parallel_divided(divided_df, func, cpu_divide_count, desc, total,
+                                              initializer=initializer, initargs=initargs, combine=combine)
 
     @staticmethod
-    def parallel_divided(divided_data, func, cpu_divide_count=2, desc="Processing", total=None, chunk_size=None):
+    def parallel_divided(divided_data, func, cpu_divide_count=2, desc="Processing", total=None, chunk_size=None,
+                         initializer=None, initargs=(), combine=None):
         num_processes = ParallelUtils.get_num_process(cpu_divide_count)
         if chunk_size is None:
             chunk_size = math.ceil(len(divided_data) / 1000)
@@ -29,7 +34,14 @@ class ParallelUtils:
             f"Total: {total}, Process Num: {num_processes}, Divided Length: {len(divided_data)}, Chunk Size: {chunk_size}")
         if total:
             desc = f"{desc} (total: {total})"
-        results = process_map(func, divided_data, max_workers=num_processes, desc=desc, chunksize=chunk_size)
+        if initializer is None:
+            results = process_map(func, divided_data, max_workers=num_processes, desc=desc, chunksize=chunk_size)
+        else:
+            with ProcessPoolExecutor(max_workers=num_processes, initializer=initializer, initargs=initargs) as executor:
+                results = list(tqdm(executor.map(func, divided_data, chunksize=chunk_size),
+                                    total=len(divided_data), desc=desc))
+        if combine is not None:
+            return combine(results)
         return pd.concat(results, ignore_index=True)
 
     @staticmethod